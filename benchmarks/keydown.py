@@ -0,0 +1,108 @@
+"""Time how long each hotkey takes to go from key press to action.
+
+Run from the top of the repository:
+
+    python -m benchmarks.keydown [track.wav [track.wav]]
+
+Commands which show dialogs are skipped. Everything else runs against two
+decks on the numpy backend, so no sound card is needed.
+"""
+
+import os.path
+import time
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+import numpy
+from sound_lib.backends import load_backend
+from pyjay import commands
+from pyjay.crossfader import Crossfader
+from pyjay.deck import Deck
+from pyjay.hotkeys import compile_hotkeys
+from .session import make_track, percentile
+
+parser = ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument(
+    'tracks', nargs='*', help='WAV files to load onto the left and right decks'
+)
+parser.add_argument(
+    '--presses', type=int, default=1000, help='Key presses timed per binding'
+)
+
+
+class Output:
+    """Stands in for the output device, which only has its volume set."""
+
+    volume = 100.0
+
+    def set_volume(self, volume):
+        self.volume = volume
+
+
+class Frame:
+    """Holds what the commands use from the main frame."""
+
+    help_mode = False
+
+    def __init__(self, tracks):
+        engine = load_backend('numpy')
+        self.master_volume = 100.0
+        self.output = Output()
+        self.mixer = engine.Mixer()
+        self.left = Deck('Left Deck', backend=engine, mixer=self.mixer)
+        self.right = Deck('Right Deck', backend=engine, mixer=self.mixer)
+        for deck, track in zip([self.left, self.right], tracks):
+            deck.set_stream(track)
+        self.crossfader = Crossfader(self.left, self.right)
+        self.microphone_stream = engine.PushStream(chans=1, decode=True)
+        self.mixer.add_channel(self.microphone_stream)
+        self.commands = [cls(self) for cls in commands.commands]
+        self.hotkeys = compile_hotkeys(self, self.commands)
+
+    def on_keydown(self, key):
+        """What MainFrame.on_keydown does once it has the key name."""
+        binding = self.hotkeys.get(key)
+        if binding is not None:
+            binding.action(binding.deck, binding.argument)
+
+
+def run(args, tracks):
+    """Press every key and print the cost of each."""
+    frame = Frame(tracks)
+    results = []
+    skipped = []
+    for key, binding in frame.hotkeys.items():
+        if binding.command.interactive:
+            skipped.append(key)
+            continue
+        timings = numpy.empty(args.presses)
+        for index in range(args.presses):
+            started = time.perf_counter()
+            frame.on_keydown(key)
+            timings[index] = time.perf_counter() - started
+        results.append((key, type(binding.command).__name__, timings))
+    print(f'Timed {len(results)} bindings, {args.presses} presses each.')
+    print(
+        f'Skipped {len(skipped)} interactive bindings: '
+        f'{", ".join(skipped)}.'
+    )
+    for key, name, timings in sorted(
+        results, key=lambda result: -percentile(result[2], 50)
+    ):
+        print(
+            f'{key:>10} {name:<16} p50 {percentile(timings, 50):8.1f} us, '
+            f'p99 {percentile(timings, 99):8.1f} us.'
+        )
+    everything = numpy.concatenate([timings for key, name, timings in results])
+    for name, p in [('p50', 50), ('p99', 99), ('max', 100)]:
+        print(f'All bindings {name}: {percentile(everything, p):.1f} us.')
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    with TemporaryDirectory() as directory:
+        tracks = args.tracks
+        for pitch in [440.0, 660.0][len(tracks):]:
+            path = os.path.join(directory, f'{pitch:.0f}.wav')
+            make_track(path, pitch, 60.0, 44100)
+            tracks.append(path)
+        run(args, tracks)
@@ -0,0 +1,111 @@
+"""Load-test a two deck plus microphone session without a sound card.
+
+Run from the top of the repository:
+
+    python -m benchmarks.session [track.wav [track.wav]]
+
+If no tracks are given, two synthetic stereo tracks are generated.
+"""
+
+import os.path
+import time
+import wave
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+import numpy
+from sound_lib.backends import load_backend
+from pyjay.deck import Deck
+
+parser = ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument(
+    'tracks', nargs='*', help='WAV files to load onto the left and right decks'
+)
+parser.add_argument(
+    '--backend', default='numpy', help='The audio backend to benchmark'
+)
+parser.add_argument(
+    '--seconds', type=float, default=60.0, help='Amount of audio to render'
+)
+parser.add_argument(
+    '--block', type=int, default=1024, help='Frames rendered per block'
+)
+parser.add_argument(
+    '--frequency', type=int, default=44100, help='Mixer sample rate'
+)
+
+
+def pcm(samples):
+    """Convert floats in the range -1.0 to 1.0 into 16-bit PCM."""
+    return (numpy.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+
+
+def make_track(path, pitch, seconds, frequency):
+    """Write a stereo sine wave to path."""
+    t = numpy.arange(int(seconds * frequency)) / frequency
+    tone = 0.5 * numpy.sin(2 * numpy.pi * pitch * t)
+    w = wave.open(path, 'wb')
+    w.setnchannels(2)
+    w.setsampwidth(2)
+    w.setframerate(frequency)
+    w.writeframes(pcm(numpy.stack([tone, tone], axis=1)))
+    w.close()
+
+
+def percentile(timings, p):
+    """Return the pth percentile of timings in microseconds."""
+    return numpy.percentile(timings, p) * 1000000
+
+
+def run(args, tracks):
+    """Render the session and print per-block costs."""
+    engine = load_backend(args.backend)
+    if args.backend == 'bass':
+        # Device 0 is BASS's "no sound" device, so the mixer is pulled by
+        # get_data rather than by a sound card.
+        from sound_lib.output import Output
+        Output(device=0, frequency=args.frequency)
+        mixer = engine.Mixer(freq=args.frequency, decode=True)
+        size = args.block * 4
+
+        def render(frames):
+            return mixer.get_data(size)
+    else:
+        mixer = engine.Mixer(freq=args.frequency)
+        render = mixer.render
+    left = Deck('Left Deck', backend=engine, mixer=mixer)
+    right = Deck('Right Deck', backend=engine, mixer=mixer)
+    for deck, track in zip([left, right], tracks):
+        deck.set_stream(track)
+        deck.play()
+    right.set_frequency(args.frequency * 1.02)
+    right.set_pan(-0.5)
+    microphone = engine.PushStream(
+        freq=args.frequency, chans=1, decode=True
+    )
+    mixer.add_channel(microphone)
+    noise = pcm(numpy.random.uniform(-0.1, 0.1, args.block))
+    blocks = int(args.seconds * args.frequency / args.block)
+    timings = numpy.empty(blocks)
+    for index in range(blocks):
+        started = time.perf_counter()
+        microphone.push(noise)
+        render(args.block)
+        timings[index] = time.perf_counter() - started
+    budget = args.block / args.frequency
+    print(f'Backend: {args.backend}.')
+    print(f'Rendered {blocks} blocks of {args.block} frames.')
+    print(f'Budget per block: {budget * 1000000:.1f} us.')
+    for name, p in [('p50', 50), ('p99', 99), ('max', 100)]:
+        print(f'{name}: {percentile(timings, p):.1f} us.')
+    print(f'Realtime factor: {budget / timings.mean():.1f}x.')
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    with TemporaryDirectory() as directory:
+        tracks = args.tracks
+        for pitch in [440.0, 660.0][len(tracks):]:
+            path = os.path.join(directory, f'{pitch:.0f}.wav')
+            make_track(path, pitch, args.seconds, args.frequency)
+            tracks.append(path)
+        run(args, tracks)
@@ -0,0 +1,88 @@
+"""Measure how long pyjay takes to import, using python -X importtime.
+
+Run from the top of the repository:
+
+    python -m benchmarks.startup
+
+The interface module is imported in a fresh interpreter several times, and
+the fastest run is reported along with the slowest imports. The exit status
+is 1 if startup goes over budget, or if any module which should only be
+loaded when its hotkey is pressed was imported.
+"""
+
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+parser = ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument(
+    '--module', default='pyjay.ui', help='The module to import'
+)
+parser.add_argument(
+    '--runs', type=int, default=5, help='Number of interpreters to start'
+)
+parser.add_argument(
+    '--budget', type=float, default=1000.0,
+    help='The most milliseconds the import may take'
+)
+parser.add_argument(
+    '--top', type=int, default=15, help='Number of slow imports to show'
+)
+
+# Modules which are only imported when the command which needs them runs.
+deferred = [
+    'gmusicapi', 'requests', 'jinja2', 'simpleconf2.dialogs', 'pyjay.analysis',
+    'pyjay.state'
+]
+
+
+def import_times(module):
+    """Import module in a new interpreter, and return a dictionary mapping
+    every module imported to its cumulative import time in microseconds."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        stderr=subprocess.PIPE, universal_newlines=True
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_time, cumulative, name = line[12:].split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def run(args):
+    """Time the imports and print the results."""
+    fastest = None
+    for index in range(args.runs):
+        times = import_times(args.module)
+        if fastest is None or times[args.module] < fastest[args.module]:
+            fastest = times
+    total = fastest[args.module] / 1000
+    print(f'Importing {args.module} took {total:.1f} ms at best.')
+    for name, cumulative in sorted(
+        fastest.items(), key=lambda item: -item[1]
+    )[:args.top]:
+        print(f'{cumulative / 1000:10.1f} ms {name}')
+    failed = False
+    eager = [
+        name for name in fastest if any(
+            name == module or name.startswith(module + '.')
+            for module in deferred
+        )
+    ]
+    if eager:
+        print(f'Imported too early: {", ".join(sorted(eager))}.')
+        failed = True
+    if total > args.budget:
+        print(f'Over budget by {total - args.budget:.1f} ms.')
+        failed = True
+    return failed
+
+
+if __name__ == '__main__':
+    sys.exit(1 if run(parser.parse_args()) else 0)
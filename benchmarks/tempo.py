@@ -0,0 +1,108 @@
+"""Measure the CPU cost of running decks through Tempo streams.
+
+Run from the top of the repository:
+
+    python -m benchmarks.tempo [track.wav [track.wav]]
+
+Each quality setting renders the same decks with keylock on, their tempo and
+pitch moving a little every block as a held key would move them, and the CPU
+time per deck is compared with keylock off. Needs the BASS and BASS_FX
+libraries, but no sound card.
+"""
+
+import os.path
+import time
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from sound_lib.backends import load_backend
+from pyjay.deck import Deck
+from .session import make_track
+
+parser = ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument(
+    'tracks', nargs='*', help='WAV files to load onto the decks'
+)
+parser.add_argument(
+    '--seconds', type=float, default=30.0, help='Amount of audio to render'
+)
+parser.add_argument(
+    '--block', type=int, default=1024, help='Frames rendered per block'
+)
+parser.add_argument(
+    '--frequency', type=int, default=44100, help='Mixer sample rate'
+)
+
+# Quality settings to compare, passed to Tempo.set_quality. None means
+# keylock is off.
+qualities = [
+    ('keylock off', None),
+    ('quick', dict(use_quick_algorithm=True, use_aa_filter=False)),
+    ('default', dict()),
+    ('best', dict(aa_filter_length=128, prevent_click=True)),
+]
+
+
+def render_decks(args, engine, tracks, quality):
+    """Render a deck per track with quality, and return the CPU seconds
+    taken."""
+    mixer = engine.Mixer(freq=args.frequency, decode=True)
+    size = args.block * 4
+    decks = []
+    for index, track in enumerate(tracks):
+        deck = Deck(
+            f'Deck {index + 1}', backend=engine, mixer=mixer,
+            keylock=quality is not None
+        )
+        deck.set_stream(track)
+        if quality is not None:
+            deck.stream.set_quality(**quality)
+        deck.play()
+        decks.append(deck)
+    blocks = int(args.seconds * args.frequency / args.block)
+    started = time.process_time()
+    for index in range(blocks):
+        for deck in decks:
+            if deck.has_tempo():
+                # The same batched ramps a held key makes.
+                deck.automate('tempo', 0.01)
+                deck.automate('pitch', 0.001)
+                deck.poll_automations()
+        mixer.get_data(size)
+    taken = time.process_time() - started
+    for deck in decks:
+        deck.clear_stream()
+    mixer.free()
+    return taken
+
+
+def run(args, tracks):
+    """Render every quality setting and print the cost per deck."""
+    engine = load_backend('bass')
+    # Device 0 is BASS's "no sound" device, so the mixer is pulled by
+    # get_data rather than by a sound card.
+    from sound_lib.output import Output
+    Output(device=0, frequency=args.frequency)
+    print(f'Rendering {args.seconds:.0f} seconds with {len(tracks)} decks.')
+    baseline = None
+    for name, quality in qualities:
+        taken = render_decks(args, engine, tracks, quality)
+        per_deck = taken / len(tracks)
+        load = per_deck / args.seconds * 100
+        line = f'{name:>12}: {per_deck * 1000:8.1f} ms CPU per deck, ' \
+            f'{load:5.2f}% of a core'
+        if baseline is None:
+            baseline = per_deck
+        else:
+            line += f', {(per_deck - baseline) * 1000:+.1f} ms for keylock'
+        print(line + '.')
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    with TemporaryDirectory() as directory:
+        tracks = args.tracks
+        for pitch in [440.0, 660.0][len(tracks):]:
+            path = os.path.join(directory, f'{pitch:.0f}.wav')
+            make_track(path, pitch, args.seconds + 1.0, args.frequency)
+            tracks.append(path)
+        run(args, tracks)
@@ -1,8 +1,11 @@
 from __future__ import absolute_import
+import time
 import accessible_output2
 from .base import Output, OutputError
 
 class Auto(Output):
+	#How many seconds the active output is trusted for before the outputs are checked again, so a screen reader which is started or stopped is noticed without checking every output on every call.
+	revalidate_interval = 5.0
 
 	def __init__(self):
 		output_classes = accessible_output2.get_output_classes()
@@ -12,12 +15,24 @@ class Auto(Output):
 				self.outputs.append(output())
 			except OutputError:
 				pass
+		self.active_output = None
+		self.checked = None
 
 	def get_first_available_output(self):
+		now = time.time()
+		if self.checked is not None and now - self.checked < self.revalidate_interval:
+			return self.active_output
+		self.active_output = None
 		for output in self.outputs:
 			if output.is_active():
-				return output
-		return None
+				self.active_output = output
+				break
+		self.checked = now
+		return self.active_output
+
+	def invalidate(self):
+		"""Forgets the active output, so the next call checks them all again."""
+		self.checked = None
 
 	def speak(self, *args, **kwargs):
 		output = self.get_first_available_output()
@@ -15,10 +15,7 @@ class ESpeak(Output):
 	name = "Linux ESpeak"
 
 	def is_active(self):
-		try:
-			import espeak.core
-		except:
-			return False
+		#espeak.core was imported along with this module, which fails without it, so there is nothing left to check.
 		return True
 
 	def speak(self, text, interrupt = 0):
@@ -3,6 +3,7 @@ import collections
 import platform
 import os
 import sys
+import time
 
 TYPES = {
  'Linux': {
@@ -28,12 +29,65 @@ if platform.system() == 'Windows':
 
 class LibraryLoadError(OSError): pass
 
+#Every library loaded so far, mapped to a (path, seconds taken) tuple, in load order.
+loaded_libraries = collections.OrderedDict()
+
 def load_library(library, x86_path='.', x64_path='.', *args, **kwargs):
  lib = find_library_path(library, x86_path=x86_path, x64_path=x64_path)
+ started = time.time()
  loaded = _do_load(lib, *args, **kwargs)
  if loaded is not None:
+  loaded_libraries[library] = (lib, time.time() - started)
   return loaded
- raise LibraryLoadError('unable to load %r. Provided library path: %r' % (library, path))
+ raise LibraryLoadError('unable to load %r. Provided library path: %r' % (library, lib))
+
+def load_report():
+ """Returns a list of lines describing which libraries have been loaded, and how long each took."""
+ lines = ['%d libraries loaded:' % len(loaded_libraries)]
+ for library, (path, seconds) in loaded_libraries.items():
+  lines.append('%s: %.1f ms (%s)' % (library, seconds * 1000, path))
+ return lines
+
+class LazyLibrary(object):
+ """Stands in for a library, only loading it with load_library when something is first looked up on it.
+
+ Prototypes built from a LazyLibrary with LazyFunction resolve their symbols on first call, so nothing is loaded until a function is actually used."""
+
+ def __init__(self, library, x86_path='.', x64_path='.', *args, **kwargs):
+  self._name = library
+  self._paths = (x86_path, x64_path)
+  self._args = args
+  self._kwargs = kwargs
+  self._library = None
+
+ def load(self):
+  if self._library is None:
+   x86_path, x64_path = self._paths
+   self._library = load_library(self._name, x86_path, x64_path, *self._args, **self._kwargs)
+  return self._library
+
+ @property
+ def loaded(self):
+  return self._library is not None
+
+ def __getattr__(self, name):
+  if name.startswith('__'):
+   raise AttributeError(name)
+  return getattr(self.load(), name)
+
+class LazyFunction(object):
+ """A foreign function which is only looked up the first time it is called. prototype is a ctypes function type, as returned by get_functype()(restype, *argtypes)."""
+
+ def __init__(self, prototype, name, library):
+  self.prototype = prototype
+  self.name = name
+  self.library = library
+  self.function = None
+
+ def __call__(self, *args):
+  if self.function is None:
+   self.function = self.prototype((self.name, self.library.load() if isinstance(self.library, LazyLibrary) else self.library))
+  return self.function(*args)
 
 def _do_load(file, *args, **kwargs):
  loader = TYPES[platform.system()]['loader'] 
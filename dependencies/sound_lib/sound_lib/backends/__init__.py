@@ -0,0 +1,23 @@
+"""Interchangeable audio engines.
+
+Each backend module exposes FileStream, URLStream and PushStream with the same
+constructor signatures and channel methods as sound_lib.stream, so callers can
+pick an engine at runtime without importing BASS until it is needed. Error is
+the exception a backend raises when a call fails.
+
+Backends which can change tempo without changing pitch also expose Tempo, with
+the constructor and attributes of sound_lib.effects.Tempo."""
+
+from __future__ import absolute_import
+import importlib
+
+backends = {
+	'bass': '.bass',
+	'numpy': '.numpy_engine',
+}
+
+def load_backend(name='bass'):
+	"""Imports and returns the backend module registered under name."""
+	if name not in backends:
+		raise ValueError('Unknown backend %r. Choose from %s.' % (name, ', '.join(sorted(backends))))
+	return importlib.import_module(backends[name], __name__)
@@ -0,0 +1,7 @@
+"""The default backend, which plays everything through the BASS shared libraries."""
+
+from __future__ import absolute_import
+from ..stream import FileStream, URLStream, PushStream
+from ..main import BassError as Error
+from ..mixer import Mixer
+from ..effects.tempo import Tempo
@@ -0,0 +1,504 @@
+"""A pure-NumPy reference engine.
+
+Mirrors the channel API of sound_lib.channel.Channel without touching BASS, so
+whole sessions can be mixed, profiled and rendered headlessly. Only PCM WAV
+files can be decoded. Byte positions are reported as 16-bit PCM, the same
+format BASS uses by default, so they can be compared between engines."""
+
+from __future__ import absolute_import
+import io
+import wave
+from itertools import count
+import numpy
+
+ACTIVE_STOPPED = 0
+ACTIVE_PLAYING = 1
+ACTIVE_STALLED = 2
+ACTIVE_PAUSED = 3
+
+ATTRIB_FREQ = 1
+ATTRIB_VOL = 2
+ATTRIB_PAN = 3
+
+POS_BYTE = 0
+POS_END = 0x10
+POS_LOOP = 0x11
+
+ENV_VOL = 2
+ENV_LOOP = 0x10000
+
+SYNC_POS = 0
+SYNC_END = 2
+
+SAMPLE_WIDTH = 2
+
+class EngineError(Exception):
+	"""Raised when the engine is asked to do something it cannot do."""
+
+#The name every backend gives the exception its calls raise.
+Error = EngineError
+
+class ChannelInfo(object):
+	"""The subset of BASS_CHANNELINFO this engine can fill in."""
+
+	def __init__(self, freq, chans, flags=0):
+		self.freq = freq
+		self.chans = chans
+		self.flags = flags
+
+def decode_pcm(data, width, chans):
+	"""Converts interleaved little-endian PCM into a (frames, chans) float32 array."""
+	if width == 1:
+		samples = (numpy.frombuffer(data, dtype=numpy.uint8).astype(numpy.float32) - 128.0) / 128.0
+	elif width == 2:
+		samples = numpy.frombuffer(data, dtype='<i2').astype(numpy.float32) / 32768.0
+	elif width == 3:
+		raw = numpy.frombuffer(data, dtype=numpy.uint8).reshape(-1, 3).astype(numpy.int32)
+		values = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+		values = numpy.where(values & 0x800000, values - 0x1000000, values)
+		samples = values.astype(numpy.float32) / 8388608.0
+	elif width == 4:
+		samples = numpy.frombuffer(data, dtype='<i4').astype(numpy.float32) / 2147483648.0
+	else:
+		raise EngineError('Unsupported sample width: %d bytes.' % width)
+	return samples.reshape(-1, chans)
+
+def encode_pcm(samples):
+	"""Converts a float array into interleaved 16-bit little-endian PCM."""
+	return (numpy.clip(samples, -1.0, 1.0) * 32767.0).astype('<i2').tobytes()
+
+class Channel(object):
+	"""Base class for all engine channels.
+
+	Subclasses store their decoded audio in self.samples, a (frames, chans)
+	float32 array whose first row is frame number self.offset."""
+
+	def __init__(self, freq=44100, chans=2):
+		self.freq = freq
+		self.chans = chans
+		self.samples = numpy.zeros((0, chans), dtype=numpy.float32)
+		self.offset = 0
+		self.frame = 0.0
+		self.state = ACTIVE_STOPPED
+		self.looping = False
+		#Loop points in frames. Nothing loops unless loop_end is after loop_start.
+		self.loop_start = 0
+		self.loop_end = 0
+		self.attribute_mapping = {
+			'frequency': ATTRIB_FREQ,
+			'pan': ATTRIB_PAN,
+			'volume': ATTRIB_VOL,
+		}
+		self.attributes = {
+			ATTRIB_FREQ: float(freq),
+			ATTRIB_PAN: 0.0,
+			ATTRIB_VOL: 1.0,
+		}
+		self.slides = {}
+		self._last_volume = None
+
+	def add_attributes_to_mapping(self, **attrs):
+		self.attribute_mapping.update(**attrs)
+
+	def play(self, restart=False):
+		if restart:
+			self.frame = float(self.offset)
+		self.state = ACTIVE_PLAYING
+		return True
+
+	def pause(self):
+		self.state = ACTIVE_PAUSED
+		return True
+
+	def stop(self):
+		self.state = ACTIVE_STOPPED
+		return True
+
+	def free(self):
+		self.samples = self.samples[:0]
+		return self.stop()
+
+	def is_active(self):
+		return self.state
+
+	@property
+	def is_playing(self):
+		return self.state == ACTIVE_PLAYING
+
+	@property
+	def is_paused(self):
+		return self.state == ACTIVE_PAUSED
+
+	@property
+	def is_stopped(self):
+		return self.state == ACTIVE_STOPPED
+
+	@property
+	def is_stalled(self):
+		return self.state == ACTIVE_STALLED
+
+	@property
+	def bytes_per_frame(self):
+		return SAMPLE_WIDTH * self.chans
+
+	def get_length(self, mode=POS_BYTE):
+		return (self.offset + len(self.samples)) * self.bytes_per_frame
+
+	__len__ = get_length
+
+	def get_position(self, mode=POS_BYTE):
+		if mode == POS_LOOP:
+			return self.loop_start * self.bytes_per_frame
+		elif mode == POS_END:
+			return self.loop_end * self.bytes_per_frame
+		return int(self.frame) * self.bytes_per_frame
+
+	def set_position(self, pos, mode=POS_BYTE):
+		if mode == POS_LOOP:
+			self.loop_start = pos // self.bytes_per_frame
+		elif mode == POS_END:
+			self.loop_end = pos // self.bytes_per_frame
+		else:
+			self.frame = float(pos // self.bytes_per_frame)
+		return True
+
+	position = property(get_position, set_position)
+
+	def bytes_to_seconds(self, position=None):
+		if position is None:
+			position = self.position
+		return position / float(self.bytes_per_frame * self.freq)
+
+	def length_in_seconds(self):
+		return self.bytes_to_seconds(self.get_length())
+
+	def seconds_to_bytes(self, position):
+		return int(position * self.freq) * self.bytes_per_frame
+
+	def get_info(self):
+		return ChannelInfo(self.freq, self.chans)
+
+	def get_attribute(self, attribute):
+		attribute = self.attribute_mapping.get(attribute, attribute)
+		return self.attributes[attribute]
+
+	def set_attribute(self, attribute, value):
+		attribute = self.attribute_mapping.get(attribute, attribute)
+		self.slides.pop(attribute, None)
+		self.attributes[attribute] = float(value)
+		return True
+
+	def slide_attribute(self, attribute, value, time):
+		"""Slides an attribute to value over time seconds, advancing once per rendered block."""
+		attribute = self.attribute_mapping.get(attribute, attribute)
+		if time <= 0:
+			return self.set_attribute(attribute, value)
+		rate = (value - self.attributes[attribute]) / float(time)
+		self.slides[attribute] = (float(value), rate)
+		return True
+
+	def is_sliding(self, attribute=None):
+		if attribute is None:
+			return bool(self.slides)
+		return self.attribute_mapping.get(attribute, attribute) in self.slides
+
+	def get_attributes(self):
+		return {k: self.get_attribute(k) for k in self.attribute_mapping}
+
+	def get_frequency(self):
+		return self.get_attribute(ATTRIB_FREQ)
+
+	def set_frequency(self, frequency):
+		self.set_attribute(ATTRIB_FREQ, frequency)
+
+	frequency = property(fget=get_frequency, fset=set_frequency)
+
+	def get_pan(self):
+		return self.get_attribute(ATTRIB_PAN)
+
+	def set_pan(self, pan):
+		return self.set_attribute(ATTRIB_PAN, pan)
+
+	pan = property(fget=get_pan, fset=set_pan)
+
+	def get_volume(self):
+		return self.get_attribute(ATTRIB_VOL)
+
+	def set_volume(self, volume):
+		self.set_attribute(ATTRIB_VOL, volume)
+
+	volume = property(fget=get_volume, fset=set_volume)
+
+	def read_data(self, length=16384):
+		"""Reads up to length bytes of 16-bit PCM at the channel's own rate, advancing the position. Attributes are not applied, as with a decoding BASS channel."""
+		start = int(self.frame - self.offset)
+		block = self.samples[start:start + length // self.bytes_per_frame]
+		self.frame += len(block)
+		return encode_pcm(block)
+
+	def advance_slides(self, seconds):
+		for attribute, (target, rate) in list(self.slides.items()):
+			value = self.attributes[attribute] + rate * seconds
+			if (rate >= 0 and value >= target) or (rate < 0 and value <= target):
+				value = target
+				del self.slides[attribute]
+			self.attributes[attribute] = value
+
+	def ended(self):
+		"""Called when rendering runs past the end of self.samples."""
+		self.state = ACTIVE_STOPPED
+
+	def set_loop_points(self, start, end):
+		self.set_position(start, POS_LOOP)
+		return self.set_position(end, POS_END)
+
+	def read(self, frames, rate):
+		"""Resamples the next frames at rate from self.samples, returning a (frames, chans) array.
+
+		While looping, positions past loop_end wrap back to loop_start within the block."""
+		step = self.attributes[ATTRIB_FREQ] / float(rate)
+		positions = self.frame + step * numpy.arange(frames)
+		end = self.frame + step * frames
+		if self.looping and self.loop_start < self.loop_end and self.frame < self.loop_end:
+			span = float(self.loop_end - self.loop_start)
+			wrapped = positions >= self.loop_end
+			positions[wrapped] = self.loop_start + (positions[wrapped] - self.loop_end) % span
+			if end >= self.loop_end:
+				end = self.loop_start + (end - self.loop_end) % span
+		positions -= self.offset
+		available = len(self.samples)
+		if not available:
+			self.ended()
+			return numpy.zeros((frames, self.chans), dtype=numpy.float32)
+		index = positions.astype(numpy.int64)
+		fraction = (positions - index).astype(numpy.float32)[:, None]
+		valid = index < available
+		index = numpy.minimum(index, available - 1)
+		following = numpy.minimum(index + 1, available - 1)
+		block = self.samples[index] * (1.0 - fraction) + self.samples[following] * fraction
+		if valid.all():
+			self.frame = end
+		else:
+			block[~valid] = 0.0
+			self.frame = float(self.offset + available)
+			self.ended()
+		return block
+
+	def apply_gains(self, block):
+		"""Applies volume and pan to block, returning a (frames, 2) array.
+
+		Volume changes are ramped across the block rather than applied as a step."""
+		if block.shape[1] == 1:
+			block = numpy.repeat(block, 2, axis=1)
+		elif block.shape[1] > 2:
+			block = block[:, :2]
+		volume = self.attributes[ATTRIB_VOL]
+		start = volume if self._last_volume is None else self._last_volume
+		self._last_volume = volume
+		if start == volume:
+			gain = volume
+		else:
+			gain = numpy.linspace(start, volume, len(block), dtype=numpy.float32)[:, None]
+		pan = self.attributes[ATTRIB_PAN]
+		balance = numpy.array([min(1.0, 1.0 - pan), min(1.0, 1.0 + pan)], dtype=numpy.float32)
+		return block * gain * balance
+
+	def render(self, frames, rate):
+		"""Returns the next frames of this channel at rate as a (frames, 2) array, or None if it is silent."""
+		if self.state != ACTIVE_PLAYING:
+			return None
+		self.advance_slides(frames / float(rate))
+		return self.apply_gains(self.read(frames, rate))
+
+class FileStream(Channel):
+
+	def __init__(self, mem=False, file=None, offset=0, length=0, flags=0, three_d=False, mono=False, autofree=False, decode=False, unicode=True):
+		"""Decodes a PCM WAV file (or WAV data in memory if mem is True) into memory."""
+		self.file = file
+		self.decode = decode
+		if mem:
+			file = io.BytesIO(file[offset:offset + length if length else None])
+		reader = wave.open(file, 'rb')
+		try:
+			chans = reader.getnchannels()
+			width = reader.getsampwidth()
+			freq = reader.getframerate()
+			data = reader.readframes(reader.getnframes())
+		finally:
+			reader.close()
+		samples = decode_pcm(data, width, chans)
+		if mono and chans > 1:
+			samples = samples.mean(axis=1, keepdims=True)
+		super(FileStream, self).__init__(freq=freq, chans=samples.shape[1])
+		self.samples = samples
+
+class URLStream(Channel):
+
+	def __init__(self, url="", *args, **kwargs):
+		raise EngineError('The NumPy engine cannot stream %r; only local WAV files are supported.' % url)
+
+class PushStream(Channel):
+
+	def __init__(self, freq=44100, chans=2, flags=0, user=None, three_d=False, autofree=False, decode=False):
+		super(PushStream, self).__init__(freq=freq, chans=chans)
+		self.decode = decode
+
+	def push(self, data):
+		"""Queues 16-bit PCM data, returning the number of bytes waiting to be played."""
+		consumed = max(0, int(self.frame) - self.offset - 1)
+		if consumed:
+			self.samples = self.samples[consumed:]
+			self.offset += consumed
+		self.samples = numpy.concatenate((self.samples, decode_pcm(data, SAMPLE_WIDTH, self.chans)))
+		return (self.offset + len(self.samples) - int(self.frame)) * self.bytes_per_frame
+
+	def ended(self):
+		"""Running out of pushed data is an underrun, not the end of the stream."""
+		pass
+
+class Mixer(Channel):
+	"""Mixes any number of source channels into a single stereo stream."""
+
+	def __init__(self, freq=44100, chans=2, flags=0, end=False, nonstop=True, resume=True, three_d=False, autofree=False, decode=False):
+		super(Mixer, self).__init__(freq=freq, chans=2)
+		self.sources = []
+		self.paused = set()
+		self.envelopes = {}
+		self.envelope_mapping = {'volume': ENV_VOL}
+		self.sync_mapping = {'end': SYNC_END, 'position': SYNC_POS}
+		self.syncs = {}
+		self.sync_handles = count(1)
+		self.state = ACTIVE_PLAYING
+
+	def add_channel(self, channel, flags=0, filter=False, buffer=False, limit=False, matrix=False, paused=False, downmix=False, norampin=False):
+		"""Plugs a channel into the mixer. Sources are pulled whenever they are not paused, as BASS does with decoding channels."""
+		channel.play()
+		self.sources.append(channel)
+		self.set_channel_paused(channel, paused)
+		return True
+
+	def remove_channel(self, channel):
+		self.sources.remove(channel)
+		self.paused.discard(channel)
+		self.envelopes.pop(channel, None)
+		for sync, (source, type, param, func, onetime) in list(self.syncs.items()):
+			if source is channel:
+				del self.syncs[sync]
+		return True
+
+	def set_channel_paused(self, channel, paused):
+		if paused:
+			self.paused.add(channel)
+		else:
+			self.paused.discard(channel)
+		return True
+
+	def get_channel_position(self, channel, mode=POS_BYTE):
+		return channel.get_position(mode)
+
+	def set_channel_position(self, channel, pos, mode=POS_BYTE):
+		return channel.set_position(pos, mode)
+
+	def set_channel_envelope(self, channel, type, nodes, loop=False):
+		"""Sets a volume envelope on a source. Node positions are in bytes of the mixer's format."""
+		type = self.envelope_mapping.get(type, type) & ~ENV_LOOP
+		if type != ENV_VOL:
+			raise EngineError('Only volume envelopes are supported.')
+		if not nodes:
+			self.envelopes.pop(channel, None)
+			return True
+		positions = numpy.array([pos // self.bytes_per_frame for pos, value in nodes], dtype=numpy.float64)
+		values = numpy.array([value for pos, value in nodes], dtype=numpy.float32)
+		self.envelopes[channel] = [positions, values, loop, 0]
+		return True
+
+	def get_channel_envelope_position(self, channel, type):
+		positions, values, loop, position = self.envelopes[channel]
+		return position * self.bytes_per_frame, float(numpy.interp(position, positions, values))
+
+	def set_channel_envelope_position(self, channel, type, pos):
+		self.envelopes[channel][3] = pos // self.bytes_per_frame
+		return True
+
+	def set_channel_sync(self, channel, type, param, func, mixtime=True, onetime=False):
+		"""Calls func(channel) when a source reaches its end (type 'end') or the byte position param (type 'position').
+
+		Syncs fire after the block they happen in, so sources added there start on the next block rather than on the exact sample."""
+		sync = next(self.sync_handles)
+		self.syncs[sync] = (channel, self.sync_mapping.get(type, type), param, func, onetime)
+		return sync
+
+	def remove_channel_sync(self, sync):
+		"""Removes a sync set with set_channel_sync. Raises EngineError if it has gone already, because its source was removed or it was a onetime sync which has fired."""
+		if self.syncs.pop(sync, None) is None:
+			raise EngineError('No such sync: %r.' % sync)
+		return True
+
+	def fire_syncs(self, before):
+		"""Calls the syncs of sources whose end or sync position was passed in the last block. before maps each source to its byte position and whether it was playing before the block."""
+		for sync, (channel, type, param, func, onetime) in list(self.syncs.items()):
+			if channel not in before or sync not in self.syncs:
+				continue
+			position, playing = before[channel]
+			if type == SYNC_END:
+				fired = playing and channel.state == ACTIVE_STOPPED
+			else:
+				fired = position < param <= channel.get_position()
+			if fired:
+				if onetime:
+					del self.syncs[sync]
+				func(channel)
+
+	def envelope_gains(self, channel, frames):
+		"""Returns the envelope's gain for each of the next frames as a (frames, 1) array."""
+		envelope = self.envelopes[channel]
+		positions, values, loop, position = envelope
+		envelope[3] = position + frames
+		offsets = position + numpy.arange(frames)
+		if loop and positions[-1] > 0:
+			offsets = offsets % positions[-1]
+		return numpy.interp(offsets, positions, values).astype(numpy.float32)[:, None]
+
+	def render(self, frames, rate=None):
+		"""Mixes the next frames from every playing source into a (frames, 2) float32 array."""
+		out = numpy.zeros((frames, 2), dtype=numpy.float32)
+		if self.state != ACTIVE_PLAYING:
+			return out
+		before = {}
+		for source in list(self.sources):
+			if source in self.paused:
+				continue
+			if self.syncs:
+				before[source] = (source.get_position(), source.state == ACTIVE_PLAYING)
+			block = source.render(frames, self.freq)
+			if block is None:
+				continue
+			if source in self.envelopes:
+				block *= self.envelope_gains(source, frames)
+			out += block
+		if before:
+			self.fire_syncs(before)
+		self.advance_slides(frames / float(self.freq))
+		self.frame += frames
+		return self.apply_gains(out)
+
+	def render_to_buffer(self, seconds, block=1024):
+		"""Renders seconds of audio in blocks of block frames, returning one (frames, 2) array."""
+		total = int(seconds * self.freq)
+		blocks = [self.render(min(block, total - done)) for done in range(0, total, block)]
+		if not blocks:
+			return numpy.zeros((0, 2), dtype=numpy.float32)
+		return numpy.concatenate(blocks)
+
+	def render_to_file(self, filename, seconds, block=1024):
+		"""Renders seconds of audio into a 16-bit stereo WAV file."""
+		writer = wave.open(filename, 'wb')
+		try:
+			writer.setnchannels(2)
+			writer.setsampwidth(SAMPLE_WIDTH)
+			writer.setframerate(self.freq)
+			total = int(seconds * self.freq)
+			for done in range(0, total, block):
+				writer.writeframes(encode_pcm(self.render(min(block, total - done))))
+		finally:
+			writer.close()
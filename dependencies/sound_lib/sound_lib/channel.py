@@ -1,4 +1,9 @@
 from __future__ import absolute_import
+try:
+	#Slides expire by the monotonic clock, so changing the system time can't cut one short or hold it forever.
+	from time import monotonic as current_time
+except ImportError:
+	from time import time as current_time
 from .external.pybass import *
 from .main import bass_call, bass_call_0, BassError, update_3d_system, FlagObject
 from ctypes import pointer, c_float, c_long, c_ulong, c_buffer
@@ -14,6 +19,12 @@ class Channel (FlagObject):
 			'pan': BASS_ATTRIB_PAN,
 			'volume': BASS_ATTRIB_VOL
 		}
+		#Attribute values as last set or read, so reading them again doesn't need a call into BASS.
+		self.attribute_cache = {}
+		#Attributes which are being slid, mapped to the time the slide ends.
+		self.attribute_slides = {}
+		self.attribute_value = c_float()
+		self.attribute_pointer = pointer(self.attribute_value)
 
 	def add_attributes_to_mapping(self, **attrs):
 		self.attribute_mapping.update(**attrs)
@@ -103,25 +114,53 @@ class Channel (FlagObject):
 		"""Translates a time (seconds) position into bytes, based on a channel's format."""
 		return bass_call_0(BASS_ChannelSeconds2Bytes, self.handle, position)
 
-	def get_attribute(self, attribute):
-		"""Retrieves the value of a channel's attribute."""
-		value = pointer(c_float())
+	def get_attribute(self, attribute, cached=True):
+		"""Retrieves the value of a channel's attribute.
+
+		Values set or read through this object are cached, so BASS is only asked again while the attribute is sliding or if cached is False. A mixer envelope scales the source as it is mixed without changing its attributes, so doesn't affect the cache."""
 		if attribute in self.attribute_mapping:
 			attribute = self.attribute_mapping[attribute]
-		bass_call(BASS_ChannelGetAttribute, self.handle, attribute, value)
-		return value.contents.value
+		if attribute in self.attribute_slides and current_time() >= self.attribute_slides[attribute]:
+			del self.attribute_slides[attribute]
+		cacheable = attribute not in self.attribute_slides
+		if cached and cacheable and attribute in self.attribute_cache:
+			return self.attribute_cache[attribute]
+		bass_call(BASS_ChannelGetAttribute, self.handle, attribute, self.attribute_pointer)
+		value = self.attribute_value.value
+		if cacheable:
+			self.attribute_cache[attribute] = value
+		return value
 
 	def set_attribute(self, attribute, value):
 		"""Sets the value of a channel's attribute."""
 		if attribute in self.attribute_mapping:
 			attribute = self.attribute_mapping[attribute]
-		return bass_call(BASS_ChannelSetAttribute, self.handle, attribute, value)
+		result = bass_call(BASS_ChannelSetAttribute, self.handle, attribute, value)
+		self.attribute_slides.pop(attribute, None)
+		if attribute == BASS_ATTRIB_FREQ and not value:
+			#0 means the original rate, which only BASS knows.
+			self.attribute_cache.pop(attribute, None)
+		elif attribute == BASS_ATTRIB_PAN:
+			self.attribute_cache[attribute] = max(-1.0, min(1.0, float(value)))
+		else:
+			self.attribute_cache[attribute] = float(value)
+		return result
 
 	def slide_attribute(self, attribute, value, time):
 		"""Slides a channel's attribute from its current value to a new value."""
 		if attribute in self.attribute_mapping:
 			attribute = self.attribute_mapping[attribute]
-		return bass_call(BASS_ChannelSlideAttribute, self.handle, attribute, value, time*1000)
+		result = bass_call(BASS_ChannelSlideAttribute, self.handle, attribute, value, time*1000)
+		self.attribute_cache.pop(attribute, None)
+		self.attribute_slides[attribute] = current_time() + time
+		return result
+
+	def invalidate_attributes(self, *attributes):
+		"""Forgets the cached values of the given attributes (or of all of them), so they are read from BASS next time. Call this after changing attributes without going through this object."""
+		if not attributes:
+			self.attribute_cache.clear()
+		for attribute in attributes:
+			self.attribute_cache.pop(self.attribute_mapping.get(attribute, attribute), None)
 
 	def is_sliding (self, attribute=None):
 		"""Checks if an attribute (or any attribute) of a sample, stream, or MOD music is sliding."""
@@ -222,6 +261,18 @@ class Channel (FlagObject):
 		bass_call_0(BASS_ChannelGetData, self.handle, pointer(buf), length)
 		return buf
 
+	def read_data(self, length=16384):
+		"""Reads up to length bytes of sample data from a decoding channel, returning only the bytes actually read. Returns an empty string once the channel has ended."""
+		buf = c_buffer(length)
+		res = BASS_ChannelGetData(self.handle, pointer(buf), length)
+		#The return type is unsigned, so -1 comes back as 0xFFFFFFFF.
+		if res in (-1, 0xFFFFFFFF):
+			code = BASS_ErrorGetCode()
+			if code == BASS_ERROR_ENDED:
+				return b''
+			raise BassError(code, get_error_description(code))
+		return buf.raw[:res]
+
 
 #This is less and less of a one-to-one mapping,
 #But I feel that it's better to be consistent with ourselves
@@ -229,7 +280,7 @@ class Channel (FlagObject):
 #For their bad decisions
 
 	def get_looping(self):
-		return bass_call_0(BASS_ChannelFlags, self.handle, BASS_SAMPLE_LOOP, 0) == 20
+		return bool(bass_call_0(BASS_ChannelFlags, self.handle, 0, 0) & BASS_SAMPLE_LOOP)
 
 	def set_looping(self, looping):
 		if looping:
@@ -238,6 +289,11 @@ class Channel (FlagObject):
 
 	looping = property(fget=get_looping, fset=set_looping)
 
+	def set_loop_points(self, start, end):
+		"""Sets the byte positions the channel loops between while looping is on. BASS jumps back to start itself when it reaches end, so looping costs nothing in Python."""
+		bass_call(BASS_ChannelSetPosition, self.handle, start, BASS_POS_LOOP)
+		return bass_call(BASS_ChannelSetPosition, self.handle, end, BASS_POS_END)
+
 	def __del__(self):
 		try:
 			self.free()
@@ -274,12 +330,12 @@ class Channel (FlagObject):
 
 	z = property(fget=get_z, fset=set_z)
 
-	def get_attributes(self):
-		"""Retrieves all values of all attributes from this object and displays them in a dictionary whose keys are determined by this object's attribute_mapping"""
+	def get_attributes(self, cached=True):
+		"""Retrieves all values of all attributes from this object and displays them in a dictionary whose keys are determined by this object's attribute_mapping. Cached values are used where possible, and everything else is read through one reused buffer."""
 		res = {}
 		for k in self.attribute_mapping:
 			try:
-				res[k] = self.get_attribute(k)
+				res[k] = self.get_attribute(k, cached=cached)
 			except BassError:
 				pass
 		return res
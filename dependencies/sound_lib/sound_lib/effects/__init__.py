@@ -1,2 +1,3 @@
 from __future__ import absolute_import
 from .tempo import Tempo
+from .bpm import get_bpm, get_beats
@@ -1,13 +1,20 @@
 from sound_lib.external import pybass_fx
 from effect import SoundEffect
 
-class Volume(SoundEffect):
+class BFXEffect(SoundEffect):
+ """An effect from bass_fx. BASS only knows about these once bass_fx is loaded, so the first one made calls into it, which loads it."""
+
+ def __init__(self, *args, **kwargs):
+  pybass_fx.BASS_FX_GetVersion()
+  super(BFXEffect, self).__init__(*args, **kwargs)
+
+class Volume(BFXEffect):
  effect_type = pybass_fx.BASS_FX_BFX_VOLUME
  struct = pybass_fx.BASS_BFX_VOLUME
 
-class PeakEq(SoundEffect):
+class PeakEq(BFXEffect):
  effect_type = pybass_fx.BASS_FX_BFX_PEAKEQ
  struct = pybass_fx.BASS_BFX_PEAKEQ
-class DAmp(SoundEffect):
+class DAmp(BFXEffect):
  effect_type = pybass_fx.BASS_FX_BFX_DAMP
  struct = pybass_fx.BASS_BFX_DAMP
@@ -0,0 +1,38 @@
+from __future__ import absolute_import
+from ..external import pybass_fx
+from ..main import bass_call, bass_call_0
+
+def min_max_bpm(min_bpm, max_bpm):
+ """Packs a BPM range into the DWORD bass_fx expects. 0 for both uses the library's defaults."""
+ return (int(min_bpm) & 0xffff) | ((int(max_bpm) & 0xffff) << 16)
+
+def get_bpm(channel, start=0.0, end=None, min_bpm=0, max_bpm=0, mult2=False):
+ """Detects the tempo of a decoding channel between start and end seconds (the whole channel by default), returning it in beats per minute.
+
+ The channel is read from start to end, so its position will have moved afterwards."""
+ flags = pybass_fx.BASS_FX_BPM_MULT2 if mult2 else 0
+ if end is None:
+  end = channel.length_in_seconds()
+ handle = channel.handle
+ try:
+  return bass_call_0(pybass_fx.BASS_FX_BPM_DecodeGet, handle, start, end, min_max_bpm(min_bpm, max_bpm), flags, pybass_fx.BPMPROCESSPROC())
+ finally:
+  pybass_fx.BASS_FX_BPM_Free(handle)
+
+def get_beats(channel, start=0.0, end=None):
+ """Detects beats in a decoding channel between start and end seconds (the whole channel by default), returning a list of their positions in seconds.
+
+ The channel is read from start to end, so its position will have moved afterwards."""
+ beats = []
+ def callback(handle, position, user):
+  beats.append(position)
+ #Hold on to the callback until detection has finished.
+ proc = pybass_fx.BPMBEATPROC(callback)
+ if end is None:
+  end = channel.length_in_seconds()
+ handle = channel.handle
+ try:
+  bass_call(pybass_fx.BASS_FX_BPM_BeatDecodeGet, handle, start, end, 0, proc, None)
+ finally:
+  pybass_fx.BASS_FX_BPM_BeatFree(handle)
+ return beats
@@ -6,9 +6,13 @@ from ..channel import Channel
 from ..main import bass_call, bass_call_0
 
 class Tempo(BaseStream):
+ """Changes the tempo of a decoding channel without changing its pitch, or its pitch without changing its tempo.
+
+ The quality options, described in the BASS_FX documentation, can be changed while the stream plays."""
  
  def __init__(self, channel, flags=0, loop=False, software=False, three_d=False, sample_fx=False, autofree=False, decode=False, free_source=False):
-  flags = flags | self.flags_for(loop=False, software=False, three_d=False, sample_fx=False, autofree=False, decode=False, free_source=False)
+  self.setup_flag_mapping()
+  flags = flags | self.flags_for(loop=loop, software=software, three_d=three_d, sample_fx=sample_fx, autofree=autofree, decode=decode, free_source=free_source)
   self.channel = channel
   if isinstance(channel, Channel):
    channel = channel.handle
@@ -18,13 +22,20 @@ class Tempo(BaseStream):
    tempo=pybass_fx.BASS_ATTRIB_TEMPO,
    tempo_pitch=pybass_fx.BASS_ATTRIB_TEMPO_PITCH,
    tempo_freq=pybass_fx.BASS_ATTRIB_TEMPO_FREQ,
+   use_aa_filter=pybass_fx.BASS_ATTRIB_TEMPO_OPTION_USE_AA_FILTER,
+   aa_filter_length=pybass_fx.BASS_ATTRIB_TEMPO_OPTION_AA_FILTER_LENGTH,
+   use_quick_algorithm=pybass_fx.BASS_ATTRIB_TEMPO_OPTION_USE_QUICKALGO,
+   sequence_ms=pybass_fx.BASS_ATTRIB_TEMPO_OPTION_SEQUENCE_MS,
+   seek_window_ms=pybass_fx.BASS_ATTRIB_TEMPO_OPTION_SEEKWINDOW_MS,
+   overlap_ms=pybass_fx.BASS_ATTRIB_TEMPO_OPTION_OVERLAP_MS,
+   prevent_click=pybass_fx.BASS_ATTRIB_TEMPO_OPTION_PREVENT_CLICK,
   )
  
 
  @property
  def tempo(self):
-  """The tempo of a channel."""
-  return self.get_attribute(pybass_fx.BASS_ATTRIB_TEMPO)
+  """The tempo of a channel, as a percentage change."""
+  return self.get_attribute('tempo')
  
  @tempo.setter
  def tempo(self, val):
@@ -32,6 +43,7 @@ class Tempo(BaseStream):
 
  @property
  def tempo_pitch(self):
+  """The pitch of a channel, in semitones."""
   return self.get_attribute('tempo_pitch')
 
  @tempo_pitch.setter
@@ -40,6 +52,7 @@ class Tempo(BaseStream):
 
  @property
  def tempo_freq(self):
+  """The sample rate of a channel, which changes tempo and pitch together."""
   return self.get_attribute('tempo_freq')
 
  @tempo_freq.setter
@@ -50,11 +63,19 @@ class Tempo(BaseStream):
   super(Tempo, self).setup_flag_mapping()
   self.flag_mapping.update({
    'free_source': pybass_fx.BASS_FX_FREESOURCE,
+   'sample_fx': pybass.BASS_SAMPLE_FX,
   })
 
+ def set_quality(self, use_quick_algorithm=False, use_aa_filter=True, aa_filter_length=32, prevent_click=False):
+  """Sets the quality options in one go. The defaults are those of BASS_FX."""
+  self.set_attribute('use_quick_algorithm', use_quick_algorithm)
+  self.set_attribute('use_aa_filter', use_aa_filter)
+  self.set_attribute('aa_filter_length', aa_filter_length)
+  self.set_attribute('prevent_click', prevent_click)
+
  def get_source(self):
-  source = pybass_fx.BASS_FX_TempoGetSource(self.handle)
-  if source == self.channel.handle:
+  source = bass_call_0(pybass_fx.BASS_FX_TempoGetSource, self.handle)
+  if isinstance(self.channel, Channel) and source == self.channel.handle:
    source = self.channel
   return source
 
@@ -1,10 +1,31 @@
 from __future__ import absolute_import
+import importlib
 import platform
-from . import pybassopus
+
+#Add-on modules are imported (and their libraries loaded) on first access rather than with this package.
+modules = ['pybass', 'pybass_fx', 'pybassenc', 'pybassmix', 'pytags', 'pybassopus']
+#Decoder plugins, which register themselves with BASS when imported.
+plugins = ['pybassopus']
 if platform.system() == 'Windows':
- from . import pybasswma
+ modules.extend(['pybasswma', 'pybasswasapi'])
+ plugins.append('pybasswma')
 if platform.system() != 'Darwin':
- from . import pybass_aac
- from . import pybass_alac
- from . import pybassflac
- from . import pybassmidi
+ modules.extend(['pybass_aac', 'pybass_alac', 'pybassflac', 'pybassmidi'])
+ plugins.extend(['pybass_aac', 'pybass_alac', 'pybassflac', 'pybassmidi'])
+
+def __getattr__(name):
+ if name in modules:
+  return importlib.import_module('.' + name, __name__)
+ raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+def load_plugins():
+ """Imports every decoder plugin, so BASS can open the formats they support. Returns the names of the plugins which were not already loaded."""
+ loaded = []
+ for name in plugins:
+  if name not in globals():
+   try:
+    importlib.import_module('.' + name, __name__)
+   except OSError:
+    continue #The plugin isn't available here.
+   loaded.append(name)
+ return loaded
@@ -727,6 +727,8 @@ class TAG_CA_CODEC(ctypes.Structure):
 # BASS_ChannelGetLength/GetPosition/SetPosition modes
 BASS_POS_BYTE = 0# byte position
 BASS_POS_MUSIC_ORDER = 1# order.row position, MAKELONG(order,row)
+BASS_POS_END = 0x10# end position
+BASS_POS_LOOP = 0x11# loop start position
 BASS_POS_DECODE = 0x10000000# flag: get the decoding (not playing) position
 
 # BASS_RecordSetInput flags
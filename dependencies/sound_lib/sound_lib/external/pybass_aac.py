@@ -17,10 +17,12 @@ from . import pybass
 from .paths import x86_path, x64_path
 import libloader
 
-bass_aac_module = libloader.load_library('bass_aac', x86_path=x86_path, x64_path=x64_path)
+#Nothing is loaded until the first of its functions is called.
+bass_aac_module = libloader.LazyLibrary('bass_aac', x86_path=x86_path, x64_path=x64_path)
 func_type = libloader.get_functype()
 #Register the plugin with the Bass plugin system.
-pybass.BASS_PluginLoad(libloader.find_library_path('bass_aac', x86_path=x86_path, x64_path=x64_path), 0)
+if not pybass.BASS_PluginLoad(libloader.find_library_path('bass_aac', x86_path=x86_path, x64_path=x64_path), 0):
+	raise libloader.LibraryLoadError('unable to load the aac plugin')
 
 QWORD = pybass.QWORD
 HSTREAM = pybass.HSTREAM
@@ -42,12 +44,12 @@ BASS_CTYPE_STREAM_MP4 = 0x10b01 # MP4
 
 
 #HSTREAM BASSAACDEF(BASS_AAC_StreamCreateFile)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags);
-BASS_AAC_StreamCreateFile = func_type(HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong)(('BASS_AAC_StreamCreateFile', bass_aac_module))
+BASS_AAC_StreamCreateFile = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong), 'BASS_AAC_StreamCreateFile', bass_aac_module)
 #HSTREAM BASSAACDEF(BASS_AAC_StreamCreateURL)(const char *url, DWORD offset, DWORD flags, DOWNLOADPROC *proc, void *user);
-BASS_AAC_StreamCreateURL = func_type(HSTREAM, ctypes.c_char_p, ctypes.c_ulong, ctypes.c_ulong, DOWNLOADPROC, ctypes.c_void_p)(('BASS_AAC_StreamCreateURL', bass_aac_module))
+BASS_AAC_StreamCreateURL = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_char_p, ctypes.c_ulong, ctypes.c_ulong, DOWNLOADPROC, ctypes.c_void_p), 'BASS_AAC_StreamCreateURL', bass_aac_module)
 #HSTREAM BASSAACDEF(BASS_AAC_StreamCreateFileUser)(DWORD system, DWORD flags, const BASS_FILEPROCS *procs, void *user);
-BASS_AAC_StreamCreateFileUser = func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_FILEPROCS), ctypes.c_void_p)(('BASS_AAC_StreamCreateFileUser', bass_aac_module))
+BASS_AAC_StreamCreateFileUser = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_FILEPROCS), ctypes.c_void_p), 'BASS_AAC_StreamCreateFileUser', bass_aac_module)
 #HSTREAM BASSAACDEF(BASS_MP4_StreamCreateFile)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags);
-BASS_MP4_StreamCreateFile = func_type(HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong)(('BASS_MP4_StreamCreateFile', bass_aac_module))
+BASS_MP4_StreamCreateFile = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong), 'BASS_MP4_StreamCreateFile', bass_aac_module)
 #HSTREAM BASSAACDEF(BASS_MP4_StreamCreateFileUser)(DWORD system, DWORD flags, const BASS_FILEPROCS *procs, void *user);
-BASS_MP4_StreamCreateFileUser = func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_FILEPROCS), ctypes.c_void_p)(('BASS_MP4_StreamCreateFileUser', bass_aac_module))
+BASS_MP4_StreamCreateFileUser = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_FILEPROCS), ctypes.c_void_p), 'BASS_MP4_StreamCreateFileUser', bass_aac_module)
@@ -7,18 +7,20 @@ from . import pybass
 from .paths import x86_path, x64_path
 import libloader
 
-bass_fx_module = libloader.load_library('bass_alac', x86_path=x86_path, x64_path=x64_path)
+#Nothing is loaded until the first of its functions is called.
+bass_alac_module = libloader.LazyLibrary('bass_alac', x86_path=x86_path, x64_path=x64_path)
 func_type = libloader.get_functype()
 
-pybass.BASS_PluginLoad(libloader.find_library_path('bass_alac', x86_path=x86_path, x64_path=x64_path), 0)
+if not pybass.BASS_PluginLoad(libloader.find_library_path('bass_alac', x86_path=x86_path, x64_path=x64_path), 0):
+	raise libloader.LibraryLoadError('unable to load the alac plugin')
 
 BASS_TAG_MP4 = 7
 BASS_CTYPE_STREAM_ALAC = 0x10e00
 
 
 #HSTREAM BASSALACDEF(BASS_ALAC_StreamCreateFile)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags);
-BASS_ALAC_StreamCreateFile = func_type(pybass.HSTREAM, ctypes.c_byte, ctypes.c_void_p, pybass.QWORD, pybass.QWORD, ctypes.c_ulong)
+BASS_ALAC_StreamCreateFile = libloader.LazyFunction(func_type(pybass.HSTREAM, ctypes.c_byte, ctypes.c_void_p, pybass.QWORD, pybass.QWORD, ctypes.c_ulong), 'BASS_ALAC_StreamCreateFile', bass_alac_module)
 
 #HSTREAM BASSALACDEF(BASS_ALAC_StreamCreateFileUser)(DWORD system, DWORD flags, const BASS_FILEPROCS *procs, void *user);
-BASS_ALAC_StreamCreateFileUser = func_type(pybass.HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_void_p)
+BASS_ALAC_StreamCreateFileUser = libloader.LazyFunction(func_type(pybass.HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_void_p), 'BASS_ALAC_StreamCreateFileUser', bass_alac_module)
 
@@ -7,7 +7,8 @@ from . import pybass
 from .paths import x86_path, x64_path
 import libloader
 
-bass_fx_module = libloader.load_library('bass_fx', x86_path=x86_path, x64_path=x64_path)
+#Nothing is loaded until the first bass_fx function is called.
+bass_fx_module = libloader.LazyLibrary('bass_fx', x86_path=x86_path, x64_path=x64_path)
 func_type = libloader.get_functype()
 
 
@@ -19,7 +20,7 @@ BASS_ERROR_FX_BPMINUSE = 4001
 BASS_FX_FREESOURCE = 0x10000
 
 #BASS_FX Version 
-BASS_FX_GetVersion = func_type(ctypes.c_ulong)(('BASS_FX_GetVersion', bass_fx_module))
+BASS_FX_GetVersion = libloader.LazyFunction(func_type(ctypes.c_ulong), 'BASS_FX_GetVersion', bass_fx_module)
 
 
 """D S P (Digital Signal Processing)"""
@@ -295,16 +296,16 @@ tempo attributes (BASS_ChannelSet/GetAttribute)"""
  BASS_ATTRIB_TEMPO_OPTION_SEEKWINDOW_MS, #28 default, 0 = automatic
  BASS_ATTRIB_TEMPO_OPTION_OVERLAP_MS, #8  default
  BASS_ATTRIB_TEMPO_OPTION_PREVENT_CLICK, #TRUE / FALSE (default)
-) = range(0x10000, 0x10000+7)
+) = range(0x10010, 0x10010+7)
 
 #HSTREAM BASS_FXDEF(BASS_FX_TempoCreate)(DWORD chan, DWORD flags);
-BASS_FX_TempoCreate = func_type(pybass.HSTREAM, ctypes.c_ulong, ctypes.c_ulong)(('BASS_FX_TempoCreate', bass_fx_module))
+BASS_FX_TempoCreate = libloader.LazyFunction(func_type(pybass.HSTREAM, ctypes.c_ulong, ctypes.c_ulong), 'BASS_FX_TempoCreate', bass_fx_module)
 
 #DWORD BASS_FXDEF(BASS_FX_TempoGetSource)(HSTREAM chan);
-BASS_FX_TempoGetSource = func_type(ctypes.c_ulong, pybass.HSTREAM)(('BASS_FX_TempoGetSource', bass_fx_module))
+BASS_FX_TempoGetSource = libloader.LazyFunction(func_type(ctypes.c_ulong, pybass.HSTREAM), 'BASS_FX_TempoGetSource', bass_fx_module)
 
 #float BASS_FXDEF(BASS_FX_TempoGetRateRatio)(HSTREAM chan);
-BASS_FX_TempoGetRateRatio = func_type(ctypes.c_float, pybass.HSTREAM)(('BASS_FX_TempoGetRateRatio', bass_fx_module))
+BASS_FX_TempoGetRateRatio = libloader.LazyFunction(func_type(ctypes.c_float, pybass.HSTREAM), 'BASS_FX_TempoGetRateRatio', bass_fx_module)
 
 """R E V E R S E"""
 """NOTES: 1. MODs won't load without BASS_MUSIC_PRESCAN flag.
@@ -318,10 +319,10 @@ BASS_FX_RVS_REVERSE = -1
 BASS_FX_RVS_FORWARD = 1
 
 #HSTREAM BASS_FXDEF(BASS_FX_ReverseCreate)(DWORD chan, float dec_block, DWORD flags);
-BASS_FX_ReverseCreate = func_type(pybass.HSTREAM, ctypes.c_ulong, ctypes.c_float, ctypes.c_ulong)(('BASS_FX_ReverseCreate', bass_fx_module))
+BASS_FX_ReverseCreate = libloader.LazyFunction(func_type(pybass.HSTREAM, ctypes.c_ulong, ctypes.c_float, ctypes.c_ulong), 'BASS_FX_ReverseCreate', bass_fx_module)
 
 #DWORD BASS_FXDEF(BASS_FX_ReverseGetSource)(HSTREAM chan);
-BASS_FX_ReverseGetSource = func_type(ctypes.c_ulong, pybass.HSTREAM)(('BASS_FX_ReverseGetSource', bass_fx_module))
+BASS_FX_ReverseGetSource = libloader.LazyFunction(func_type(ctypes.c_ulong, pybass.HSTREAM), 'BASS_FX_ReverseGetSource', bass_fx_module)
 
 """B P M (Beats Per Minute)"""
 
@@ -339,25 +340,25 @@ BASS_FX_BPM_MULT2 = 2 #if in use, then will auto multiply bpm by 2 (if BPM < min
 ) = range(5)
 
 #typedef void (CALLBACK BPMPROCESSPROC)(DWORD chan, float percent);
-BPMPROCESSPROC = func_type(None, ctypes.c_float)
+BPMPROCESSPROC = func_type(None, ctypes.c_ulong, ctypes.c_float)
 
 #typedef void (CALLBACK BPMPROC)(DWORD chan, float bpm, void *user);
 BPMPROC = func_type(None, ctypes.c_long, ctypes.c_float, ctypes.c_void_p)
 
 #float BASS_FXDEF(BASS_FX_BPM_DecodeGet)(DWORD chan, double startSec, double endSec, DWORD minMaxBPM, DWORD flags, BPMPROCESSPROC *proc);
-BASS_FX_BPM_DecodeGet = func_type(ctypes.c_float, ctypes.c_ulong, ctypes.c_double, ctypes.c_double, ctypes.c_ulong, ctypes.c_ulong, BPMPROCESSPROC)(('BASS_FX_BPM_DecodeGet', bass_fx_module))
+BASS_FX_BPM_DecodeGet = libloader.LazyFunction(func_type(ctypes.c_float, ctypes.c_ulong, ctypes.c_double, ctypes.c_double, ctypes.c_ulong, ctypes.c_ulong, BPMPROCESSPROC), 'BASS_FX_BPM_DecodeGet', bass_fx_module)
 
 #BOOL BASS_FXDEF(BASS_FX_BPM_CallbackSet)(DWORD handle, BPMPROC *proc, double period, DWORD minMaxBPM, DWORD flags, void *user);
-BASS_FX_BPM_CallbackSet = func_type(ctypes.c_bool, ctypes.c_ulong, BPMPROC, ctypes.c_double, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_void_p)(('BASS_FX_BPM_CallbackSet', bass_fx_module))
+BASS_FX_BPM_CallbackSet = libloader.LazyFunction(func_type(ctypes.c_bool, ctypes.c_ulong, BPMPROC, ctypes.c_double, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_void_p), 'BASS_FX_BPM_CallbackSet', bass_fx_module)
 
 #BOOL BASS_FXDEF(BASS_FX_BPM_CallbackReset)(DWORD handle);
-BASS_FX_BPM_CallbackReset = func_type(ctypes.c_bool, ctypes.c_ulong)(('BASS_FX_BPM_CallbackReset', bass_fx_module))
+BASS_FX_BPM_CallbackReset = libloader.LazyFunction(func_type(ctypes.c_bool, ctypes.c_ulong), 'BASS_FX_BPM_CallbackReset', bass_fx_module)
 
 #float BASS_FXDEF(BASS_FX_BPM_Translate)(DWORD handle, float val2tran, DWORD trans);
-BASS_FX_BPM_Translate = func_type(ctypes.c_float, ctypes.c_ulong, ctypes.c_float, ctypes.c_ulong)(('BASS_FX_BPM_Translate', bass_fx_module))
+BASS_FX_BPM_Translate = libloader.LazyFunction(func_type(ctypes.c_float, ctypes.c_ulong, ctypes.c_float, ctypes.c_ulong), 'BASS_FX_BPM_Translate', bass_fx_module)
 
 #BOOL BASS_FXDEF(BASS_FX_BPM_Free)(DWORD handle);
-BASS_FX_BPM_Free = func_type(ctypes.c_bool, ctypes.c_ulong)(('BASS_FX_BPM_Free', bass_fx_module))
+BASS_FX_BPM_Free = libloader.LazyFunction(func_type(ctypes.c_bool, ctypes.c_ulong), 'BASS_FX_BPM_Free', bass_fx_module)
 
 """ Beat """
 
@@ -365,19 +366,19 @@ BASS_FX_BPM_Free = func_type(ctypes.c_bool, ctypes.c_ulong)(('BASS_FX_BPM_Free',
 BPMBEATPROC = func_type(None, ctypes.c_ulong, ctypes.c_double, ctypes.c_void_p)
 
 #BOOL BASS_FXDEF(BASS_FX_BPM_BeatCallbackSet)(DWORD handle, BPMBEATPROC *proc, void *user);
-BASS_FX_BPM_BeatCallbackSet = func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_void_p)(('BASS_FX_BPM_BeatCallbackSet', bass_fx_module))
+BASS_FX_BPM_BeatCallbackSet = libloader.LazyFunction(func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_void_p), 'BASS_FX_BPM_BeatCallbackSet', bass_fx_module)
 
 #BOOL BASS_FXDEF(BASS_FX_BPM_BeatCallbackReset)(DWORD handle);
-BASS_FX_BPM_BeatCallbackReset = func_type(ctypes.c_bool, ctypes.c_ulong)(('BASS_FX_BPM_BeatCallbackReset', bass_fx_module))
+BASS_FX_BPM_BeatCallbackReset = libloader.LazyFunction(func_type(ctypes.c_bool, ctypes.c_ulong), 'BASS_FX_BPM_BeatCallbackReset', bass_fx_module)
 
 #BOOL BASS_FXDEF(BASS_FX_BPM_BeatDecodeGet)(DWORD chan, double startSec, double endSec, DWORD flags, BPMBEATPROC *proc, void *user);
-BASS_FX_BPM_BeatDecodeGet = func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_double, ctypes.c_double, ctypes.c_ulong, BPMBEATPROC, ctypes.c_void_p)(('BASS_FX_BPM_BeatDecodeGet', bass_fx_module))
+BASS_FX_BPM_BeatDecodeGet = libloader.LazyFunction(func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_double, ctypes.c_double, ctypes.c_ulong, BPMBEATPROC, ctypes.c_void_p), 'BASS_FX_BPM_BeatDecodeGet', bass_fx_module)
 
 #BOOL BASS_FXDEF(BASS_FX_BPM_BeatSetParameters)(DWORD handle, float bandwidth, float centerfreq, float beat_rtime);
-BASS_FX_BPM_BeatSetParameters = func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_float, ctypes.c_float, ctypes.c_float)(('BASS_FX_BPM_BeatSetParameters', bass_fx_module))
+BASS_FX_BPM_BeatSetParameters = libloader.LazyFunction(func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_float, ctypes.c_float, ctypes.c_float), 'BASS_FX_BPM_BeatSetParameters', bass_fx_module)
 
 #BOOL BASS_FXDEF(BASS_FX_BPM_BeatGetParameters)(DWORD handle, float *bandwidth, float *centerfreq, float *beat_rtime);
-BASS_FX_BPM_BeatGetParameters = func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_float, ctypes.c_float, ctypes.c_float)(('BASS_FX_BPM_BeatGetParameters', bass_fx_module))
+BASS_FX_BPM_BeatGetParameters = libloader.LazyFunction(func_type(ctypes.c_bool, ctypes.c_ulong, ctypes.c_float, ctypes.c_float, ctypes.c_float), 'BASS_FX_BPM_BeatGetParameters', bass_fx_module)
 
 #BOOL BASS_FXDEF(BASS_FX_BPM_BeatFree)(DWORD handle);
-BASS_FX_BPM_BeatFree = func_type(ctypes.c_bool, ctypes.c_ulong)(('BASS_FX_BPM_BeatFree', bass_fx_module))
+BASS_FX_BPM_BeatFree = libloader.LazyFunction(func_type(ctypes.c_bool, ctypes.c_ulong), 'BASS_FX_BPM_BeatFree', bass_fx_module)
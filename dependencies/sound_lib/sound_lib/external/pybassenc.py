@@ -7,7 +7,8 @@ import pybass
 from paths import x86_path, x64_path
 import libloader
 
-bassenc_module = libloader.load_library('bassenc', x86_path=x86_path, x64_path=x64_path)
+#Nothing is loaded until the first of its functions is called.
+bassenc_module = libloader.LazyLibrary('bassenc', x86_path=x86_path, x64_path=x64_path)
 func_type = libloader.get_functype()
 
 HENCODE = ctypes.c_ulong #encoder handle
@@ -93,76 +94,76 @@ BASS_ENCODE_NOTIFY_QUEUE_FULL = 0x10001	#queue is out of space
 BASS_ENCODE_SERVER_NOHTTP = 1	#no HTTP headers
 
 #DWORD BASSENCDEF(BASS_Encode_GetVersion)();
-BASS_Encode_GetVersion = func_type(ctypes.c_ulong)(('BASS_Encode_GetVersion', bassenc_module))
+BASS_Encode_GetVersion = libloader.LazyFunction(func_type(ctypes.c_ulong), 'BASS_Encode_GetVersion', bassenc_module)
 
 #HENCODE BASSENCDEF(BASS_Encode_Start)(DWORD handle, const char *cmdline, DWORD flags, ENCODEPROC *proc, void *user);
-BASS_Encode_Start = func_type(HENCODE, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_ulong, ENCODEPROC, ctypes.c_void_p)(('BASS_Encode_Start', bassenc_module))
+BASS_Encode_Start = libloader.LazyFunction(func_type(HENCODE, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_ulong, ENCODEPROC, ctypes.c_void_p), 'BASS_Encode_Start', bassenc_module)
 
 #HENCODE BASSENCDEF(BASS_Encode_StartLimit)(DWORD handle, const char *cmdline, DWORD flags, ENCODEPROC *proc, void *user, DWORD limit);
-BASS_Encode_StartLimit = func_type(HENCODE, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong, ENCODEPROC, ctypes.c_void_p, ctypes.c_ulong)(('BASS_Encode_StartLimit', bassenc_module))
+BASS_Encode_StartLimit = libloader.LazyFunction(func_type(HENCODE, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong, ENCODEPROC, ctypes.c_void_p, ctypes.c_ulong), 'BASS_Encode_StartLimit', bassenc_module)
 
 #BOOL BASSENCDEF(BASS_Encode_AddChunk)(HENCODE handle, const char *id, const void *buffer, DWORD length);
-BASS_Encode_AddChunk = func_type(ctypes.c_byte, HENCODE, ctypes.c_char_p, ctypes.c_void_p, ctypes.c_ulong)(('BASS_Encode_AddChunk', bassenc_module))
+BASS_Encode_AddChunk = libloader.LazyFunction(func_type(ctypes.c_byte, HENCODE, ctypes.c_char_p, ctypes.c_void_p, ctypes.c_ulong), 'BASS_Encode_AddChunk', bassenc_module)
 
 #DWORD BASSENCDEF(BASS_Encode_IsActive)(DWORD handle);
-BASS_Encode_IsActive = func_type(ctypes.c_ulong, ctypes.c_ulong)(('BASS_Encode_IsActive', bassenc_module))
+BASS_Encode_IsActive = libloader.LazyFunction(func_type(ctypes.c_ulong, ctypes.c_ulong), 'BASS_Encode_IsActive', bassenc_module)
 
 #BOOL BASSENCDEF(BASS_Encode_Stop)(DWORD handle);
-BASS_Encode_Stop = func_type(ctypes.c_byte, ctypes.c_ulong)(('BASS_Encode_Stop', bassenc_module))
+BASS_Encode_Stop = libloader.LazyFunction(func_type(ctypes.c_byte, ctypes.c_ulong), 'BASS_Encode_Stop', bassenc_module)
 
 #BOOL BASSENCDEF(BASS_Encode_StopEx)(DWORD handle, BOOL queue);
 BASS_Encode_StopEx = func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.c_byte)
 
 #BOOL BASSENCDEF(BASS_Encode_SetPaused)(DWORD handle, BOOL paused);
-BASS_Encode_SetPaused = func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.c_byte)(('BASS_Encode_SetPaused', bassenc_module))
+BASS_Encode_SetPaused = libloader.LazyFunction(func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.c_byte), 'BASS_Encode_SetPaused', bassenc_module)
 
 #BOOL BASSENCDEF(BASS_Encode_Write)(DWORD handle, const void *buffer, DWORD length);
-BASS_Encode_Write = func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong)(('BASS_Encode_Write', bassenc_module))
+BASS_Encode_Write = libloader.LazyFunction(func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong), 'BASS_Encode_Write', bassenc_module)
 
 #BOOL BASSENCDEF(BASS_Encode_SetNotify)(DWORD handle, ENCODENOTIFYPROC *proc, void *user);
-BASS_Encode_SetNotify = func_type(ctypes.c_byte, ctypes.c_ulong, ENCODENOTIFYPROC, ctypes.c_void_p)(('BASS_Encode_SetNotify', bassenc_module))
+BASS_Encode_SetNotify = libloader.LazyFunction(func_type(ctypes.c_byte, ctypes.c_ulong, ENCODENOTIFYPROC, ctypes.c_void_p), 'BASS_Encode_SetNotify', bassenc_module)
 
 #QWORD BASSENCDEF(BASS_Encode_GetCount)(DWORD handle, DWORD count);
-BASS_Encode_GetCount = func_type(pybass.QWORD, ctypes.c_ulong, ctypes.c_ulong)(('BASS_Encode_GetCount', bassenc_module))
+BASS_Encode_GetCount = libloader.LazyFunction(func_type(pybass.QWORD, ctypes.c_ulong, ctypes.c_ulong), 'BASS_Encode_GetCount', bassenc_module)
 
 #BOOL BASSENCDEF(BASS_Encode_SetChannel)(DWORD handle, DWORD channel);
 BASS_Encode_SetChannel = func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.c_ulong)
 
 #DWORD BASSENCDEF(BASS_Encode_GetChannel)(HENCODE handle);
-BASS_Encode_GetChannel = func_type(ctypes.c_ulong, HENCODE)(('BASS_Encode_GetChannel', bassenc_module))
+BASS_Encode_GetChannel = libloader.LazyFunction(func_type(ctypes.c_ulong, HENCODE), 'BASS_Encode_GetChannel', bassenc_module)
 
 if platform.system() == 'Windows':
  #DWORD BASSENCDEF(BASS_Encode_GetACMFormat)(DWORD handle, void *form, DWORD formlen, const char *title, DWORD flags);
- BASS_Encode_GetACMFormat = func_type(ctypes.c_ulong, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_ulong)(('BASS_Encode_GetACMFormat', bassenc_module))
+ BASS_Encode_GetACMFormat = libloader.LazyFunction(func_type(ctypes.c_ulong, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_ulong), 'BASS_Encode_GetACMFormat', bassenc_module)
 
  #HENCODE BASSENCDEF(BASS_Encode_StartACM)(DWORD handle, const void *form, DWORD flags, ENCODEPROC *proc, void *user);
- BASS_Encode_StartACM = func_type(HENCODE, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong, ENCODEPROC, ctypes.c_void_p)(('BASS_Encode_StartACM', bassenc_module))
+ BASS_Encode_StartACM = libloader.LazyFunction(func_type(HENCODE, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong, ENCODEPROC, ctypes.c_void_p), 'BASS_Encode_StartACM', bassenc_module)
 
  #HENCODE BASSENCDEF(BASS_Encode_StartACMFile)(DWORD handle, const void *form, DWORD flags, const char *file);
- BASS_Encode_StartACMFile = func_type(HENCODE, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong, ctypes.c_char_p)(('BASS_Encode_StartACMFile', bassenc_module))
+ BASS_Encode_StartACMFile = libloader.LazyFunction(func_type(HENCODE, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong, ctypes.c_char_p), 'BASS_Encode_StartACMFile', bassenc_module)
 
 
 if platform.system() == 'Darwin':
  #HENCODE BASSENCDEF(BASS_Encode_StartCA)(DWORD handle, DWORD ftype, DWORD atype, DWORD flags, DWORD bitrate, ENCODEPROCEX *proc, void *user);
  BASS_Encode_StartCA = func_type(HENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ENCODEPROCEX, ctypes.c_void_p)(('ENCODEPROCEX ', bassenc_module))
 #HENCODE BASSENCDEF(BASS_Encode_StartCAFile)(DWORD handle, DWORD ftype, DWORD atype, DWORD flags, DWORD bitrate, const char *file);
- BASS_Encode_StartCAFile = func_type(HENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_char_p)(('BASS_Encode_StartCAFile', bassenc_module))
+ BASS_Encode_StartCAFile = libloader.LazyFunction(func_type(HENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_char_p), 'BASS_Encode_StartCAFile', bassenc_module)
 #Broadcasting
 
 #BOOL BASSENCDEF(BASS_Encode_CastInit)(HENCODE handle, const char *server, const char *pass, const char *content, const char *name, const char *url, const char *genre, const char *desc, const char *headers, DWORD bitrate, BOOL pub);
-BASS_Encode_CastInit = func_type(ctypes.c_byte, HENCODE, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_ulong, ctypes.c_byte)(('BASS_Encode_CastInit', bassenc_module))
+BASS_Encode_CastInit = libloader.LazyFunction(func_type(ctypes.c_byte, HENCODE, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_ulong, ctypes.c_byte), 'BASS_Encode_CastInit', bassenc_module)
 
 #BOOL BASSENCDEF(BASS_Encode_CastSetTitle)(HENCODE handle, const char *title, const char *url);
-BASS_Encode_CastSetTitle = func_type(ctypes.c_byte, HENCODE, ctypes.c_char_p, ctypes.c_char_p)(('BASS_Encode_CastSetTitle', bassenc_module))
+BASS_Encode_CastSetTitle = libloader.LazyFunction(func_type(ctypes.c_byte, HENCODE, ctypes.c_char_p, ctypes.c_char_p), 'BASS_Encode_CastSetTitle', bassenc_module)
 
 #const char *BASSENCDEF(BASS_Encode_CastGetStats)(HENCODE handle, DWORD type, const char *pass);
-BASS_Encode_CastGetStats = func_type(ctypes.c_char_p, HENCODE, ctypes.c_ulong, ctypes.c_char_p)(('BASS_Encode_CastGetStats', bassenc_module))
+BASS_Encode_CastGetStats = libloader.LazyFunction(func_type(ctypes.c_char_p, HENCODE, ctypes.c_ulong, ctypes.c_char_p), 'BASS_Encode_CastGetStats', bassenc_module)
 
 #Local audio server
 
 #DWORD BASSENCDEF(BASS_Encode_ServerInit)(HENCODE handle, const char *port, DWORD buffer, DWORD burst, DWORD flags, ENCODECLIENTPROC *proc, void *user);
-BASS_Encode_ServerInit = func_type(ctypes.c_ulong, HENCODE, ctypes.c_char_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ENCODECLIENTPROC, ctypes.c_void_p)(('BASS_Encode_ServerInit', bassenc_module))
+BASS_Encode_ServerInit = libloader.LazyFunction(func_type(ctypes.c_ulong, HENCODE, ctypes.c_char_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ENCODECLIENTPROC, ctypes.c_void_p), 'BASS_Encode_ServerInit', bassenc_module)
 
 #BOOL BASSENCDEF(BASS_Encode_ServerKick)(HENCODE handle, const char *client);
-BASS_Encode_ServerKick = func_type(ctypes.c_byte, HENCODE, ctypes.c_char_p)(('BASS_Encode_ServerKick', bassenc_module))
+BASS_Encode_ServerKick = libloader.LazyFunction(func_type(ctypes.c_byte, HENCODE, ctypes.c_char_p), 'BASS_Encode_ServerKick', bassenc_module)
 
@@ -17,10 +17,12 @@ from . import pybass
 from . paths import x86_path, x64_path
 import libloader
 
-bassflac_module = libloader.load_library('bassflac', x86_path=x86_path, x64_path=x64_path)
+#Nothing is loaded until the first of its functions is called.
+bassflac_module = libloader.LazyLibrary('bassflac', x86_path=x86_path, x64_path=x64_path)
 func_type = libloader.get_functype()
 #Register the plugin with the Bass plugin system.
-pybass.BASS_PluginLoad(libloader.find_library_path('bassflac', x86_path=x86_path, x64_path=x64_path), 0)
+if not pybass.BASS_PluginLoad(libloader.find_library_path('bassflac', x86_path=x86_path, x64_path=x64_path), 0):
+	raise libloader.LibraryLoadError('unable to load the flac plugin')
 
 QWORD = pybass.QWORD
 HSTREAM = pybass.HSTREAM
@@ -33,9 +35,9 @@ BASS_CTYPE_STREAM_FLAC_OGG = 0x10901
 
 
 #HSTREAM BASSFLACDEF(BASS_FLAC_StreamCreateFile)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags);
-BASS_FLAC_StreamCreateFile = func_type(HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong)(('BASS_FLAC_StreamCreateFile', bassflac_module))
+BASS_FLAC_StreamCreateFile = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong), 'BASS_FLAC_StreamCreateFile', bassflac_module)
 #HSTREAM BASSFLACDEF(BASS_FLAC_StreamCreateURL)(const char *url, DWORD offset, DWORD flags, DOWNLOADPROC *proc, void *user);
-BASS_FLAC_StreamCreateURL = func_type(HSTREAM, ctypes.c_char_p, ctypes.c_ulong, ctypes.c_ulong, DOWNLOADPROC, ctypes.c_void_p)(('BASS_FLAC_StreamCreateURL', bassflac_module))
+BASS_FLAC_StreamCreateURL = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_char_p, ctypes.c_ulong, ctypes.c_ulong, DOWNLOADPROC, ctypes.c_void_p), 'BASS_FLAC_StreamCreateURL', bassflac_module)
 #HSTREAM BASSFLACDEF(BASS_FLAC_StreamCreateFileUser)(DWORD system, DWORD flags, const BASS_FILEPROCS *procs, void *user);
-BASS_FLAC_StreamCreateFileUser = func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_FILEPROCS), ctypes.c_void_p)(('BASS_FLAC_StreamCreateFileUser', bassflac_module))
+BASS_FLAC_StreamCreateFileUser = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_FILEPROCS), ctypes.c_void_p), 'BASS_FLAC_StreamCreateFileUser', bassflac_module)
 
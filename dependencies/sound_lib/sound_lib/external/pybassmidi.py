@@ -18,10 +18,12 @@ from . import pybass
 from .paths import x86_path, x64_path
 import libloader
 
-bassmidi_module = libloader.load_library('bassmidi', x86_path=x86_path, x64_path=x64_path)
+#Nothing is loaded until the first of its functions is called.
+bassmidi_module = libloader.LazyLibrary('bassmidi', x86_path=x86_path, x64_path=x64_path)
 func_type = libloader.get_functype()
 #Register the plugin with the Bass plugin system.
-pybass.BASS_PluginLoad(libloader.find_library_path('bassmidi', x86_path=x86_path, x64_path=x64_path), 0)
+if not pybass.BASS_PluginLoad(libloader.find_library_path('bassmidi', x86_path=x86_path, x64_path=x64_path), 0):
+	raise libloader.LibraryLoadError('unable to load the midi plugin')
 
 HSOUNDFONT = ctypes.c_ulong
 
@@ -158,48 +160,48 @@ BASS_TAG_MIDI_TRACK = 0x11000 # + track #, track text : array of null-terminated
 BASS_POS_MIDI_TICK = 2 # tick position
 
 #HSTREAM BASSMIDIDEF(BASS_MIDI_StreamCreate)(DWORD channels, DWORD flags, DWORD freq);
-BASS_MIDI_StreamCreate = func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong)(('BASS_MIDI_StreamCreate', bassmidi_module))
+BASS_MIDI_StreamCreate = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong), 'BASS_MIDI_StreamCreate', bassmidi_module)
 #HSTREAM BASSMIDIDEF(BASS_MIDI_StreamCreateFile)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags, DWORD freq);
-BASS_MIDI_StreamCreateFile = func_type(HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong, ctypes.c_ulong)(('BASS_MIDI_StreamCreateFile', bassmidi_module))
+BASS_MIDI_StreamCreateFile = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong, ctypes.c_ulong), 'BASS_MIDI_StreamCreateFile', bassmidi_module)
 #HSTREAM BASSMIDIDEF(BASS_MIDI_StreamCreateURL)(const char *url, DWORD offset, DWORD flags, DOWNLOADPROC *proc, void *user, DWORD freq);
-BASS_MIDI_StreamCreateURL = func_type(HSTREAM, ctypes.c_char_p, ctypes.c_ulong, ctypes.c_ulong, DOWNLOADPROC, ctypes.c_void_p, ctypes.c_ulong)(('BASS_MIDI_StreamCreateURL', bassmidi_module))
+BASS_MIDI_StreamCreateURL = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_char_p, ctypes.c_ulong, ctypes.c_ulong, DOWNLOADPROC, ctypes.c_void_p, ctypes.c_ulong), 'BASS_MIDI_StreamCreateURL', bassmidi_module)
 #HSTREAM BASSMIDIDEF(BASS_MIDI_StreamCreateFileUser)(DWORD system, DWORD flags, const BASS_FILEPROCS *procs, void *user, DWORD freq);
-BASS_MIDI_StreamCreateFileUser = func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_FILEPROCS), ctypes.c_void_p, ctypes.c_ulong)(('BASS_MIDI_StreamCreateFileUser', bassmidi_module))
+BASS_MIDI_StreamCreateFileUser = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_FILEPROCS), ctypes.c_void_p, ctypes.c_ulong), 'BASS_MIDI_StreamCreateFileUser', bassmidi_module)
 #BOOL BASSMIDIDEF(BASS_MIDI_StreamGetMark)(HSTREAM handle, DWORD type, DWORD index, BASS_MIDI_MARK *mark);
-BASS_MIDI_StreamGetMark = func_type(ctypes.c_byte, HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_MIDI_MARK))(('BASS_MIDI_StreamGetMark', bassmidi_module))
+BASS_MIDI_StreamGetMark = libloader.LazyFunction(func_type(ctypes.c_byte, HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_MIDI_MARK)), 'BASS_MIDI_StreamGetMark', bassmidi_module)
 #BOOL BASSMIDIDEF(BASS_MIDI_StreamSetFonts)(HSTREAM handle, const BASS_MIDI_FONT *fonts, DWORD count);
-BASS_MIDI_StreamSetFonts = func_type(ctypes.c_byte, HSTREAM, ctypes.POINTER(BASS_MIDI_FONT), ctypes.c_ulong)(('BASS_MIDI_StreamSetFonts', bassmidi_module))
+BASS_MIDI_StreamSetFonts = libloader.LazyFunction(func_type(ctypes.c_byte, HSTREAM, ctypes.POINTER(BASS_MIDI_FONT), ctypes.c_ulong), 'BASS_MIDI_StreamSetFonts', bassmidi_module)
 #DWORD BASSMIDIDEF(BASS_MIDI_StreamGetFonts)(HSTREAM handle, BASS_MIDI_FONT *fonts, DWORD count);
-BASS_MIDI_StreamGetFonts = func_type(ctypes.c_ulong, HSTREAM, ctypes.POINTER(BASS_MIDI_FONT), ctypes.c_ulong)(('BASS_MIDI_StreamGetFonts', bassmidi_module))
+BASS_MIDI_StreamGetFonts = libloader.LazyFunction(func_type(ctypes.c_ulong, HSTREAM, ctypes.POINTER(BASS_MIDI_FONT), ctypes.c_ulong), 'BASS_MIDI_StreamGetFonts', bassmidi_module)
 #BOOL BASSMIDIDEF(BASS_MIDI_StreamLoadSamples)(HSTREAM handle);
-BASS_MIDI_StreamLoadSamples = func_type(ctypes.c_byte, HSTREAM)(('BASS_MIDI_StreamLoadSamples', bassmidi_module))
+BASS_MIDI_StreamLoadSamples = libloader.LazyFunction(func_type(ctypes.c_byte, HSTREAM), 'BASS_MIDI_StreamLoadSamples', bassmidi_module)
 #BOOL BASSMIDIDEF(BASS_MIDI_StreamEvent)(HSTREAM handle, DWORD chan, DWORD event, DWORD param);
-BASS_MIDI_StreamEvent = func_type(ctypes.c_byte, HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong)(('BASS_MIDI_StreamEvent', bassmidi_module))
+BASS_MIDI_StreamEvent = libloader.LazyFunction(func_type(ctypes.c_byte, HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong), 'BASS_MIDI_StreamEvent', bassmidi_module)
 #DWORD BASSMIDIDEF(BASS_MIDI_StreamGetEvent)(HSTREAM handle, DWORD chan, DWORD event);
-BASS_MIDI_StreamGetEvent = func_type(ctypes.c_ulong, HSTREAM, ctypes.c_ulong, ctypes.c_ulong)(('BASS_MIDI_StreamGetEvent', bassmidi_module))
+BASS_MIDI_StreamGetEvent = libloader.LazyFunction(func_type(ctypes.c_ulong, HSTREAM, ctypes.c_ulong, ctypes.c_ulong), 'BASS_MIDI_StreamGetEvent', bassmidi_module)
 #DWORD BASSMIDIDEF(BASS_MIDI_StreamGetEvents)(HSTREAM handle, DWORD track, DWORD filter, BASS_MIDI_EVENT *events);
-BASS_MIDI_StreamGetEvents = func_type(ctypes.c_ulong, HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_MIDI_EVENT))(('BASS_MIDI_StreamGetEvents', bassmidi_module))
+BASS_MIDI_StreamGetEvents = libloader.LazyFunction(func_type(ctypes.c_ulong, HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_MIDI_EVENT)), 'BASS_MIDI_StreamGetEvents', bassmidi_module)
 #HSTREAM BASSMIDIDEF(BASS_MIDI_StreamGetChannel)(HSTREAM handle, DWORD chan);
-BASS_MIDI_StreamGetChannel = func_type(HSTREAM, HSTREAM, ctypes.c_ulong)(('BASS_MIDI_StreamGetChannel', bassmidi_module))
+BASS_MIDI_StreamGetChannel = libloader.LazyFunction(func_type(HSTREAM, HSTREAM, ctypes.c_ulong), 'BASS_MIDI_StreamGetChannel', bassmidi_module)
 
 #HSOUNDFONT BASSMIDIDEF(BASS_MIDI_FontInit)(const void *file, DWORD flags);
-BASS_MIDI_FontInit = func_type(HSOUNDFONT, ctypes.c_void_p, ctypes.c_ulong)(('BASS_MIDI_FontInit', bassmidi_module))
+BASS_MIDI_FontInit = libloader.LazyFunction(func_type(HSOUNDFONT, ctypes.c_void_p, ctypes.c_ulong), 'BASS_MIDI_FontInit', bassmidi_module)
 #BOOL BASSMIDIDEF(BASS_MIDI_FontFree)(HSOUNDFONT handle);
-BASS_MIDI_FontFree = func_type(ctypes.c_byte, HSOUNDFONT)(('BASS_MIDI_FontFree', bassmidi_module))
+BASS_MIDI_FontFree = libloader.LazyFunction(func_type(ctypes.c_byte, HSOUNDFONT), 'BASS_MIDI_FontFree', bassmidi_module)
 #BOOL BASSMIDIDEF(BASS_MIDI_FontGetInfo)(HSOUNDFONT handle, BASS_MIDI_FONTINFO *info);
-BASS_MIDI_FontGetInfo = func_type(ctypes.c_byte, HSOUNDFONT, ctypes.POINTER(BASS_MIDI_FONTINFO))(('BASS_MIDI_FontGetInfo', bassmidi_module))
+BASS_MIDI_FontGetInfo = libloader.LazyFunction(func_type(ctypes.c_byte, HSOUNDFONT, ctypes.POINTER(BASS_MIDI_FONTINFO)), 'BASS_MIDI_FontGetInfo', bassmidi_module)
 #const char *BASSMIDIDEF(BASS_MIDI_FontGetPreset)(HSOUNDFONT handle, int preset, int bank);
-BASS_MIDI_FontGetPreset = func_type(ctypes.c_char_p, HSOUNDFONT, ctypes.c_int, ctypes.c_int)(('BASS_MIDI_FontGetPreset', bassmidi_module))
+BASS_MIDI_FontGetPreset = libloader.LazyFunction(func_type(ctypes.c_char_p, HSOUNDFONT, ctypes.c_int, ctypes.c_int), 'BASS_MIDI_FontGetPreset', bassmidi_module)
 #BOOL BASSMIDIDEF(BASS_MIDI_FontLoad)(HSOUNDFONT handle, int preset, int bank);
-BASS_MIDI_FontLoad = func_type(ctypes.c_byte, HSOUNDFONT, ctypes.c_int, ctypes.c_int)(('BASS_MIDI_FontLoad', bassmidi_module))
+BASS_MIDI_FontLoad = libloader.LazyFunction(func_type(ctypes.c_byte, HSOUNDFONT, ctypes.c_int, ctypes.c_int), 'BASS_MIDI_FontLoad', bassmidi_module)
 #BOOL BASSMIDIDEF(BASS_MIDI_FontCompact)(HSOUNDFONT handle);
-BASS_MIDI_FontCompact = func_type(ctypes.c_byte, HSOUNDFONT)(('BASS_MIDI_FontCompact', bassmidi_module))
+BASS_MIDI_FontCompact = libloader.LazyFunction(func_type(ctypes.c_byte, HSOUNDFONT), 'BASS_MIDI_FontCompact', bassmidi_module)
 #BOOL BASSMIDIDEF(BASS_MIDI_FontPack)(HSOUNDFONT handle, const void *outfile, const void *encoder, DWORD flags);
-BASS_MIDI_FontPack = func_type(ctypes.c_byte, HSOUNDFONT, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_ulong)(('BASS_MIDI_FontPack', bassmidi_module))
+BASS_MIDI_FontPack = libloader.LazyFunction(func_type(ctypes.c_byte, HSOUNDFONT, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_ulong), 'BASS_MIDI_FontPack', bassmidi_module)
 #BOOL BASSMIDIDEF(BASS_MIDI_FontUnpack)(HSOUNDFONT handle, const void *outfile, DWORD flags);
-BASS_MIDI_FontUnpack = func_type(ctypes.c_byte, HSOUNDFONT, ctypes.c_void_p, ctypes.c_ulong)(('BASS_MIDI_FontUnpack', bassmidi_module))
+BASS_MIDI_FontUnpack = libloader.LazyFunction(func_type(ctypes.c_byte, HSOUNDFONT, ctypes.c_void_p, ctypes.c_ulong), 'BASS_MIDI_FontUnpack', bassmidi_module)
 #BOOL BASSMIDIDEF(BASS_MIDI_FontSetVolume)(HSOUNDFONT handle, float volume);
-BASS_MIDI_FontSetVolume = func_type(ctypes.c_byte, HSOUNDFONT, ctypes.c_float)(('BASS_MIDI_FontSetVolume', bassmidi_module))
+BASS_MIDI_FontSetVolume = libloader.LazyFunction(func_type(ctypes.c_byte, HSOUNDFONT, ctypes.c_float), 'BASS_MIDI_FontSetVolume', bassmidi_module)
 #float BASSMIDIDEF(BASS_MIDI_FontGetVolume)(HSOUNDFONT handle);
-BASS_MIDI_FontGetVolume = func_type(ctypes.c_float, HSOUNDFONT)(('BASS_MIDI_FontGetVolume', bassmidi_module))
+BASS_MIDI_FontGetVolume = libloader.LazyFunction(func_type(ctypes.c_float, HSOUNDFONT), 'BASS_MIDI_FontGetVolume', bassmidi_module)
 
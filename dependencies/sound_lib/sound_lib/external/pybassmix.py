@@ -1,3 +1,4 @@
+from __future__ import absolute_import
 # Copyright(c) Max Kolosov 2009 maxkolosov@inbox.ru
 # http://vosolok2008.narod.ru
 # BSD license
@@ -13,7 +14,8 @@ features. It also provides the ability to go the other way and split a
 BASS channel into multiple channels.
 '''
 
-import os, sys, ctypes, platform, pybass
+import os, sys, ctypes, platform
+from . import pybass
 
 QWORD = pybass.QWORD
 HSYNC = pybass.HSYNC
@@ -22,10 +24,11 @@ DOWNLOADPROC = pybass.DOWNLOADPROC
 SYNCPROC = pybass.SYNCPROC
 BASS_FILEPROCS = pybass.BASS_FILEPROCS
 
-from paths import x86_path, x64_path
+from .paths import x86_path, x64_path
 import libloader
 
-bassmix_module = libloader.load_library('bassmix', x86_path=x86_path, x64_path=x64_path)
+#Nothing is loaded until the first of its functions is called.
+bassmix_module = libloader.LazyLibrary('bassmix', x86_path=x86_path, x64_path=x64_path)
 func_type = libloader.get_functype()
 	
 # additional BASS_SetConfig option
@@ -49,7 +52,7 @@ BASS_MIXER_NORAMPIN = 0x800000# don't ramp-in the start
 
 # envelope node
 class BASS_MIXER_NODE(ctypes.Structure):
-	_fields_ = [('pos', ctypes.c_ulong),#QWORD pos;
+	_fields_ = [('pos', QWORD),#QWORD pos;
 				('value', ctypes.c_float)#float value;
 				]
 
@@ -68,48 +71,48 @@ BASS_CTYPE_STREAM_SPLIT = 0x10801
 
 
 #DWORD BASSMIXDEF(BASS_Mixer_GetVersion)();
-BASS_Mixer_GetVersion = func_type(ctypes.c_ulong)(('BASS_Mixer_GetVersion', bassmix_module))
+BASS_Mixer_GetVersion = libloader.LazyFunction(func_type(ctypes.c_ulong), 'BASS_Mixer_GetVersion', bassmix_module)
 
 #HSTREAM BASSMIXDEF(BASS_Mixer_StreamCreate)(DWORD freq, DWORD chans, DWORD flags);
-BASS_Mixer_StreamCreate = func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong)(('BASS_Mixer_StreamCreate', bassmix_module))
+BASS_Mixer_StreamCreate = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong), 'BASS_Mixer_StreamCreate', bassmix_module)
 #BOOL BASSMIXDEF(BASS_Mixer_StreamAddChannel)(HSTREAM handle, DWORD channel, DWORD flags);
-BASS_Mixer_StreamAddChannel = func_type(ctypes.c_byte, HSTREAM, ctypes.c_ulong, ctypes.c_ulong)(('BASS_Mixer_StreamAddChannel', bassmix_module))
+BASS_Mixer_StreamAddChannel = libloader.LazyFunction(func_type(ctypes.c_byte, HSTREAM, ctypes.c_ulong, ctypes.c_ulong), 'BASS_Mixer_StreamAddChannel', bassmix_module)
 #BOOL BASSMIXDEF(BASS_Mixer_StreamAddChannelEx)(HSTREAM handle, DWORD channel, DWORD flags, QWORD start, QWORD length);
-BASS_Mixer_StreamAddChannelEx = func_type(ctypes.c_byte, HSTREAM, ctypes.c_ulong, ctypes.c_ulong, QWORD, QWORD)(('BASS_Mixer_StreamAddChannelEx', bassmix_module))
+BASS_Mixer_StreamAddChannelEx = libloader.LazyFunction(func_type(ctypes.c_byte, HSTREAM, ctypes.c_ulong, ctypes.c_ulong, QWORD, QWORD), 'BASS_Mixer_StreamAddChannelEx', bassmix_module)
 
 #HSTREAM BASSMIXDEF(BASS_Mixer_ChannelGetMixer)(DWORD handle);
-BASS_Mixer_ChannelGetMixer = func_type(HSTREAM, ctypes.c_ulong)(('BASS_Mixer_ChannelGetMixer', bassmix_module))
+BASS_Mixer_ChannelGetMixer = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong), 'BASS_Mixer_ChannelGetMixer', bassmix_module)
 #DWORD BASSMIXDEF(BASS_Mixer_ChannelFlags)(DWORD handle, DWORD flags, DWORD mask);
-BASS_Mixer_ChannelFlags = func_type(ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong)(('BASS_Mixer_ChannelFlags', bassmix_module))
+BASS_Mixer_ChannelFlags = libloader.LazyFunction(func_type(ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong), 'BASS_Mixer_ChannelFlags', bassmix_module)
 #BOOL BASSMIXDEF(BASS_Mixer_ChannelRemove)(DWORD handle);
-BASS_Mixer_ChannelRemove = func_type(ctypes.c_byte, ctypes.c_ulong)(('BASS_Mixer_ChannelRemove', bassmix_module))
+BASS_Mixer_ChannelRemove = libloader.LazyFunction(func_type(ctypes.c_byte, ctypes.c_ulong), 'BASS_Mixer_ChannelRemove', bassmix_module)
 #BOOL BASSMIXDEF(BASS_Mixer_ChannelSetPosition)(DWORD handle, QWORD pos, DWORD mode);
-BASS_Mixer_ChannelSetPosition = func_type(ctypes.c_byte, ctypes.c_ulong, QWORD, ctypes.c_ulong)(('BASS_Mixer_ChannelSetPosition', bassmix_module))
+BASS_Mixer_ChannelSetPosition = libloader.LazyFunction(func_type(ctypes.c_byte, ctypes.c_ulong, QWORD, ctypes.c_ulong), 'BASS_Mixer_ChannelSetPosition', bassmix_module)
 #QWORD BASSMIXDEF(BASS_Mixer_ChannelGetPosition)(DWORD handle, DWORD mode);
-BASS_Mixer_ChannelGetPosition = func_type(QWORD, ctypes.c_ulong, ctypes.c_ulong)(('BASS_Mixer_ChannelGetPosition', bassmix_module))
+BASS_Mixer_ChannelGetPosition = libloader.LazyFunction(func_type(QWORD, ctypes.c_ulong, ctypes.c_ulong), 'BASS_Mixer_ChannelGetPosition', bassmix_module)
 #DWORD BASSMIXDEF(BASS_Mixer_ChannelGetLevel)(DWORD handle);
-BASS_Mixer_ChannelGetLevel = func_type(ctypes.c_ulong, ctypes.c_ulong)(('BASS_Mixer_ChannelGetLevel', bassmix_module))
+BASS_Mixer_ChannelGetLevel = libloader.LazyFunction(func_type(ctypes.c_ulong, ctypes.c_ulong), 'BASS_Mixer_ChannelGetLevel', bassmix_module)
 #DWORD BASSMIXDEF(BASS_Mixer_ChannelGetData)(DWORD handle, void *buffer, DWORD length);
-BASS_Mixer_ChannelGetData = func_type(ctypes.c_ulong, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong)(('BASS_Mixer_ChannelGetData', bassmix_module))
+BASS_Mixer_ChannelGetData = libloader.LazyFunction(func_type(ctypes.c_ulong, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ulong), 'BASS_Mixer_ChannelGetData', bassmix_module)
 #HSYNC BASSMIXDEF(BASS_Mixer_ChannelSetSync)(DWORD handle, DWORD type, QWORD param, SYNCPROC *proc, void *user);
-BASS_Mixer_ChannelSetSync = func_type(HSYNC, ctypes.c_ulong, ctypes.c_ulong, QWORD, SYNCPROC, ctypes.c_void_p)(('BASS_Mixer_ChannelSetSync', bassmix_module))
+BASS_Mixer_ChannelSetSync = libloader.LazyFunction(func_type(HSYNC, ctypes.c_ulong, ctypes.c_ulong, QWORD, SYNCPROC, ctypes.c_void_p), 'BASS_Mixer_ChannelSetSync', bassmix_module)
 #BOOL BASSMIXDEF(BASS_Mixer_ChannelRemoveSync)(DWORD channel, HSYNC sync);
-BASS_Mixer_ChannelRemoveSync = func_type(ctypes.c_byte, ctypes.c_ulong, HSYNC)(('BASS_Mixer_ChannelRemoveSync', bassmix_module))
+BASS_Mixer_ChannelRemoveSync = libloader.LazyFunction(func_type(ctypes.c_byte, ctypes.c_ulong, HSYNC), 'BASS_Mixer_ChannelRemoveSync', bassmix_module)
 #BOOL BASSMIXDEF(BASS_Mixer_ChannelSetMatrix)(DWORD handle, const float *matrix);
-BASS_Mixer_ChannelSetMatrix = func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.POINTER(ctypes.c_float))(('BASS_Mixer_ChannelSetMatrix', bassmix_module))
+BASS_Mixer_ChannelSetMatrix = libloader.LazyFunction(func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.POINTER(ctypes.c_float)), 'BASS_Mixer_ChannelSetMatrix', bassmix_module)
 #BOOL BASSMIXDEF(BASS_Mixer_ChannelGetMatrix)(DWORD handle, float *matrix);
-BASS_Mixer_ChannelGetMatrix = func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.POINTER(ctypes.c_float))(('BASS_Mixer_ChannelGetMatrix', bassmix_module))
+BASS_Mixer_ChannelGetMatrix = libloader.LazyFunction(func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.POINTER(ctypes.c_float)), 'BASS_Mixer_ChannelGetMatrix', bassmix_module)
 #BOOL BASSMIXDEF(BASS_Mixer_ChannelSetEnvelope)(DWORD handle, DWORD type, const BASS_MIXER_NODE *nodes, DWORD count);
-BASS_Mixer_ChannelSetEnvelope = func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_MIXER_NODE), ctypes.c_ulong)(('BASS_Mixer_ChannelSetEnvelope', bassmix_module))
+BASS_Mixer_ChannelSetEnvelope = libloader.LazyFunction(func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_MIXER_NODE), ctypes.c_ulong), 'BASS_Mixer_ChannelSetEnvelope', bassmix_module)
 #BOOL BASSMIXDEF(BASS_Mixer_ChannelSetEnvelopePos)(DWORD handle, DWORD type, QWORD pos);
-BASS_Mixer_ChannelSetEnvelopePos = func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.c_ulong, QWORD)(('BASS_Mixer_ChannelSetEnvelopePos', bassmix_module))
+BASS_Mixer_ChannelSetEnvelopePos = libloader.LazyFunction(func_type(ctypes.c_byte, ctypes.c_ulong, ctypes.c_ulong, QWORD), 'BASS_Mixer_ChannelSetEnvelopePos', bassmix_module)
 #QWORD BASSMIXDEF(BASS_Mixer_ChannelGetEnvelopePos)(DWORD handle, DWORD type, float *value);
-BASS_Mixer_ChannelGetEnvelopePos = func_type(QWORD, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_float)(('BASS_Mixer_ChannelGetEnvelopePos', bassmix_module))
+BASS_Mixer_ChannelGetEnvelopePos = libloader.LazyFunction(func_type(QWORD, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(ctypes.c_float)), 'BASS_Mixer_ChannelGetEnvelopePos', bassmix_module)
 
 #HSTREAM BASSMIXDEF(BASS_Split_StreamCreate)(DWORD channel, DWORD flags, int *chanmap);
-BASS_Split_StreamCreate = func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_int)(('BASS_Split_StreamCreate', bassmix_module))
+BASS_Split_StreamCreate = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(ctypes.c_int)), 'BASS_Split_StreamCreate', bassmix_module)
 #DWORD BASSMIXDEF(BASS_Split_StreamGetSource)(HSTREAM handle);
-BASS_Split_StreamGetSource = func_type(ctypes.c_ulong, HSTREAM)(('BASS_Split_StreamGetSource', bassmix_module))
+BASS_Split_StreamGetSource = libloader.LazyFunction(func_type(ctypes.c_ulong, HSTREAM), 'BASS_Split_StreamGetSource', bassmix_module)
 #BOOL BASSMIXDEF(BASS_Split_StreamReset)(DWORD handle);
-BASS_Split_StreamReset = func_type(ctypes.c_byte, ctypes.c_ulong)(('BASS_Split_StreamReset', bassmix_module))
+BASS_Split_StreamReset = libloader.LazyFunction(func_type(ctypes.c_byte, ctypes.c_ulong), 'BASS_Split_StreamReset', bassmix_module)
 
@@ -22,7 +22,8 @@ HSTREAM = pybass.HSTREAM
 BASS_FILEPROCS = pybass.BASS_FILEPROCS
 
 
-basswasapi_module = libloader.load_library('basswasapi', x86_path=x86_path, x64_path=x64_path)
+#Nothing is loaded until the first of its functions is called.
+basswasapi_module = libloader.LazyLibrary('basswasapi', x86_path=x86_path, x64_path=x64_path)
 func_type = libloader.get_functype()
 
 # Additional error codes returned by BASS_ErrorGetCode
@@ -108,47 +109,47 @@ BASS_WASAPI_NOTIFY_DEFINPUT = 3
 
 
 # DWORD BASSWASAPIDEF(BASS_WASAPI_GetVersion)();
-BASS_WASAPI_GetVersion = func_type(HSTREAM)(('BASS_WASAPI_GetVersion', basswasapi_module))
+BASS_WASAPI_GetVersion = libloader.LazyFunction(func_type(HSTREAM), 'BASS_WASAPI_GetVersion', basswasapi_module)
 # BOOL BASSWASAPIDEF(BASS_WASAPI_SetNotify)(WASAPINOTIFYPROC *proc, void *user);
-BASS_WASAPI_SetNotify = func_type(HSTREAM, ctypes.POINTER(WASAPINOTIFYPROC), ctypes.c_void_p)(('BASS_WASAPI_SetNotify', basswasapi_module))
+BASS_WASAPI_SetNotify = libloader.LazyFunction(func_type(HSTREAM, ctypes.POINTER(WASAPINOTIFYPROC), ctypes.c_void_p), 'BASS_WASAPI_SetNotify', basswasapi_module)
 # BOOL BASSWASAPIDEF(BASS_WASAPI_GetDeviceInfo)(DWORD device, BASS_WASAPI_DEVICEINFO *info);
-BASS_WASAPI_GetDeviceInfo = func_type(HSTREAM, ctypes.c_ulong, ctypes.POINTER(BASS_WASAPI_DEVICEINFO))(('BASS_WASAPI_GetDeviceInfo', basswasapi_module))
+BASS_WASAPI_GetDeviceInfo = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong, ctypes.POINTER(BASS_WASAPI_DEVICEINFO)), 'BASS_WASAPI_GetDeviceInfo', basswasapi_module)
 # float BASSDEF(BASS_WASAPI_GetDeviceLevel)(DWORD device, int chan);
-BASS_WASAPI_GetDeviceLevel = func_type(HSTREAM, ctypes.c_ulong, ctypes.c_int)(('BASS_WASAPI_GetDeviceLevel', basswasapi_module))
+BASS_WASAPI_GetDeviceLevel = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong, ctypes.c_int), 'BASS_WASAPI_GetDeviceLevel', basswasapi_module)
 # BOOL BASSWASAPIDEF(BASS_WASAPI_SetDevice)(DWORD device);
-BASS_WASAPI_SetDevice = func_type(HSTREAM, ctypes.c_ulong)(('BASS_WASAPI_SetDevice', basswasapi_module))
+BASS_WASAPI_SetDevice = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong), 'BASS_WASAPI_SetDevice', basswasapi_module)
 # DWORD BASSWASAPIDEF(BASS_WASAPI_GetDevice)();
-BASS_WASAPI_GetDevice = func_type(HSTREAM)(('BASS_WASAPI_GetDevice', basswasapi_module))
+BASS_WASAPI_GetDevice = libloader.LazyFunction(func_type(HSTREAM), 'BASS_WASAPI_GetDevice', basswasapi_module)
 # DWORD BASSWASAPIDEF(BASS_WASAPI_CheckFormat)(DWORD device, DWORD freq, DWORD chans, DWORD flags);
-BASS_WASAPI_CheckFormat = func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong)(('BASS_WASAPI_CheckFormat', basswasapi_module))
+BASS_WASAPI_CheckFormat = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong), 'BASS_WASAPI_CheckFormat', basswasapi_module)
 # BOOL BASSWASAPIDEF(BASS_WASAPI_Init)(int device, DWORD freq, DWORD chans, DWORD flags, float buffer, float period, WASAPIPROC *proc, void *user);
-BASS_WASAPI_Init = func_type(HSTREAM, ctypes.c_int, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_float, ctypes.c_float, WASAPIPROC, ctypes.c_void_p)(('BASS_WASAPI_Init', basswasapi_module))
+BASS_WASAPI_Init = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_int, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_float, ctypes.c_float, WASAPIPROC, ctypes.c_void_p), 'BASS_WASAPI_Init', basswasapi_module)
 # BOOL BASSWASAPIDEF(BASS_WASAPI_Free)();
-BASS_WASAPI_Free = func_type(HSTREAM)(('BASS_WASAPI_Free', basswasapi_module))
+BASS_WASAPI_Free = libloader.LazyFunction(func_type(HSTREAM), 'BASS_WASAPI_Free', basswasapi_module)
 # BOOL BASSWASAPIDEF(BASS_WASAPI_GetInfo)(BASS_WASAPI_INFO *info);
-BASS_WASAPI_GetInfo = func_type(HSTREAM, ctypes.POINTER(BASS_WASAPI_INFO))(('BASS_WASAPI_GetInfo', basswasapi_module))
+BASS_WASAPI_GetInfo = libloader.LazyFunction(func_type(HSTREAM, ctypes.POINTER(BASS_WASAPI_INFO)), 'BASS_WASAPI_GetInfo', basswasapi_module)
 # float BASSWASAPIDEF(BASS_WASAPI_GetCPU)();
-BASS_WASAPI_GetCPU = func_type(HSTREAM)(('BASS_WASAPI_GetCPU', basswasapi_module))
+BASS_WASAPI_GetCPU = libloader.LazyFunction(func_type(HSTREAM), 'BASS_WASAPI_GetCPU', basswasapi_module)
 # BOOL BASSWASAPIDEF(BASS_WASAPI_Lock)(BOOL lock);
-BASS_WASAPI_Lock = func_type(HSTREAM, ctypes.c_bool)(('BASS_WASAPI_Lock', basswasapi_module))
+BASS_WASAPI_Lock = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_bool), 'BASS_WASAPI_Lock', basswasapi_module)
 # BOOL BASSWASAPIDEF(BASS_WASAPI_Start)();
-BASS_WASAPI_Start = func_type(HSTREAM)(('BASS_WASAPI_Start', basswasapi_module))
+BASS_WASAPI_Start = libloader.LazyFunction(func_type(HSTREAM), 'BASS_WASAPI_Start', basswasapi_module)
 # BOOL BASSWASAPIDEF(BASS_WASAPI_Stop)(BOOL reset);
-BASS_WASAPI_Stop = func_type(ctypes.c_bool, ctypes.c_bool)(('BASS_WASAPI_Stop', basswasapi_module))
+BASS_WASAPI_Stop = libloader.LazyFunction(func_type(ctypes.c_bool, ctypes.c_bool), 'BASS_WASAPI_Stop', basswasapi_module)
 # BOOL BASSWASAPIDEF(BASS_WASAPI_IsStarted)();
-BASS_WASAPI_IsStarted = func_type(HSTREAM)(('BASS_WASAPI_IsStarted', basswasapi_module))
+BASS_WASAPI_IsStarted = libloader.LazyFunction(func_type(HSTREAM), 'BASS_WASAPI_IsStarted', basswasapi_module)
 # BOOL BASSWASAPIDEF(BASS_WASAPI_SetVolume)(DWORD curve, float volume);
-BASS_WASAPI_SetVolume = func_type(HSTREAM, ctypes.c_ulong, ctypes.c_float)(('BASS_WASAPI_SetVolume', basswasapi_module))
+BASS_WASAPI_SetVolume = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong, ctypes.c_float), 'BASS_WASAPI_SetVolume', basswasapi_module)
 # float BASSWASAPIDEF(BASS_WASAPI_GetVolume)(DWORD curve);
-BASS_WASAPI_GetVolume = func_type(HSTREAM, ctypes.c_ulong)(('BASS_WASAPI_GetVolume', basswasapi_module))
+BASS_WASAPI_GetVolume = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong), 'BASS_WASAPI_GetVolume', basswasapi_module)
 # BOOL BASSWASAPIDEF(BASS_WASAPI_SetMute)(BOOL mute);
-BASS_WASAPI_SetMute = func_type(HSTREAM, ctypes.c_bool)(('BASS_WASAPI_SetMute', basswasapi_module))
+BASS_WASAPI_SetMute = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_bool), 'BASS_WASAPI_SetMute', basswasapi_module)
 # BOOL BASSWASAPIDEF(BASS_WASAPI_GetMute)();
-BASS_WASAPI_GetMute = func_type(HSTREAM)(('BASS_WASAPI_GetMute', basswasapi_module))
+BASS_WASAPI_GetMute = libloader.LazyFunction(func_type(HSTREAM), 'BASS_WASAPI_GetMute', basswasapi_module)
 # DWORD BASSWASAPIDEF(BASS_WASAPI_PutData)(void *buffer, DWORD length);
-BASS_WASAPI_PutData = func_type(HSTREAM, ctypes.c_void_p, ctypes.c_ulong)(('BASS_WASAPI_PutData', basswasapi_module))
+BASS_WASAPI_PutData = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_void_p, ctypes.c_ulong), 'BASS_WASAPI_PutData', basswasapi_module)
 # DWORD BASSDEF(BASS_WASAPI_GetData)(void *buffer, DWORD length);
-BASS_WASAPI_GetData = func_type(HSTREAM, ctypes.c_void_p, ctypes.c_ulong)(('BASS_WASAPI_GetData', basswasapi_module))
+BASS_WASAPI_GetData = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_void_p, ctypes.c_ulong), 'BASS_WASAPI_GetData', basswasapi_module)
 # DWORD BASSDEF(BASS_WASAPI_GetLevel)();
-BASS_WASAPI_GetLevel = func_type(HSTREAM)(('BASS_WASAPI_GetLevel', basswasapi_module))
+BASS_WASAPI_GetLevel = libloader.LazyFunction(func_type(HSTREAM), 'BASS_WASAPI_GetLevel', basswasapi_module)
 
@@ -33,10 +33,12 @@ BASS_FILEPROCS = pybass.BASS_FILEPROCS
 
 HWMENCODE = ctypes.c_ulong# WMA encoding handle
 
-basswma_module = libloader.load_library('basswma', x86_path=x86_path, x64_path=x64_path)
+#Nothing is loaded until the first of its functions is called.
+basswma_module = libloader.LazyLibrary('basswma', x86_path=x86_path, x64_path=x64_path)
 func_type = libloader.get_functype()
 #Register the plugin with the Bass plugin system.
-pybass.BASS_PluginLoad(libloader.find_library_path('basswma', x86_path=x86_path, x64_path=x64_path), 0)
+if not pybass.BASS_PluginLoad(libloader.find_library_path('basswma', x86_path=x86_path, x64_path=x64_path), 0):
+	raise libloader.LibraryLoadError('unable to load the wma plugin')
 
 
 # Additional error codes returned by BASS_ErrorGetCode
@@ -108,42 +110,42 @@ BASS_TAG_WMA_META = 11# WMA mid-stream tag : UTF-8 string
 
 
 #HSTREAM BASSWMADEF(BASS_WMA_StreamCreateFile)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags);
-BASS_WMA_StreamCreateFile = func_type(HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong)(('BASS_WMA_StreamCreateFile', basswma_module))
+BASS_WMA_StreamCreateFile = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong), 'BASS_WMA_StreamCreateFile', basswma_module)
 #HSTREAM BASSWMADEF(BASS_WMA_StreamCreateFileAuth)(BOOL mem, const void *file, QWORD offset, QWORD length, DWORD flags, const char *user, const char *pass);
-BASS_WMA_StreamCreateFileAuth = func_type(HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_char_p)(('BASS_WMA_StreamCreateFileAuth', basswma_module))
+BASS_WMA_StreamCreateFileAuth = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_byte, ctypes.c_void_p, QWORD, QWORD, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_char_p), 'BASS_WMA_StreamCreateFileAuth', basswma_module)
 #HSTREAM BASSWMADEF(BASS_WMA_StreamCreateFileUser)(DWORD system, DWORD flags, const BASS_FILEPROCS *procs, void *user);
-BASS_WMA_StreamCreateFileUser = func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_FILEPROCS), ctypes.c_void_p)(('BASS_WMA_StreamCreateFileUser', basswma_module))
+BASS_WMA_StreamCreateFileUser = libloader.LazyFunction(func_type(HSTREAM, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(BASS_FILEPROCS), ctypes.c_void_p), 'BASS_WMA_StreamCreateFileUser', basswma_module)
 
 #const char *BASSWMADEF(BASS_WMA_GetTags)(const void *file, DWORD flags);
-BASS_WMA_GetTags = func_type(ctypes.c_char_p, ctypes.c_void_p, ctypes.c_ulong)(('BASS_WMA_GetTags', basswma_module))
+BASS_WMA_GetTags = libloader.LazyFunction(func_type(ctypes.c_char_p, ctypes.c_void_p, ctypes.c_ulong), 'BASS_WMA_GetTags', basswma_module)
 
 #const DWORD *BASSWMADEF(BASS_WMA_EncodeGetRates)(DWORD freq, DWORD chans, DWORD flags);
-BASS_WMA_EncodeGetRates = func_type(ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong)(('BASS_WMA_EncodeGetRates', basswma_module))
+BASS_WMA_EncodeGetRates = libloader.LazyFunction(func_type(ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong), 'BASS_WMA_EncodeGetRates', basswma_module)
 #HWMENCODE BASSWMADEF(BASS_WMA_EncodeOpen)(DWORD freq, DWORD chans, DWORD flags, DWORD bitrate, WMENCODEPROC *proc, void *user);
-BASS_WMA_EncodeOpen = func_type(HWMENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, WMENCODEPROC, ctypes.c_void_p)(('BASS_WMA_EncodeOpen', basswma_module))
+BASS_WMA_EncodeOpen = libloader.LazyFunction(func_type(HWMENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, WMENCODEPROC, ctypes.c_void_p), 'BASS_WMA_EncodeOpen', basswma_module)
 #HWMENCODE BASSWMADEF(BASS_WMA_EncodeOpenFile)(DWORD freq, DWORD chans, DWORD flags, DWORD bitrate, const char *file);
-BASS_WMA_EncodeOpenFile = func_type(HWMENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_char_p)(('BASS_WMA_EncodeOpenFile', basswma_module))
+BASS_WMA_EncodeOpenFile = libloader.LazyFunction(func_type(HWMENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_char_p), 'BASS_WMA_EncodeOpenFile', basswma_module)
 #HWMENCODE BASSWMADEF(BASS_WMA_EncodeOpenNetwork)(DWORD freq, DWORD chans, DWORD flags, DWORD bitrate, DWORD port, DWORD clients);
-BASS_WMA_EncodeOpenNetwork = func_type(HWMENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong)(('BASS_WMA_EncodeOpenNetwork', basswma_module))
+BASS_WMA_EncodeOpenNetwork = libloader.LazyFunction(func_type(HWMENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong), 'BASS_WMA_EncodeOpenNetwork', basswma_module)
 #HWMENCODE BASSWMADEF(BASS_WMA_EncodeOpenNetworkMulti)(DWORD freq, DWORD chans, DWORD flags, const DWORD *bitrates, DWORD port, DWORD clients);
-BASS_WMA_EncodeOpenNetworkMulti = func_type(HWMENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong), ctypes.c_ulong, ctypes.c_ulong)(('BASS_WMA_EncodeOpenNetworkMulti', basswma_module))
+BASS_WMA_EncodeOpenNetworkMulti = libloader.LazyFunction(func_type(HWMENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong), ctypes.c_ulong, ctypes.c_ulong), 'BASS_WMA_EncodeOpenNetworkMulti', basswma_module)
 #HWMENCODE BASSWMADEF(BASS_WMA_EncodeOpenPublish)(DWORD freq, DWORD chans, DWORD flags, DWORD bitrate, const char *url, const char *user, const char *pass);
-BASS_WMA_EncodeOpenPublish = func_type(HWMENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p)(('BASS_WMA_EncodeOpenPublish', basswma_module))
+BASS_WMA_EncodeOpenPublish = libloader.LazyFunction(func_type(HWMENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p), 'BASS_WMA_EncodeOpenPublish', basswma_module)
 #HWMENCODE BASSWMADEF(BASS_WMA_EncodeOpenPublishMulti)(DWORD freq, DWORD chans, DWORD flags, const DWORD *bitrates, const char *url, const char *user, const char *pass);
-BASS_WMA_EncodeOpenPublishMulti = func_type(HWMENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong), ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p)(('BASS_WMA_EncodeOpenPublishMulti', basswma_module))
+BASS_WMA_EncodeOpenPublishMulti = libloader.LazyFunction(func_type(HWMENCODE, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong), ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p), 'BASS_WMA_EncodeOpenPublishMulti', basswma_module)
 #DWORD BASSWMADEF(BASS_WMA_EncodeGetPort)(HWMENCODE handle);
-BASS_WMA_EncodeGetPort = func_type(ctypes.c_ulong, HWMENCODE)(('BASS_WMA_EncodeGetPort', basswma_module))
+BASS_WMA_EncodeGetPort = libloader.LazyFunction(func_type(ctypes.c_ulong, HWMENCODE), 'BASS_WMA_EncodeGetPort', basswma_module)
 #BOOL BASSWMADEF(BASS_WMA_EncodeSetNotify)(HWMENCODE handle, CLIENTCONNECTPROC *proc, void *user);
-BASS_WMA_EncodeSetNotify = func_type(ctypes.c_byte, HWMENCODE, CLIENTCONNECTPROC, ctypes.c_void_p)(('BASS_WMA_EncodeSetNotify', basswma_module))
+BASS_WMA_EncodeSetNotify = libloader.LazyFunction(func_type(ctypes.c_byte, HWMENCODE, CLIENTCONNECTPROC, ctypes.c_void_p), 'BASS_WMA_EncodeSetNotify', basswma_module)
 #DWORD BASSWMADEF(BASS_WMA_EncodeGetClients)(HWMENCODE handle);
-BASS_WMA_EncodeGetClients = func_type(ctypes.c_ulong, HWMENCODE)(('BASS_WMA_EncodeGetClients', basswma_module))
+BASS_WMA_EncodeGetClients = libloader.LazyFunction(func_type(ctypes.c_ulong, HWMENCODE), 'BASS_WMA_EncodeGetClients', basswma_module)
 #BOOL BASSWMADEF(BASS_WMA_EncodeSetTag)(HWMENCODE handle, const char *tag, const char *text, DWORD form);
-BASS_WMA_EncodeSetTag = func_type(ctypes.c_byte, HWMENCODE, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_ulong)(('BASS_WMA_EncodeSetTag', basswma_module))
+BASS_WMA_EncodeSetTag = libloader.LazyFunction(func_type(ctypes.c_byte, HWMENCODE, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_ulong), 'BASS_WMA_EncodeSetTag', basswma_module)
 #BOOL BASSWMADEF(BASS_WMA_EncodeWrite)(HWMENCODE handle, const void *buffer, DWORD length);
-BASS_WMA_EncodeWrite = func_type(ctypes.c_byte, HWMENCODE, ctypes.c_void_p, ctypes.c_ulong)(('BASS_WMA_EncodeWrite', basswma_module))
+BASS_WMA_EncodeWrite = libloader.LazyFunction(func_type(ctypes.c_byte, HWMENCODE, ctypes.c_void_p, ctypes.c_ulong), 'BASS_WMA_EncodeWrite', basswma_module)
 #BOOL BASSWMADEF(BASS_WMA_EncodeClose)(HWMENCODE handle);
-BASS_WMA_EncodeClose = func_type(ctypes.c_byte, HWMENCODE)(('BASS_WMA_EncodeClose', basswma_module))
+BASS_WMA_EncodeClose = libloader.LazyFunction(func_type(ctypes.c_byte, HWMENCODE), 'BASS_WMA_EncodeClose', basswma_module)
 
 #void *BASSWMADEF(BASS_WMA_GetWMObject)(DWORD handle);
-BASS_WMA_GetWMObject = func_type(ctypes.c_void_p, ctypes.c_ulong)(('BASS_WMA_GetWMObject', basswma_module))
+BASS_WMA_GetWMObject = libloader.LazyFunction(func_type(ctypes.c_void_p, ctypes.c_ulong), 'BASS_WMA_GetWMObject', basswma_module)
 
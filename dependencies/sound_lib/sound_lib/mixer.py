@@ -0,0 +1,149 @@
+from __future__ import absolute_import
+from collections import deque
+from ctypes import c_float, c_int, pointer
+from .external import pybassmix
+from .external.pybass import *
+from .main import bass_call, bass_call_0, BassError
+from .stream import BaseStream
+
+class Mixer(BaseStream):
+	"""A stream which mixes any number of decoding channels into a single output.
+
+	Every source shares one device buffer and one output callback, so gain and position changes on the sources all land on the same sample boundary."""
+
+	def __init__(self, freq=44100, chans=2, flags=0, end=False, nonstop=True, resume=True, three_d=False, autofree=False, decode=False):
+		self.setup_flag_mapping()
+		flags = flags | self.flags_for(end=end, nonstop=nonstop, resume=resume, three_d=three_d, autofree=autofree, decode=decode)
+		handle = bass_call(pybassmix.BASS_Mixer_StreamCreate, freq, chans, flags)
+		super(Mixer, self).__init__(handle)
+		#Sources must stay referenced for as long as they are plugged in.
+		self.sources = []
+		self.envelope_mapping = {
+			'frequency': pybassmix.BASS_MIXER_ENV_FREQ,
+			'pan': pybassmix.BASS_MIXER_ENV_PAN,
+			'volume': pybassmix.BASS_MIXER_ENV_VOL,
+		}
+		self.sync_mapping = {
+			'end': BASS_SYNC_END,
+			'position': BASS_SYNC_POS,
+		}
+		#Sync handles mapped to their source and callback, which must stay referenced while BASS can call it.
+		self.syncs = {}
+		#Callbacks of onetime syncs which have fired. The newest is still running when it is dropped from syncs, so a few are kept until well after they return.
+		self.spent_syncs = deque(maxlen=16)
+
+	def setup_flag_mapping(self):
+		super(Mixer, self).setup_flag_mapping()
+		self.flag_mapping.update({
+			'end': pybassmix.BASS_MIXER_END,
+			'nonstop': pybassmix.BASS_MIXER_NONSTOP,
+			'resume': pybassmix.BASS_MIXER_RESUME,
+			'filter': pybassmix.BASS_MIXER_FILTER,
+			'buffer': pybassmix.BASS_MIXER_BUFFER,
+			'limit': pybassmix.BASS_MIXER_LIMIT,
+			'matrix': pybassmix.BASS_MIXER_MATRIX,
+			'paused': pybassmix.BASS_MIXER_PAUSE,
+			'downmix': pybassmix.BASS_MIXER_DOWNMIX,
+			'norampin': pybassmix.BASS_MIXER_NORAMPIN,
+		})
+
+	def add_channel(self, channel, flags=0, filter=False, buffer=False, limit=False, matrix=False, paused=False, downmix=False, norampin=False):
+		"""Plugs a decoding channel into the mixer."""
+		flags = flags | self.flags_for(filter=filter, buffer=buffer, limit=limit, matrix=matrix, paused=paused, downmix=downmix, norampin=norampin)
+		bass_call(pybassmix.BASS_Mixer_StreamAddChannel, self.handle, channel.handle, flags)
+		self.sources.append(channel)
+		return True
+
+	def remove_channel(self, channel):
+		"""Unplugs a channel from the mixer."""
+		bass_call(pybassmix.BASS_Mixer_ChannelRemove, channel.handle)
+		self.sources.remove(channel)
+		#BASS removes a source's syncs along with it.
+		for sync, (source, proc) in list(self.syncs.items()):
+			if source is channel:
+				del self.syncs[sync]
+		return True
+
+	def set_channel_paused(self, channel, paused):
+		"""Pauses or resumes a single source without touching the others."""
+		return bass_call_0(pybassmix.BASS_Mixer_ChannelFlags, channel.handle, pybassmix.BASS_MIXER_PAUSE if paused else 0, pybassmix.BASS_MIXER_PAUSE)
+
+	def get_channel_position(self, channel, mode=BASS_POS_BYTE):
+		"""Retrieves the position of a source, accounting for audio the mixer has buffered but not yet played."""
+		return bass_call_0(pybassmix.BASS_Mixer_ChannelGetPosition, channel.handle, mode)
+
+	def set_channel_position(self, channel, pos, mode=BASS_POS_BYTE):
+		"""Sets the position of a source, flushing the mixer's buffer so the change is heard immediately."""
+		return bass_call(pybassmix.BASS_Mixer_ChannelSetPosition, channel.handle, pos, mode)
+
+	def get_channel_level(self, channel):
+		"""Retrieves the level of a source which was added with buffer=True."""
+		return bass_call_0(pybassmix.BASS_Mixer_ChannelGetLevel, channel.handle)
+
+	def set_channel_envelope(self, channel, type, nodes, loop=False):
+		"""Sets an envelope on a source, replacing any previous envelope of the same type.
+
+		nodes is a sequence of (position, value) pairs, with positions in bytes of the mixer's sample format. The mixer interpolates between nodes as it renders, and holds the last value once the envelope ends unless loop is True. An empty sequence removes the envelope."""
+		type = self.envelope_mapping.get(type, type)
+		if loop:
+			type |= pybassmix.BASS_MIXER_ENV_LOOP
+		array = (pybassmix.BASS_MIXER_NODE * len(nodes))(*[pybassmix.BASS_MIXER_NODE(pos, value) for pos, value in nodes])
+		return bass_call(pybassmix.BASS_Mixer_ChannelSetEnvelope, channel.handle, type, array, len(nodes))
+
+	def get_channel_envelope_position(self, channel, type):
+		"""Returns a (position, value) tuple for the given envelope on a source."""
+		value = pointer(c_float())
+		position = bass_call_0(pybassmix.BASS_Mixer_ChannelGetEnvelopePos, channel.handle, self.envelope_mapping.get(type, type), value)
+		return position, value.contents.value
+
+	def set_channel_envelope_position(self, channel, type, pos):
+		"""Moves an envelope on a source to pos bytes."""
+		return bass_call(pybassmix.BASS_Mixer_ChannelSetEnvelopePos, channel.handle, self.envelope_mapping.get(type, type), pos)
+
+	def set_channel_sync(self, channel, type, param, func, mixtime=True, onetime=False):
+		"""Calls func(channel) when a source reaches its end (type 'end') or the byte position param (type 'position'), and returns a handle for remove_channel_sync.
+
+		With mixtime, func is called by the mixer as it renders the sync point, so a source added or changed there starts on exactly that sample. It runs on the mixer's thread, so must be quick."""
+		type = self.sync_mapping.get(type, type)
+		if mixtime:
+			type |= BASS_SYNC_MIXTIME
+		if onetime:
+			type |= BASS_SYNC_ONETIME
+		def callback(handle, source, data, user):
+			if onetime:
+				#BASS has removed the sync already.
+				self.spent_syncs.append(self.syncs.pop(handle, None))
+			func(channel)
+		proc = SYNCPROC(callback)
+		sync = bass_call(pybassmix.BASS_Mixer_ChannelSetSync, channel.handle, type, param, proc, None)
+		self.syncs[sync] = (channel, proc)
+		return sync
+
+	def remove_channel_sync(self, sync):
+		"""Removes a sync set with set_channel_sync. Raises BassError if it has gone already, because its source was removed or it was a onetime sync which has fired."""
+		#The mixer's thread may drop a onetime sync at any moment, so don't look before popping.
+		entry = self.syncs.pop(sync, None)
+		if entry is None:
+			raise BassError(BASS_ERROR_HANDLE, get_error_description(BASS_ERROR_HANDLE))
+		channel, proc = entry
+		return bass_call(pybassmix.BASS_Mixer_ChannelRemoveSync, channel.handle, sync)
+
+class SplitStream(BaseStream):
+	"""A decoding stream which reads a copy of another channel's data.
+
+	This lets channels which can't be plugged into a Mixer themselves, such as a Recording, be mixed without their data passing through Python. chanmap optionally lists the source channel to use for each of the split stream's channels."""
+
+	def __init__(self, channel, flags=0, chanmap=None, three_d=False, autofree=False, decode=True):
+		self.setup_flag_mapping()
+		flags = flags | self.flags_for(three_d=three_d, autofree=autofree, decode=decode)
+		if chanmap is not None:
+			chanmap = (c_int * (len(chanmap) + 1))(*(list(chanmap) + [-1]))
+		#Both must stay referenced for as long as the split stream exists.
+		self.source = channel
+		self.chanmap = chanmap
+		handle = bass_call(pybassmix.BASS_Split_StreamCreate, channel.handle, flags, chanmap)
+		super(SplitStream, self).__init__(handle)
+
+	def reset(self):
+		"""Discards any buffered data, so the split stream carries on from the source's current position."""
+		return bass_call(pybassmix.BASS_Split_StreamReset, self.handle)
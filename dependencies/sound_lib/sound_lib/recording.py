@@ -8,9 +8,12 @@ from .main import bass_call, bass_call_0
 class Recording(Channel):
 
 	def __init__(self, frequency=44100, channels=2, flags=BASS_RECORD_PAUSE, proc=None, user=None):
-		if not proc:
-			proc = lambda: True
-		self.callback = RECORDPROC(proc)
+		"""Starts recording from the current input device. With no proc, BASS keeps the recorded data in its own buffer, to be read with get_data or by a SplitStream, and Python is never called per buffer."""
+		if proc:
+			self.callback = RECORDPROC(proc)
+		else:
+			#A NULL function pointer.
+			self.callback = RECORDPROC()
 		self._frequency = frequency
 		self._channels = channels
 		self._flags = flags
@@ -1,14 +1,25 @@
 from __future__ import absolute_import
+import ctypes
 import platform
 import sys
+from . import external
 from .channel import Channel
-from .main import bass_call, bass_call_0
+from .main import bass_call, bass_call_0, BassError
 from .external.pybass import *
 try:
 	convert_to_unicode = unicode
 except NameError:
 	convert_to_unicode = str
 
+def create_stream(function, *args):
+	"""Calls a BASS stream creation function. If BASS doesn't recognise the format, the decoder plugins are loaded and the call is tried again, so they are only loaded once something needs them."""
+	try:
+		return bass_call(function, *args)
+	except BassError as e:
+		if e.code not in (BASS_ERROR_FILEFORM, BASS_ERROR_CODEC) or not external.load_plugins():
+			raise
+	return bass_call(function, *args)
+
 class BaseStream(Channel):
 
 	def _callback(*args):
@@ -40,7 +51,7 @@ class FileStream(BaseStream):
 
 	def __init__(self, mem=False, file=None, offset=0, length=0, flags=0, three_d=False, mono=False, autofree=False, decode=False, unicode=True):
 		"""Creates a sample stream from an MP3, MP2, MP1, OGG, WAV, AIFF or plugin supported file."""
-		if platform.system() == 'Darwin':
+		if platform.system() == 'Darwin' and not mem:
 			unicode = False
 			file = file.encode(sys.getfilesystemencoding())
 		self.setup_flag_mapping()
@@ -49,7 +60,7 @@ class FileStream(BaseStream):
 			file = convert_to_unicode(file)
 		self.file = file
 
-		handle = bass_call(BASS_StreamCreateFile, mem, file, offset, length, flags)
+		handle = create_stream(BASS_StreamCreateFile, mem, file, offset, length, flags)
 		super(FileStream, self).__init__(handle)
 
 class URLStream(BaseStream):
@@ -61,7 +72,7 @@ class URLStream(BaseStream):
 		self.setup_flag_mapping()
 		flags = flags | self.flags_for(three_d=three_d, autofree=autofree, decode=decode, unicode=unicode)
 		offset = int(offset)
-		handle = bass_call(BASS_StreamCreateURL, url, offset, flags, self.downloadproc, user)
+		handle = create_stream(BASS_StreamCreateURL, url, offset, flags, self.downloadproc, user)
 		super(URLStream, self).__init__(handle)
 
 class PushStream(BaseStream):
@@ -74,3 +85,80 @@ class PushStream(BaseStream):
 
 	def push(self, data):
 		return bass_call_0(BASS_StreamPutData, self.handle, data, len(data))
+
+class RingBufferPushStream(Stream):
+	"""A stream fed from a fixed size ring buffer.
+
+	A single producer thread calls write, and BASS pulls from the other end through a STREAMPROC, so memory use and latency are bounded by size bytes. Each side only ever moves its own index, so no lock is needed. If the producer gets too far ahead, write accepts as much as fits and counts an overrun; if it falls behind, the stream plays silence for the missing data and counts an underrun. A run of short reads counts as one underrun, until data arrives again."""
+
+	def __init__(self, size=65536, freq=44100, chans=2, flags=0, user=None, three_d=False, autofree=False, decode=False):
+		if flags & BASS_SAMPLE_FLOAT:
+			width = 4
+		elif flags & BASS_SAMPLE_8BITS:
+			width = 1
+		else:
+			width = 2
+		self.frame_size = width * chans
+		#8-bit samples are unsigned, so their silence is 0x80.
+		self.silence = 0x80 if width == 1 else 0
+		self.size = size - size % self.frame_size
+		self.buffer = bytearray(self.size)
+		self.view = memoryview(self.buffer)
+		self.address = ctypes.addressof(ctypes.c_char.from_buffer(self.buffer))
+		#Both indices count bytes since the stream was created, and only wrap when used.
+		self.read_index = 0
+		self.write_index = 0
+		self.underruns = 0
+		self.overruns = 0
+		#Whether the last read came up short, so one underrun isn't counted for every callback until the producer catches up.
+		self.starved = False
+		self.finished = False
+		super(RingBufferPushStream, self).__init__(freq=freq, chans=chans, flags=flags, proc=self.stream_proc, user=user, three_d=three_d, autofree=autofree, decode=decode)
+
+	@property
+	def fill(self):
+		"""The number of bytes waiting to be played."""
+		return self.write_index - self.read_index
+
+	@property
+	def space(self):
+		"""The number of bytes which can be written without overrunning."""
+		return self.size - self.fill
+
+	def write(self, data):
+		"""Copies as much of data into the ring as fits, in whole frames. Returns the number of bytes written. Must only be called from one thread at a time."""
+		length = len(data)
+		space = self.space
+		if length > space:
+			self.overruns += 1
+			length = space - space % self.frame_size
+		start = self.write_index % self.size
+		first = min(length, self.size - start)
+		data = memoryview(data).cast('B')
+		self.view[start:start + first] = data[:first]
+		self.view[:length - first] = data[first:length]
+		self.write_index += length
+		return length
+
+	def finish(self):
+		"""Ends the stream once everything already written has been played."""
+		self.finished = True
+
+	def stream_proc(self, handle, buffer, length, user):
+		available = self.fill
+		count = min(length, available)
+		start = self.read_index % self.size
+		first = min(count, self.size - start)
+		ctypes.memmove(buffer, self.address + start, first)
+		ctypes.memmove(buffer + first, self.address, count - first)
+		self.read_index += count
+		if self.finished and count == available:
+			return count | 0x80000000 #BASS_STREAMPROC_END
+		if count < length:
+			if count or not self.starved:
+				self.underruns += 1
+			self.starved = True
+			ctypes.memset(buffer + count, self.silence, length - count)
+		else:
+			self.starved = False
+		return length
@@ -1,13 +1,37 @@
 """Main entry point."""
 
 if __name__ == '__main__':
+    from argparse import FileType
     from default_argparse import parser
+    parser.add_argument(
+        '--event-log', type=FileType('w'), metavar='FILENAME',
+        help='Also write deck events to this file as JSON lines'
+    )
+    parser.add_argument(
+        '--event-sample', action='append', default=[],
+        metavar='CATEGORY=N',
+        help='Only log one in every N events of CATEGORY, such as '
+        'deck.frequency=10'
+    )
     args = parser.parse_args()
     import logging
     logging.basicConfig(
         stream=args.log_file,
         level=args.log_level, format=args.log_format
     )
+    from pyjay.events import JSONLinesFormatter, parse_rates, start_logging
+    handlers = logging.getLogger().handlers[:]
+    for handler in handlers:
+        handler.setLevel(args.log_level)
+    event_handlers = []
+    if args.event_log is not None:
+        handler = logging.StreamHandler(args.event_log)
+        handler.setFormatter(JSONLinesFormatter())
+        event_handlers.append(handler)
+        logging.getLogger('pyjay.events').setLevel(logging.INFO)
+    listener = start_logging(
+        handlers, event_handlers, parse_rates(args.event_sample)
+    )
     from pyjay import application, config
     from pyjay.ui import MainFrame
     frame = MainFrame(None, title=application.app.GetAppName())
@@ -19,3 +43,6 @@ if __name__ == '__main__':
         os.makedirs(application.config_dir)
     config.config.write(indent=4)
     logging.info('Main loop finished.')
+    from pyjay.accessibility import speech
+    speech.stop()
+    listener.stop()
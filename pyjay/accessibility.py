@@ -1,5 +1,96 @@
 """The speech system."""
 
+import logging
+from collections import OrderedDict
+from itertools import count
+from threading import Condition, Thread
+from attr import attrs, attrib, Factory
 from accessible_output2.outputs.auto import Auto
 
-speech = Auto()
+try:
+    import pythoncom
+except ImportError:
+    # Only Windows has COM, and only its outputs need it.
+    pythoncom = None
+
+logger = logging.getLogger(__name__)
+
+
+@attrs
+class SpeechQueue:
+    """Speaks on a background thread, so commands never wait for the screen
+    reader.
+
+    Utterances with the same category replace each other while they wait, and
+    interrupt each other when spoken back to back, so holding a key down only
+    speaks the latest value.
+
+    If output is not given, an Auto output is created on the speech thread,
+    since the SAPI5 and JAWS outputs are COM objects, which can only be used
+    on the thread which created them."""
+
+    output = attrib(default=Factory(lambda: None), repr=False)
+    pending = attrib(default=Factory(OrderedDict), init=False, repr=False)
+    condition = attrib(default=Factory(Condition), init=False, repr=False)
+    counter = attrib(default=Factory(count), init=False, repr=False)
+    thread = attrib(default=Factory(lambda: None), init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self.last_category = None
+        self.stopped = False
+        self.thread = Thread(target=self.work, name='Speech', daemon=True)
+        self.thread.start()
+
+    def speak(self, text, category=None, interrupt=False):
+        """Queue text to be spoken, and return straight away."""
+        if category is None:
+            key = (None, next(self.counter))
+        else:
+            key = (category, None)
+        with self.condition:
+            self.pending.pop(key, None)
+            self.pending[key] = (text, interrupt)
+            self.condition.notify()
+
+    def stop(self, timeout=5.0):
+        """Stop the speech thread once it has finished speaking, waiting at
+        most timeout seconds."""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+        self.thread.join(timeout=timeout)
+
+    def work(self):
+        """Speak queued utterances until stop is called."""
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
+        try:
+            if self.output is None:
+                try:
+                    self.output = Auto()
+                except Exception:
+                    logger.exception('Could not load a speech output.')
+            while True:
+                with self.condition:
+                    while not self.pending and not self.stopped:
+                        self.condition.wait()
+                    if not self.pending:
+                        return
+                    (category, n), (text, interrupt) = self.pending.popitem(
+                        last=False
+                    )
+                if category is not None and category == self.last_category:
+                    interrupt = True
+                self.last_category = category
+                try:
+                    self.output.speak(text, interrupt=interrupt)
+                except Exception:
+                    logger.exception('Could not speak %r.', text)
+        finally:
+            # COM objects must be released before COM is shut down.
+            self.output = None
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+
+speech = SpeechQueue()
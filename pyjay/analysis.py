@@ -0,0 +1,86 @@
+"""Offline tempo and beat analysis of whole libraries.
+
+Analysis runs in worker processes, which only ever import this module and
+sound_lib, so wx never starts in them."""
+
+import logging
+import os
+import os.path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sound_lib.effects.bpm import get_bpm, get_beats
+from sound_lib.output import Output
+from sound_lib.stream import FileStream
+from .cache import track_key
+
+logger = logging.getLogger(__name__)
+
+# The file types BASS can decode without plugins.
+extensions = ('.mp1', '.mp2', '.mp3', '.ogg', '.wav', '.aif', '.aiff')
+
+output = None
+
+
+def init_worker():
+    """Initialise BASS in a worker process. The no sound device is used, since
+    nothing is ever played."""
+    global output
+    output = Output(device=0)
+
+
+def analyse(filename):
+    """Return a dictionary holding the tempo and beat positions of filename.
+    Runs in a worker process."""
+    stream = FileStream(file=filename, decode=True)
+    try:
+        frequency = stream.get_info().freq
+        bpm = get_bpm(stream)
+        stream.set_position(0)
+        beats = get_beats(stream)
+    finally:
+        stream.free()
+    return dict(bpm=bpm, beats=beats, frequency=frequency)
+
+
+def find_tracks(folder):
+    """Yield the path of every track under folder."""
+    for dirpath, dirnames, filenames in os.walk(folder):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if os.path.splitext(name)[1].lower() in extensions:
+                yield os.path.join(dirpath, name)
+
+
+def analyse_folder(folder, cache, workers=None):
+    """Analyse every track under folder which is not already in cache, on a
+    pool of worker processes (one per core by default).
+
+    Results are saved by the calling process as they arrive, so a folder which
+    is only partly analysed can be picked up again later. Returns a tuple of
+    (analysed, failed) counts."""
+    analysed = 0
+    failed = 0
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker
+    ) as executor:
+        jobs = {}
+        for filename in find_tracks(folder):
+            try:
+                key = track_key(filename)
+            except OSError:
+                continue
+            if not cache.contains(key):
+                jobs[executor.submit(analyse, filename)] = (filename, key)
+        logger.info('Analysing %d tracks from %s.', len(jobs), folder)
+        for future in as_completed(jobs):
+            filename, key = jobs.pop(future)
+            try:
+                cache.save(key, future.result())
+                analysed += 1
+            except Exception as e:
+                logger.warning('Could not analyse %s: %s', filename, e)
+                failed += 1
+    logger.info(
+        'Finished analysing %s: %d analysed, %d failed.', folder, analysed,
+        failed
+    )
+    return analysed, failed
@@ -0,0 +1,85 @@
+"""On-disk caches of things worked out from tracks."""
+
+import json
+import os
+import os.path
+from hashlib import sha1
+from attr import attrs, attrib, Factory
+
+
+def track_key(path):
+    """Return a key for the file at path which changes whenever the file is
+    moved, modified or replaced."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    data = '%s\0%d\0%d' % (path, stat.st_mtime_ns, stat.st_size)
+    return sha1(data.encode('utf-8', 'surrogateescape')).hexdigest()
+
+
+def cache_dir(name):
+    """Return the directory called name under the config directory, creating
+    it if necessary.
+
+    The application module is imported here rather than at the top, since
+    importing it starts wx, which worker processes should not do."""
+    from .application import config_dir
+    path = os.path.join(config_dir, name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+@attrs
+class JSONCache:
+    """Things worked out from tracks, saved as one JSON file per track under
+    directory and keyed by path, modification time and size. Every file read
+    or written is also kept in memory.
+
+    Subclasses give directory a default, and override missing to say what get
+    returns for a track with nothing saved."""
+
+    directory = attrib()
+    memory = attrib(default=Factory(dict), init=False, repr=False)
+
+    def path(self, key):
+        """Return the path of the file for key."""
+        return os.path.join(self.directory, key + '.json')
+
+    def missing(self):
+        """Return what get returns for a track with nothing saved."""
+        return None
+
+    def get(self, filename):
+        """Return what has been saved for filename, or self.missing() if
+        nothing has."""
+        try:
+            key = track_key(filename)
+        except OSError:
+            return self.missing()
+        if key not in self.memory:
+            try:
+                with open(self.path(key), 'r') as f:
+                    self.memory[key] = json.load(f)
+            except (OSError, ValueError):
+                return self.missing()
+        return self.memory[key]
+
+    def contains(self, key):
+        """Return whether anything has been saved under key."""
+        return key in self.memory or os.path.isfile(self.path(key))
+
+    def save(self, key, value):
+        """Save value under key, replacing the file in one step so a crash
+        never leaves half of one."""
+        path = self.path(key)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(value, f)
+        os.replace(path + '.tmp', path)
+        self.memory[key] = value
+
+
+@attrs
+class AnalysisCache(JSONCache):
+    """The tempo and beats of tracks. get returns None for a track which
+    hasn't been analysed."""
+
+    directory = attrib(default=Factory(lambda: cache_dir('analysis')))
@@ -4,19 +4,20 @@ import logging
 import os
 import os.path
 import webbrowser
+from threading import Thread
 import wx
-from simpleconf2.dialogs.wx import SimpleConfWxDialog
 from attr import attrs, attrib, Factory
-from requests import Session
-from jinja2 import Environment
 from sound_lib.main import BassError
 from . import application
 from .accessibility import speech
 from .config import config
+from .events import event
+from .network import http, fetch_json
 
 logger = logging.getLogger(__name__)
 
-http = Session()
+# Jinja2, the configuration dialog, library analysis and session state are
+# imported by the commands which use them, so they don't slow down startup.
 
 html_help = """
 <html>
@@ -51,63 +52,82 @@ def error(msg, title='Error', style=wx.ICON_EXCLAMATION):
     return wx.MessageBox(msg, title, style=style)
 
 
+# Every command class, in the order they are defined.
+commands = []
+
 @attrs
 class Command:
     """
-    All commands must derive from this class.
+    All commands must derive from this class, and are registered as they are
+    defined.
 
     parent - The frame that is running the show.
     keys - A list of keys that should trigger this command.
+    bindings - A list of (key, action, deck, argument) tuples made by bind.
     """
 
     parent = attrib()
     keys = attrib(default=Factory(list))
+    bindings = attrib(default=Factory(list), repr=False)
+
+    # Commands which show dialogs set this, so they are left out of
+    # benchmarks.
+    interactive = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        commands.append(cls)
 
     def __attrs_post_init__(self):
         self.setup()
 
     def setup(self):
-        """Override to add extras."""
+        """Override to bind keys."""
         raise NotImplementedError()
 
+    def bind(self, key, action, deck=None, argument=None):
+        """Make key call action(deck, argument). Deck is the name of a deck
+        on the parent, such as 'left', and is looked up when the hotkeys are
+        compiled."""
+        self.keys.append(key)
+        self.bindings.append((key, action, deck, argument))
+
     def run(self, key):
-        """Actually do something with this command."""
-        raise NotImplementedError()
+        """Run the action bound to key."""
+        for bound_key, action, deck, argument in self.bindings:
+            if bound_key == key:
+                if deck is not None:
+                    deck = getattr(self.parent, deck)
+                return action(deck, argument)
+        raise KeyError(key)
 
 
 class MasterVolume(Command):
     """Alter the master volume."""
 
     def setup(self):
-        self.key_up = '='
-        self.key_down = '-'
-        self.key_full = 'SHIFT+='
-        self.key_mute = 'SHIFT+-'
-        self.keys = [self.key_up, self.key_down, self.key_full, self.key_mute]
+        self.bind('=', self.change, argument=1)
+        self.bind('-', self.change, argument=-1)
+        self.bind('SHIFT+=', self.set_volume, argument=100.0)
+        self.bind('SHIFT+-', self.set_volume, argument=0.0)
+
+    def change(self, deck, direction):
+        """Move the master volume up or down."""
+        volume = self.parent.master_volume + (
+            direction * config.audio['change_master_volume']
+        )
+        self.set_volume(deck, min(100.0, max(0.0, volume)))
 
-    def run(self, key):
-        """Alter the master volume."""
-        if key == self.key_up:
-            volume = min(
-                100.0, self.parent.master_volume +
-                config.audio['change_master_volume']
-            )
-        elif key == self.key_down:
-            volume = max(
-                0.0, self.parent.master_volume -
-                config.audio['change_master_volume']
-            )
-        elif key == self.key_full:
-            volume = 100.0
-        elif key == self.key_mute:
-            volume = 0.0
+    def set_volume(self, deck, volume):
+        """Set the master volume."""
         if volume != self.parent.master_volume:
-            logger.info(
-                'Changed master volume from %.2f to %.2f.',
-                self.parent.master_volume,
-                volume
+            event(
+                'master_volume', 'Changed master volume from %.2f to %.2f.',
+                self.parent.master_volume, volume, value=volume
+            )
+            speech.speak(
+                'Master volume %.2f.' % volume, category='master volume'
             )
-            speech.speak('Master volume %.2f.' % volume)
             self.parent.master_volume = volume
             self.parent.output.set_volume(self.parent.master_volume)
 
@@ -115,109 +135,116 @@ class MasterVolume(Command):
 class DeckLoad(Command):
     """Load a song onto a deck."""
 
+    interactive = True
+
     def setup(self):
-        self.key_left = 'A'
-        self.key_right = ';'
-        self.keys = [self.key_left, self.key_right]
+        self.bind('A', self.load, 'left')
+        self.bind(';', self.load, 'right')
 
-    def run(self, key):
+    def load(self, deck, argument):
         """Load a file."""
-        if key == self.key_left:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
         dlg = wx.FileDialog(
             self.parent, message='Choose a file to load', style=wx.FD_OPEN
         )
         try:
             if dlg.ShowModal() == wx.ID_OK:
-                deck.set_stream(dlg.GetPath())
+                self.parent.load_deck(deck, dlg.GetPath())
         except Exception as e:
             error(e)
         finally:
             dlg.Destroy()
 
 
+class QueueTrack(Command):
+    """Add songs to the queue of a deck, to play when the current one ends."""
+
+    interactive = True
+
+    def setup(self):
+        self.bind('ALT+A', self.queue, 'left')
+        self.bind('ALT+;', self.queue, 'right')
+
+    def queue(self, deck, argument):
+        """Queue files."""
+        with wx.FileDialog(
+            self.parent, message='Choose files to queue',
+            style=wx.FD_OPEN | wx.FD_MULTIPLE
+        ) as dlg:
+            if dlg.ShowModal() != wx.ID_OK:
+                return
+            filenames = dlg.GetPaths()
+        deck.overlap = config.audio['queue_overlap']
+        for filename in filenames:
+            deck.enqueue(filename)
+        speech.speak(
+            '%d tracks queued on %s.' % (len(deck.get_queue()), deck)
+        )
+
+
+class ClearQueue(Command):
+    """Clear the queue of a deck."""
+
+    def setup(self):
+        self.bind('ALT+Q', self.clear, 'left')
+        self.bind('ALT+P', self.clear, 'right')
+
+    def clear(self, deck, argument):
+        """Empty the queue."""
+        deck.clear_queue()
+        speech.speak('Cleared the queue of %s.' % deck)
+
+
 class PlayPause(Command):
     """Play or pause the deck."""
 
     def setup(self):
-        self.key_left = 'D'
-        self.key_right = 'K'
-        self.keys = [self.key_left, self.key_right, 'SPACE']
+        self.bind('D', self.play_pause, 'left')
+        self.bind('K', self.play_pause, 'right')
+        self.bind('SPACE', self.play_pause_both)
+
+    def play_pause(self, deck, argument):
+        """Play or pause deck."""
+        deck.play_pause()
+        speech.speak(
+            '%s %s deck.' % ('Pause' if deck.paused else 'Play', deck)
+        )
 
-    def run(self, key):
-        if key == self.key_left:
-            decks = [self.parent.left]
-        elif key == self.key_right:
-            decks = [self.parent.right]
-        else:
-            decks = [self.parent.left, self.parent.right]
-        for deck in decks:
-            deck.play_pause()
-            speech.speak(
-                '%s %s deck.' % ('Pause' if deck.paused else 'Play', deck)
-            )
+    def play_pause_both(self, deck, argument):
+        """Play or pause both decks."""
+        for deck in [self.parent.left, self.parent.right]:
+            self.play_pause(deck, argument)
 
 
 class SetPan(Command):
     """Set the pan of each deck."""
 
     def setup(self):
-        self.left_left = 'S'
-        self.left_full_left = 'SHIFT+S'
-        self.left_right = 'F'
-        self.left_full_right = 'SHIFT+F'
-        self.right_left = 'J'
-        self.right_full_left = 'SHIFT+J'
-        self.right_right = 'L'
-        self.right_full_right = 'SHIFT+L'
-        self.microphone_left = '['
-        self.microphone_full_left = 'SHIFT+['
-        self.microphone_right = ']'
-        self.microphone_full_right = 'SHIFT+]'
-        self.keys = [
-            self.left_left, self.left_full_left, self.left_right,
-            self.left_full_right, self.right_left, self.right_full_left,
-            self.right_right, self.right_full_right
-        ]
-
-    def run(self, key):
+        for deck, left, right in [('left', 'S', 'F'), ('right', 'J', 'L')]:
+            self.bind(left, self.change, deck, -1)
+            self.bind('SHIFT+' + left, self.set_pan, deck, -1.0)
+            self.bind(right, self.change, deck, 1)
+            self.bind('SHIFT+' + right, self.set_pan, deck, 1.0)
+
+    def change(self, deck, direction):
+        """Move the pan left or right, gliding while the key is held."""
+        pan = deck.automate('pan', direction * config.audio['change_pan'])
+        speech.speak('Pan %.1f.' % pan, category=(deck.name, 'pan'))
+
+    def set_pan(self, deck, pan):
         """Change the pan."""
-        if key in [
-            self.left_left, self.left_full_left, self.left_right,
-            self.left_full_right
-        ]:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
-        amount = config.audio['change_pan']
-        if key in [self.left_left, self.right_left]:
-            amount = -amount
-        if key in [self.left_full_left, self.right_full_left]:
-            amount = -1.0
-        elif key in [self.left_full_right, self.right_full_right]:
-            amount = 1.0
-        else:
-            amount = deck.pan + amount
-        deck.set_pan(amount)
-        speech.speak('Pan %.1f.' % deck.pan)
+        deck.set_pan(pan)
+        speech.speak('Pan %.1f.' % deck.pan, category=(deck.name, 'pan'))
 
 
 class DeckReset(Command):
     """Reset a deck."""
 
     def setup(self):
-        self.key_left = 'Q'
-        self.key_right = 'P'
-        self.keys = [self.key_left, self.key_right]
+        self.bind('Q', self.reset, 'left')
+        self.bind('P', self.reset, 'right')
 
-    def run(self, key):
+    def reset(self, deck, argument):
         """Reset the deck."""
-        if key == self.key_left:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
         logger.info('Resetting the %s.', deck)
         deck.reset()
         speech.speak('Reset %s.' % deck)
@@ -227,42 +254,28 @@ class SetVolume(Command):
     """Set the volume of a deck."""
 
     def setup(self):
-        self.left_up = 'E'
-        self.left_down = 'X'
-        self.right_up = 'I'
-        self.right_down = ','
-        self.keys = [
-            self.left_up, self.left_down, self.right_up, self.right_down
-        ]
-
-    def run(self, key):
-        """Set the volume."""
-        if key in [self.left_up, self.left_down]:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
-        amount = config.audio['change_volume']
-        if key in [self.left_down, self.right_down]:
-            amount = -amount
-        amount += deck.volume
-        deck.set_volume(amount)
-        speech.speak('Volume %.1f.' % deck.volume)
+        self.bind('E', self.change, 'left', 1)
+        self.bind('X', self.change, 'left', -1)
+        self.bind('I', self.change, 'right', 1)
+        self.bind(',', self.change, 'right', -1)
+
+    def change(self, deck, direction):
+        """Move the volume up or down, gliding while the key is held."""
+        volume = deck.automate(
+            'volume', direction * config.audio['change_volume']
+        )
+        speech.speak('Volume %.1f.' % volume, category=(deck.name, 'volume'))
 
 
 class FullVolume(Command):
     """Set the deck to full volume."""
 
     def setup(self):
-        self.key_left = 'SHIFT+E'
-        self.key_right = 'SHIFT+I'
-        self.keys = [self.key_left, self.key_right]
+        self.bind('SHIFT+E', self.full, 'left')
+        self.bind('SHIFT+I', self.full, 'right')
 
-    def run(self, key):
+    def full(self, deck, argument):
         """Set the deck to full volume."""
-        if key == self.key_left:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
         deck.set_volume(1.0)
         speech.speak('Volume full.')
 
@@ -271,16 +284,11 @@ class MuteVolume(Command):
     """Mute a deck."""
 
     def setup(self):
-        self.key_left = 'SHIFT+X'
-        self.key_right = 'SHIFT+,'
-        self.keys = [self.key_left, self.key_right]
+        self.bind('SHIFT+X', self.mute, 'left')
+        self.bind('SHIFT+,', self.mute, 'right')
 
-    def run(self, key):
-        """Set the deck to rull volume."""
-        if key == self.key_left:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
+    def mute(self, deck, argument):
+        """Set the deck to zero volume."""
         deck.set_volume(0.0)
         speech.speak('Volume mute.')
 
@@ -289,119 +297,197 @@ class SetFrequency(Command):
     """Set the frequency of a deck."""
 
     def setup(self):
-        self.left_up = 'C'
-        self.left_down = 'Z'
-        self.right_up = '.'
-        self.right_down = 'M'
-        self.keys = [
-            self.left_up, self.left_down, self.right_up, self.right_down
-        ]
+        self.bind('C', self.change, 'left', 1)
+        self.bind('Z', self.change, 'left', -1)
+        self.bind('.', self.change, 'right', 1)
+        self.bind('M', self.change, 'right', -1)
+
+    def change(self, deck, direction):
+        """Move the frequency up or down, gliding while the key is held."""
+        frequency = deck.automate(
+            'frequency', direction * config.audio['change_frequency']
+        )
+        speech.speak(
+            'Frequency %.d.' % frequency, category=(deck.name, 'frequency')
+        )
 
-    def run(self, key):
-        if key in [self.left_up, self.left_down]:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
-        amount = config.audio['change_frequency']
-        if key in [self.left_down, self.right_down]:
-            amount = -amount
-        amount += deck.frequency
-        deck.set_frequency(amount)
-        speech.speak('Frequency %.d.' % deck.frequency)
+
+class SetTempo(Command):
+    """Set the tempo of a deck without changing its pitch (needs keylock)."""
+
+    def setup(self):
+        self.bind('CTRL+C', self.change, 'left', 1)
+        self.bind('CTRL+Z', self.change, 'left', -1)
+        self.bind('CTRL+.', self.change, 'right', 1)
+        self.bind('CTRL+M', self.change, 'right', -1)
+
+    def change(self, deck, direction):
+        """Move the tempo up or down, gliding while the key is held."""
+        if not deck.has_tempo():
+            return speech.speak('Keylock is off.')
+        tempo = deck.automate(
+            'tempo', direction * config.audio['change_tempo']
+        )
+        speech.speak('Tempo %+.1f%%.' % tempo, category=(deck.name, 'tempo'))
+
+
+class SetPitch(Command):
+    """Set the pitch of a deck without changing its tempo (needs keylock)."""
+
+    def setup(self):
+        self.bind('ALT+C', self.change, 'left', 1)
+        self.bind('ALT+Z', self.change, 'left', -1)
+        self.bind('ALT+.', self.change, 'right', 1)
+        self.bind('ALT+M', self.change, 'right', -1)
+
+    def change(self, deck, direction):
+        """Move the pitch up or down, gliding while the key is held."""
+        if not deck.has_tempo():
+            return speech.speak('Keylock is off.')
+        pitch = deck.automate(
+            'pitch', direction * config.audio['change_pitch']
+        )
+        speech.speak(
+            'Pitch %+.1f semitones.' % pitch, category=(deck.name, 'pitch')
+        )
 
 
 class DeckSeek(Command):
     """Seek through a deck."""
 
     def setup(self):
-        self.left_left = 'W'
-        self.left_full = 'SHIFT+W'
-        self.left_right = 'R'
-        self.right_left = 'U'
-        self.right_full = 'SHIFT+U'
-        self.right_right = 'O'
-        self.keys = [
-            self.left_left, self.left_full, self.left_right, self.right_left,
-            self.right_full, self.right_right
-        ]
-
-    def run(self, key):
+        for deck, back, forward in [('left', 'W', 'R'), ('right', 'U', 'O')]:
+            self.bind(back, self.seek, deck, -1)
+            self.bind('SHIFT+' + back, self.restart, deck)
+            self.bind(forward, self.seek, deck, 1)
+            self.bind('ALT+' + back, self.seek_beats, deck, -1)
+            self.bind('ALT+' + forward, self.seek_beats, deck, 1)
+
+    def seek(self, deck, direction):
         """Seek through the track."""
-        if key in [self.left_left, self.left_full, self.left_right]:
-            deck = self.parent.left
+        deck.seek_seconds(direction * config.audio['seek_time'])
+
+    def seek_beats(self, deck, direction):
+        """Seek through the track by beats."""
+        if not deck.seek_beats(direction * config.audio['seek_beats']):
+            speech.speak('Tempo unknown.')
+
+    def restart(self, deck, argument):
+        """Seek to the start of the track."""
+        deck.seek(0, absolute=True)
+
+
+class HotCue(Command):
+    """Jump to or set the hot cues of each deck."""
+
+    def setup(self):
+        for deck, keys in [('left', '1234'), ('right', '7890')]:
+            for slot, key in enumerate(keys, start=1):
+                self.bind(key, self.jump, deck, slot)
+                self.bind('SHIFT+' + key, self.set_cue, deck, slot)
+
+    def jump(self, deck, slot):
+        """Jump to a hot cue."""
+        if deck.jump_to_cue(slot) is None:
+            speech.speak('Cue %d not set.' % slot)
+
+    def set_cue(self, deck, slot):
+        """Set a hot cue at the play position."""
+        if deck.set_cue(slot) is not None:
+            speech.speak('Set cue %d.' % slot)
+
+
+class Loop(Command):
+    """Set the loop points of each deck, and turn looping on or off."""
+
+    def setup(self):
+        for deck, keys in [('left', ('F2', 'F3', 'F4')),
+                           ('right', ('F5', 'F6', 'F7'))]:
+            loop_in, loop_out, toggle = keys
+            self.bind(loop_in, self.loop_in, deck)
+            self.bind(loop_out, self.loop_out, deck)
+            self.bind(toggle, self.toggle, deck)
+
+    def loop_in(self, deck, argument):
+        """Start the loop at the play position."""
+        if deck.loop_in() is not None:
+            speech.speak('Loop in.')
+
+    def loop_out(self, deck, argument):
+        """End the loop at the play position and start looping."""
+        if deck.loop_out() is None:
+            speech.speak('Set the loop in point first.')
         else:
-            deck = self.parent.right
-        absolute = False
-        if key in [self.left_full, self.right_full]:
-            amount = 0
-            absolute = True
-        elif key in [self.left_left, self.right_left]:
-            amount = -config.audio['seek_amount']
+            speech.speak('Looping.')
+
+    def toggle(self, deck, argument):
+        """Turn looping on or off."""
+        if deck.toggle_loop():
+            speech.speak('Looping.')
+        elif deck.get_marks()['loop'][1] is None:
+            speech.speak('No loop set.')
         else:
-            amount = config.audio['seek_amount']
-        deck.seek(amount, absolute=absolute)
+            speech.speak('Loop off.')
 
 
 class CrossFade(Command):
     """Crossfade between the two decks."""
 
     def setup(self):
-        self.key_left = 'V'
-        self.key_right = 'N'
-        self.key_centre = 'B'
-        self.key_cut_left = 'G'
-        self.key_cut_right = 'H'
-        self.keys = [
-            self.key_left, self.key_right, self.key_centre, self.key_cut_left,
-            self.key_cut_right
-        ]
+        self.bind('V', self.move, argument=-1)
+        self.bind('N', self.move, argument=1)
+        self.bind('B', self.cut, argument=0)
+        self.bind('G', self.cut, argument=-100)
+        self.bind('H', self.cut, argument=100)
+        self.bind('SHIFT+V', self.fade, argument=-100)
+        self.bind('SHIFT+N', self.fade, argument=100)
+        self.bind('SHIFT+B', self.fade, argument=0)
+
+    def get_crossfader(self):
+        """Return the crossfader with the configured curve, or None if the
+        curve is not valid."""
+        crossfader = self.parent.crossfader
+        if crossfader.curve != config.audio['crossfade_curve']:
+            try:
+                crossfader.set_curve(config.audio['crossfade_curve'])
+            except ValueError as e:
+                error(e)
+                return None
+        return crossfader
+
+    def move(self, deck, direction):
+        """Move the crossfader a little."""
+        self.cut(
+            deck, self.parent.crossfader.position +
+            direction * config.audio['crossfade_amount']
+        )
 
-    def run(self, key):
-        """Crossfade."""
-        amount = config.audio['crossfade_amount']
-        result = self.parent.crossfader
-        if key == self.key_left:
-            result = max(-100, result - amount)
-        elif key == self.key_right:
-            result = min(100, result + amount)
-        elif key == self.key_cut_left:
-            result = -100
-        elif key == self.key_cut_right:
-            result = 100
-        else:
-            result = 0
-        ratio = 0.01
-        left = self.parent.left
-        right = self.parent.right
-        self.parent.crossfader = result
-        logging.info('Crossfading to %d.', result)
-        if result < 0:
-            left.set_volume(1.0)
-            result = 100 + result
-            right.set_volume(result * ratio)
-        elif result > 0:
-            right.set_volume(1.0)
-            result = 100 - result
-            left.set_volume(result * ratio)
-        else:
-            for deck in [left, right]:
-                deck.set_volume(1.0)
+    def cut(self, deck, position):
+        """Move the crossfader straight to position."""
+        crossfader = self.get_crossfader()
+        if crossfader is not None:
+            event(
+                'crossfader.position', 'Crossfading to %d.', position,
+                position=position
+            )
+            crossfader.set_position(position)
+
+    def fade(self, deck, position):
+        """Fade the crossfader to position."""
+        crossfader = self.get_crossfader()
+        if crossfader is not None:
+            crossfader.fade(position, config.audio['crossfade_time'])
 
 
 class DeckStop(Command):
     """Stop a deck."""
 
     def setup(self):
-        self.key_left = 'SHIFT+D'
-        self.key_right = 'SHIFT+K'
-        self.keys = [self.key_left, self.key_right]
+        self.bind('SHIFT+D', self.stop, 'left')
+        self.bind('SHIFT+K', self.stop, 'right')
 
-    def run(self, key):
+    def stop(self, deck, argument):
         """Stop the deck."""
-        if key == self.key_left:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
         try:
             deck.pause()
         except BassError:
@@ -414,17 +500,14 @@ class DeckStop(Command):
 class SetOutput(Command):
     """Change audio devices."""
 
+    interactive = True
+
     def setup(self):
-        self.input_key = 'F11'
-        self.output_key = 'F12'
-        self.keys = [self.input_key, self.output_key]
+        self.bind('F11', self.set_device, argument='input')
+        self.bind('F12', self.set_device, argument='output')
 
-    def run(self, key):
-        """Set the output device."""
-        if key == self.input_key:
-            attr = 'input'
-        else:
-            attr = 'output'
+    def set_device(self, deck, attr):
+        """Set the input or output device."""
         device = getattr(self.parent, attr)
         names = device.get_device_names()
         with wx.SingleChoiceDialog(
@@ -436,10 +519,8 @@ class SetOutput(Command):
             else:
                 new_device = None
         if new_device is not None:
-            if attr == 'input':
-                positions = {}
-                for deck in [self.parent.left, self.parent.right]:
-                    positions[deck] = deck.get_position()
+            from .state import SessionState
+            state = SessionState.capture(self.parent)
             device.free()
             device = device.__class__()
             setattr(self.parent, attr, device)
@@ -449,13 +530,11 @@ class SetOutput(Command):
                 new_device -= 1
             device.set_device(new_device)
             if attr == 'output':
-                for deck in [self.parent.left, self.parent.right]:
-                    if deck.filename:
-                        if deck.url is False:
-                            deck.set_stream(deck.filename)
-                            deck.seek(positions[deck], absolute=True)
+                self.parent.setup_mixer()
+                state.restore(self.parent)
             else:
                 self.parent.setup_microphone()
+                state.restore_microphone(self.parent)
             logger.info(
                 'Set %s to %s.', attr,
                 device.get_device_names()[device.device - 1]
@@ -465,16 +544,19 @@ class SetOutput(Command):
 class Config(Command):
     """View and edit program configuration."""
 
+    interactive = True
+
     def setup(self):
-        self.keys = ['CTRL+,']
+        self.bind('CTRL+,', self.show)
 
-    def run(self, key):
+    def show(self, deck, argument):
         """Show the configuration."""
         with wx.SingleChoiceDialog(
             self.parent, 'Choose a configuration page to load',
             'Configuration', config.sections
         ) as dlg:
             if dlg.ShowModal() == wx.ID_OK:
+                from simpleconf2.dialogs.wx import SimpleConfWxDialog
                 section = getattr(config, config.sections[dlg.GetSelection()])
                 frame = SimpleConfWxDialog(section, parent=self.parent)
                 frame.Show(True)
@@ -483,25 +565,26 @@ class Config(Command):
 class LoadRequest(Command):
     """Load a request from the requests server."""
 
+    interactive = True
+
     def setup(self):
-        self.key_left = 'SHIFT+A'
-        self.key_right = 'SHIFT+;'
-        self.keys = [self.key_left, self.key_right]
+        self.bind('SHIFT+A', self.load, 'left')
+        self.bind('SHIFT+;', self.load, 'right')
 
-    def run(self, key):
+    def load(self, deck, argument):
         """Load a file."""
-        if key == self.key_left:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
         try:
-            response = http.get(f'{config.requests["url"]}/json')
-            if not response.ok:
-                raise RuntimeError(
-                    'Could not connect to the requests uRL. Please ensure it '
-                    'is correct in your configuration.'
+            # Only the first page is shown, since that is as much as the
+            # dialog can usefully show. It comes from the mirror if that is
+            # connected, so nothing waits for the network.
+            j = self.parent.request_mirror.get_requests()
+            if j is None:
+                j = fetch_json(
+                    f'{config.requests["url"]}/json',
+                    params=dict(limit=config.requests['page_size'])
                 )
-            j = response.json()
+            else:
+                j = j[:config.requests['page_size']]
             if not j:
                 raise RuntimeError('There are no requests to load.')
             requests = []
@@ -518,10 +601,17 @@ class LoadRequest(Command):
                 self.parent, 'Choose a request to load', 'Requests', requests
             ) as dlg:
                 if dlg.ShowModal() == wx.ID_OK:
-                    request = j[dlg.GetSelection()]
+                    # Copied, since j may be handed out again from the cache.
+                    request = dict(j[dlg.GetSelection()])
                 else:
-                    request = None
-            response = http.get(
+                    return
+        except Exception as e:
+            return error(e)
+
+        def get_url():
+            """Mark the request as played and return its URL. Runs on the
+            preloader's thread."""
+            response = http().get(
                 f'{config.requests["url"]}/get_url/{request["id"]}',
                 auth=(config.requests['username'], config.requests['password'])
             )
@@ -541,21 +631,23 @@ class LoadRequest(Command):
                         request, j['track']
                     )
                 )
-            deck.set_stream(j['url'], url=True)
-        except Exception as e:
-            error(e)
+            return j['url']
+
+        self.parent.load_deck(deck, get_url, url=True)
 
 
 class GoogleSearch(Command):
     """Load a track from Google Play."""
 
+    interactive = True
+
     def setup(self):
-        self.key_left = 'CTRL+A'
-        self.key_right = 'CTRL+;'
-        self.keys = [self.key_left, self.key_right]
+        self.bind('CTRL+A', self.search, 'left')
+        self.bind('CTRL+;', self.search, 'right')
 
-    def run(self, key):
-        api = self.parent.google_api
+    def search(self, deck, argument):
+        """Search Google Play and load the chosen track."""
+        api = self.parent.get_google_api()
         try:
             self.parent.google_login()
         except Exception as e:
@@ -578,24 +670,19 @@ class GoogleSearch(Command):
                 track = None
         if track is not None:
             id = get_id(track)
-            try:
-                url = api.get_stream_url(id)
-            except Exception as e:
-                return error(e)
-            if key == self.key_left:
-                deck = self.parent.left
-            else:
-                deck = self.parent.right
-            deck.set_stream(url, url=True)
+            self.parent.load_deck(
+                deck, lambda: api.get_stream_url(id), url=True
+            )
 
 
 class Microphone(Command):
     """Toggle the microphone."""
 
     def setup(self):
-        self.keys = ['/']
+        self.bind('/', self.toggle)
 
-    def run(self, key):
+    def toggle(self, deck, argument):
+        """Mute or unmute the microphone."""
         if self.parent.microphone_stream.volume:
             logger.info('Microphone muted.')
             speech.speak('Mic off.')
@@ -610,37 +697,42 @@ class MicrophonePan(Command):
     """Change the microphone pan."""
 
     def setup(self):
-        self.left = '['
-        self.full_left = 'SHIFT+['
-        self.right = ']'
-        self.full_right = 'SHIFT+]'
-        self.keys = [self.left, self.full_left, self.right, self.full_right]
+        self.bind('[', self.change, argument=-1)
+        self.bind('SHIFT+[', self.set_pan, argument=-1.0)
+        self.bind(']', self.change, argument=1)
+        self.bind('SHIFT+]', self.set_pan, argument=1.0)
+
+    def change(self, deck, direction):
+        """Move the microphone pan left or right."""
+        self.set_pan(
+            deck, self.parent.microphone_stream.pan +
+            direction * config.audio['change_pan']
+        )
 
-    def run(self, key):
-        amount = config.audio['change_pan']
-        if key == self.left:
-            amount = -amount
-        amount = self.parent.microphone_stream.pan + amount
-        if key == self.full_left:
-            amount = -1.0
-        elif key == self.full_right:
-            amount = 1.0
+    def set_pan(self, deck, amount):
+        """Set the microphone pan."""
         if amount < -1.0:
             amount = -1.0
         elif amount > 1.0:
             amount = 1.0
-        logger.info('Setting microphone pan to %f.', amount)
+        event(
+            'microphone.pan', 'Setting microphone pan to %f.', amount,
+            value=amount
+        )
         self.parent.microphone_stream.set_pan(amount)
-        speech.speak('Microphone pan %.1f.' % amount)
+        speech.speak(
+            'Microphone pan %.1f.' % amount, category='microphone pan'
+        )
 
 
 class ResetMicrophone(Command):
     """Reset the microphone settings."""
 
     def setup(self):
-        self.keys = ['RETURN']
+        self.bind('RETURN', self.reset)
 
-    def run(self, key):
+    def reset(self, deck, argument):
+        """Centre the microphone."""
         logger.info('Resetting the microphone.')
         speech.speak('Reset mic.')
         self.parent.microphone_stream.pan = 0.0
@@ -649,69 +741,70 @@ class ResetMicrophone(Command):
 class Help(Command):
     """Show help in your web browser or enable help mode."""
 
+    interactive = True
+
     def setup(self):
-        self.help_html_key = 'F1'
         self.parent.help_mode_key = 'SHIFT+/'
-        self.keys = [self.help_html_key, self.parent.help_mode_key]
-        self.environment = Environment()
-        self.environment.globals.update(
-            app_name=application.name,
-            frame=self.parent
-        )
+        self.bind('F1', self.show_html)
+        self.bind(self.parent.help_mode_key, self.toggle_help_mode)
+        self.environment = None
 
-    def run(self, key):
+    def show_html(self, deck, argument):
         """Generate HTML."""
-        if key == self.help_html_key:
-            html = self.environment.from_string(html_help).render()
-            if not os.path.isdir(application.config_dir):
-                os.makedirs(application.config_dir)
-            path = os.path.join(application.config_dir, 'hotkeys.html')
-            with open(path, 'w') as f:
-                f.write(html)
-            webbrowser.open(path)
-        else:
-            self.parent.help_mode = not self.parent.help_mode
-            speech.speak('Help mode %s.' % (
-                'enabled' if self.parent.help_mode else 'disabled')
+        if self.environment is None:
+            from jinja2 import Environment
+            self.environment = Environment()
+            self.environment.globals.update(
+                app_name=application.name,
+                frame=self.parent
             )
+        html = self.environment.from_string(html_help).render()
+        if not os.path.isdir(application.config_dir):
+            os.makedirs(application.config_dir)
+        path = os.path.join(application.config_dir, 'hotkeys.html')
+        with open(path, 'w') as f:
+            f.write(html)
+        webbrowser.open(path)
+
+    def toggle_help_mode(self, deck, argument):
+        """Turn help mode on or off."""
+        self.parent.help_mode = not self.parent.help_mode
+        speech.speak('Help mode %s.' % (
+            'enabled' if self.parent.help_mode else 'disabled')
+        )
 
 
 class SpeakProgress(Command):
     """Speak the position of a deck."""
 
     def setup(self):
-        self.left = 'SHIFT+R'
-        self.right = 'SHIFT+O'
-        self.keys = [self.left, self.right]
+        self.bind('SHIFT+R', self.speak, 'left')
+        self.bind('SHIFT+O', self.speak, 'right')
 
-    def run(self, key):
-        if key == self.left:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
-        s = deck.stream
-        if s is None:
+    def speak(self, deck, argument):
+        """Speak how far through its track deck is."""
+        length = deck.get_length()
+        if not length:
             speech.speak('Nothing playing.')
         else:
             speech.speak(
-                '%.2f%%' % (s.get_position() * (100 / s.get_length()))
+                '%.2f%%' % (deck.get_position() * (100 / length)),
+                category=(deck.name, 'progress')
             )
 
 
 class ResetFrequency(Command):
-    """Reset the frequency of a deck."""
+    """Reset the frequency, tempo and pitch of a deck."""
 
     def setup(self):
-        self.key_left = 'SHIFT+Q'
-        self.key_right = 'SHIFT+P'
-        self.keys = [self.key_left, self.key_right]
+        self.bind('SHIFT+Q', self.reset, 'left')
+        self.bind('SHIFT+P', self.reset, 'right')
 
-    def run(self, key):
-        if key == self.key_left:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
+    def reset(self, deck, argument):
+        """Put deck back to its normal speed."""
         deck.set_frequency(44100.0)
+        deck.set_tempo(0.0)
+        deck.set_pitch(0.0)
         speech.speak('Reset frequency.')
 
 
@@ -719,15 +812,11 @@ class ResetPan(Command):
     """Reset the pan of a deck."""
 
     def setup(self):
-        self.key_left = 'SHIFT+T'
-        self.key_right = 'SHIFT+Y'
-        self.keys = [self.key_left, self.key_right]
+        self.bind('SHIFT+T', self.reset, 'left')
+        self.bind('SHIFT+Y', self.reset, 'right')
 
-    def run(self, key):
-        if key == self.key_left:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
+    def reset(self, deck, argument):
+        """Centre deck."""
         deck.set_pan(0.0)
         speech.speak('Reset pan.')
 
@@ -735,11 +824,14 @@ class ResetPan(Command):
 class RegisteredDevices(Command):
     """Allows you to set the ID of the device you use to sign into Google.."""
 
+    interactive = True
+
     def setup(self):
-        self.keys = ['F8']
+        self.bind('F8', self.choose)
 
-    def run(self, key):
-        api = self.parent.google_api
+    def choose(self, deck, argument):
+        """Choose a registered device."""
+        api = self.parent.get_google_api()
         try:
             self.parent.google_login()
         except Exception as e:
@@ -768,16 +860,14 @@ class RegisteredDevices(Command):
 class OpenFile(Command):
     """Open the file loaded to a deck externally."""
 
+    interactive = True
+
     def setup(self):
-        self.key_left = 'SHIFT+C'
-        self.key_right = 'SHIFT+.'
-        self.keys = [self.key_left, self.key_right]
+        self.bind('SHIFT+C', self.open, 'left')
+        self.bind('SHIFT+.', self.open, 'right')
 
-    def run(self, key):
-        if key == self.key_left:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
+    def open(self, deck, argument):
+        """Open the file on deck."""
         filename = deck.filename
         if filename is None:
             error('Nothing loaded.')
@@ -789,13 +879,58 @@ class SpeakPlayState(Command):
     """Speak the play state of a deck."""
 
     def setup(self):
-        self.key_left = 'SHIFT+Z'
-        self.key_right = 'SHIFT+M'
-        self.keys = [self.key_left, self.key_right]
+        self.bind('SHIFT+Z', self.speak, 'left')
+        self.bind('SHIFT+M', self.speak, 'right')
 
-    def run(self, key):
-        if key == self.key_left:
-            deck = self.parent.left
-        else:
-            deck = self.parent.right
+    def speak(self, deck, argument):
+        """Speak whether deck is paused."""
         speech.speak('Paused.' if deck.paused else 'Not paused.')
+
+
+class SpeakTempo(Command):
+    """Speak the tempo of a deck."""
+
+    def setup(self):
+        self.bind('CTRL+R', self.speak, 'left')
+        self.bind('CTRL+O', self.speak, 'right')
+
+    def speak(self, deck, argument):
+        """Speak the tempo of the track on deck."""
+        bpm = deck.get_bpm()
+        if bpm is None:
+            speech.speak('Tempo unknown.')
+        else:
+            speech.speak('%.1f BPM.' % bpm)
+
+
+class AnalyseFolder(Command):
+    """Work out the tempo and beats of every track in a folder."""
+
+    interactive = True
+
+    def setup(self):
+        self.bind('F9', self.choose)
+
+    def choose(self, deck, argument):
+        """Choose a folder and start analysing it."""
+        with wx.DirDialog(
+            self.parent, 'Choose a folder to analyse'
+        ) as dlg:
+            if dlg.ShowModal() == wx.ID_OK:
+                folder = dlg.GetPath()
+            else:
+                return
+        speech.speak('Analysing %s.' % folder)
+        Thread(target=self.analyse, args=[folder], daemon=True).start()
+
+    def analyse(self, folder):
+        """Analyse folder on a pool of processes. Runs on its own thread so the
+        interface stays responsive."""
+        from .analysis import analyse_folder
+        try:
+            analysed, failed = analyse_folder(folder, self.parent.analyses)
+        except Exception as e:
+            return wx.CallAfter(error, e)
+        wx.CallAfter(
+            speech.speak, 'Analysed %d tracks, %d failed.' % (analysed, failed)
+        )
@@ -4,6 +4,9 @@ from simpleconf2 import Section, Option, validators
 from .application import config_dir
 import os.path
 
+# The old seek_amount option was in bytes of 16-bit stereo at 44.1 kHz.
+seek_amount_bytes_per_second = 44100 * 4
+
 
 class Config(Section):
     """The main configuration class."""
@@ -42,11 +45,43 @@ class Config(Section):
                 max=199990.0
             )
         )
-        seek_amount = Option(
-            50000,
-            title='The amount to seek by',
+        change_tempo = Option(
+            1.0,
+            title='Percent to change tempo by',
+            validator=validators.Float(
+                min=0.01,
+                max=100.0
+            )
+        )
+        change_pitch = Option(
+            0.5,
+            title='Semitones to change pitch by',
+            validator=validators.Float(
+                min=0.01,
+                max=12.0
+            )
+        )
+        keylock = Option(
+            False,
+            title='Change tempo and pitch separately (from the next track '
+            'loaded)'
+        )
+        quick_tempo = Option(
+            False,
+            title="Use BASS_FX's quick tempo algorithm"
+        )
+        seek_time = Option(
+            0.25,
+            title='Seconds to seek by',
+            validator=validators.Float(
+                min=0.0
+            )
+        )
+        seek_beats = Option(
+            4,
+            title='Beats to seek by',
             validator=validators.Integer(
-                min=0
+                min=1
             )
         )
         crossfade_amount = Option(
@@ -57,15 +92,83 @@ class Config(Section):
                 max=100
             )
         )
+        crossfade_curve = Option(
+            'linear',
+            title='Crossfader curve (linear, power or cut)'
+        )
+        crossfade_time = Option(
+            2.0,
+            title='Seconds taken by automatic crossfades',
+            validator=validators.Float(
+                min=0.0,
+                max=60.0
+            )
+        )
+        preload_budget = Option(
+            256,
+            title='Megabytes of tracks to hold in memory while loading',
+            validator=validators.Integer(
+                min=0
+            )
+        )
+        preload_max_age = Option(
+            300.0,
+            title='Seconds before an unused preloaded track is dropped',
+            validator=validators.Float(
+                min=1.0
+            )
+        )
+        queue_overlap = Option(
+            0.0,
+            title='Seconds queued tracks overlap by (0 for gapless)',
+            validator=validators.Float(
+                min=0.0,
+                max=30.0
+            )
+        )
+        restore_session = Option(
+            True,
+            title='Restore the last session when starting'
+        )
+        snapshot_interval = Option(
+            10.0,
+            title='Seconds between saves of the session',
+            validator=validators.Float(
+                min=1.0
+            )
+        )
         option_order = [
             change_master_volume,
             change_pan,
             change_volume,
             change_frequency,
-            seek_amount,
+            change_tempo,
+            change_pitch,
+            keylock,
+            quick_tempo,
+            seek_time,
+            seek_beats,
             crossfade_amount,
+            crossfade_curve,
+            crossfade_time,
+            preload_budget,
+            preload_max_age,
+            queue_overlap,
+            restore_session,
+            snapshot_interval,
         ]
 
+        def update(self, data, *args, **kwargs):
+            """Load data, moving the seek_amount option of older versions
+            over to seek_time."""
+            options = data.get('options', {})
+            if 'seek_amount' in options and 'seek_time' not in options:
+                options = dict(options)
+                options['seek_time'] = options.pop('seek_amount') / \
+                    seek_amount_bytes_per_second
+                data = dict(data, options=options)
+            super().update(data, *args, **kwargs)
+
     class requests(Section):
         """The requests configuration."""
         title = 'Requests'
@@ -81,10 +184,25 @@ class Config(Section):
             'password',
             title='&Password'
         )
+        live = Option(
+            False,
+            title='&Keep the requests list up to date in the background '
+            '(from the next start)'
+        )
+        page_size = Option(
+            50,
+            title='Requests to &show at once',
+            validator=validators.Integer(
+                min=1,
+                max=500
+            )
+        )
         option_order = [
             url,
             username,
-            password
+            password,
+            live,
+            page_size
         ]
 
     class google(Section):
@@ -0,0 +1,110 @@
+"""Provides the Crossfader class."""
+
+import logging
+import math
+from attr import attrs, attrib, Factory
+from .events import event
+
+logger = logging.getLogger(__name__)
+
+curves = {}
+
+
+def curve(func):
+    """Register func as a crossfader curve.
+
+    It will be called with a value between 0.0 (fully left) and 1.0 (fully
+    right), and should return the gain for the left deck. The right deck uses
+    the mirror image."""
+    curves[func.__name__] = func
+    return func
+
+
+@curve
+def linear(x):
+    """Both decks at full volume in the centre, fading out towards the far
+    side."""
+    return min(1.0, 2.0 * (1.0 - x))
+
+
+@curve
+def power(x):
+    """Constant power, so the overall loudness stays level across the
+    fade."""
+    return math.cos(x * math.pi / 2)
+
+
+@curve
+def cut(x):
+    """Both decks at full volume until the last few percent of travel."""
+    return min(1.0, 20.0 * (1.0 - x))
+
+
+@attrs
+class Crossfader:
+    """Balances the gain of two decks.
+
+    Positions run from -100 (left deck only) to 100 (right deck only). Gains
+    for every position are computed once when the curve is set, and the decks'
+    mixer applies them to the audio, so nothing is calculated per block."""
+
+    left = attrib()
+    right = attrib()
+    curve = attrib(default=Factory(lambda: 'linear'))
+    position = attrib(default=Factory(lambda: 0))
+    table = attrib(default=Factory(list), init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self.set_curve(self.curve)
+
+    def set_curve(self, name):
+        """Build the gain table for the curve with the given name."""
+        if name not in curves:
+            raise ValueError(
+                'Invalid crossfader curve %r. Choose from %s.' % (
+                    name, ', '.join(sorted(curves))
+                )
+            )
+        func = curves[name]
+        self.curve = name
+        self.table = []
+        for position in range(-100, 101):
+            x = (position + 100) / 200
+            self.table.append((func(x), func(1.0 - x)))
+        self.set_position(self.position)
+
+    def gains(self, position):
+        """Return the (left, right) gains for position."""
+        return self.table[position + 100]
+
+    def set_position(self, position):
+        """Jump straight to position."""
+        position = max(-100, min(100, position))
+        self.position = position
+        left, right = self.gains(position)
+        self.left.set_gain(left)
+        self.right.set_gain(right)
+
+    def fade(self, position, time):
+        """Move to position over time seconds.
+
+        Every position passed through becomes a node in a mixer envelope, so
+        the engine follows the curve sample by sample."""
+        position = max(-100, min(100, position))
+        start = self.position
+        step = 1 if position >= start else -1
+        path = range(start, position + step, step)
+        interval = time / max(1, len(path) - 1)
+        left = []
+        right = []
+        for index, p in enumerate(path):
+            left_gain, right_gain = self.gains(p)
+            left.append((index * interval, left_gain))
+            right.append((index * interval, right_gain))
+        event(
+            'crossfader.fade', 'Fading from %d to %d over %.2f seconds.',
+            start, position, time, start=start, position=position, time=time
+        )
+        self.position = position
+        self.left.fade_gain(left)
+        self.right.fade_gain(right)
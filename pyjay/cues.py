@@ -0,0 +1,28 @@
+"""Hot cues and loop points, saved per track."""
+
+from attr import attrs, attrib, Factory
+from .cache import JSONCache, cache_dir, track_key
+
+
+def empty_marks():
+    """Return the marks of a track which has none: no hot cues, and no loop.
+
+    Cues map slot numbers (as strings, so they survive JSON) to seconds, and
+    loop is a list of start and end seconds, either of which may be None."""
+    return dict(cues={}, loop=[None, None])
+
+
+@attrs
+class CueCache(JSONCache):
+    """The hot cues and loop points of tracks. get returns empty marks for a
+    track which has none saved."""
+
+    directory = attrib(default=Factory(lambda: cache_dir('cues')))
+
+    def missing(self):
+        """Return empty marks, since nothing has been saved."""
+        return empty_marks()
+
+    def save(self, filename, marks):
+        """Save marks for filename."""
+        super().save(track_key(filename), marks)
@@ -1,11 +1,57 @@
 """Provides the Deck class."""
 
 import logging
+import os.path
+import time
+from bisect import bisect_left
+from collections import deque
+from queue import Queue
+from threading import Thread, Lock, RLock
 from attr import attrs, attrib, Factory
-from sound_lib.stream import FileStream, URLStream
+from sound_lib.backends import load_backend
+from .cues import empty_marks
+from .events import event
 
 logger = logging.getLogger(__name__)
 
+# Seconds between updates of an automated attribute, about one mixer block.
+automation_interval = 1024 / 44100
+
+# The deck attributes which are passed on to the stream, mapped to the names
+# the stream knows them by. Tempo and pitch only exist on Tempo streams.
+stream_attributes = {
+    'volume': 'volume',
+    'pan': 'pan',
+    'frequency': 'frequency',
+    'tempo': 'tempo',
+    'pitch': 'tempo_pitch',
+}
+
+# Stands in for the handoff sync while arm_handoff is setting it, so no other
+# thread sets one too.
+arming = object()
+
+
+def stream_format(stream):
+    """Return the byte rate, frame size and length in bytes of stream."""
+    info = stream.get_info()
+    bytes_per_second = stream.seconds_to_bytes(1.0)
+    frame_size = max(1, bytes_per_second // int(info.freq))
+    return bytes_per_second, frame_size, stream.get_length()
+
+
+def open_stream(backend, filename, url=False, data=None):
+    """Open a decoding stream on backend. If data is given, it is the contents
+    of filename, already read into memory."""
+    if url:
+        return backend.URLStream(url=filename, decode=True)
+    elif data is not None:
+        return backend.FileStream(
+            mem=True, file=data, length=len(data), decode=True
+        )
+    else:
+        return backend.FileStream(file=filename, decode=True)
+
 
 @attrs
 class Deck:
@@ -15,9 +61,44 @@ class Deck:
     url = attrib(default=Factory(lambda: False))
     stream = attrib(default=Factory(lambda: None))
     paused = attrib(default=Factory(lambda: True))
+    backend = attrib(default=Factory(lambda: load_backend('bass')), repr=False)
+    mixer = attrib(default=Factory(lambda: None), repr=False)
+    overviews = attrib(default=Factory(lambda: None), repr=False)
+    analyses = attrib(default=Factory(lambda: None), repr=False)
+    cues = attrib(default=Factory(lambda: None), repr=False)
+    overlap = attrib(default=Factory(float))
+    keylock = attrib(default=Factory(lambda: False))
+    quick_tempo = attrib(default=Factory(lambda: False))
+    on_handoff = attrib(default=Factory(lambda: None), repr=False)
+    call_after = attrib(default=Factory(lambda: None), repr=False)
 
     def __attrs_post_init__(self):
         self.log_attribute('name')
+        self.gain = 1.0
+        self.overview = None
+        # The hot cues and loop of the loaded track, read from self.cues the
+        # first time they are needed.
+        self.marks = None
+        self.looping = False
+        self.automations = {}
+        # Worked out once per stream by cache_format.
+        self.length = 0
+        self.bytes_per_second = 0
+        self.frame_size = 1
+        # Tracks waiting to play after the current one. The first is taken
+        # off as next_filename and opened in the background as next_stream.
+        self.queue = deque()
+        self.queue_lock = RLock()
+        self.queue_generation = 0
+        self.next_filename = None
+        self.next_stream = None
+        self.next_format = None
+        self.handoff_sync = None
+        # Work handed off the mixer's thread, when call_after isn't given.
+        self.tasks = None
+        if self.mixer is None:
+            self.mixer = self.backend.Mixer()
+            self.mixer.play()
         self.reset()
 
     def reset(self):
@@ -25,13 +106,15 @@ class Deck:
         self.set_volume(1.0)
         self.set_pan(0.0)
         self.set_frequency(44100.0)
+        self.set_tempo(0.0)
+        self.set_pitch(0.0)
 
     def play(self):
         """Unpause the deck."""
         logger.info('Playing %s.', self)
         self.paused = False
         if self.stream:
-            self.stream.play()
+            self.mixer.set_channel_paused(self.stream, False)
         else:
             logger.info('Not playing with no stream.')
 
@@ -40,7 +123,7 @@ class Deck:
         logger.info('Pausing %s.', self)
         self.paused = True
         if self.stream:
-            self.stream.pause()
+            self.mixer.set_channel_paused(self.stream, True)
 
     def play_pause(self):
         """Toggles between play and pause."""
@@ -49,88 +132,871 @@ class Deck:
         else:
             self.pause()
 
-    def set_stream(self, filename, url=False):
+    def set_stream(self, filename, url=False, stream=None):
         """Load a stream from the provided filename. If url is True, load a
-        URL."""
+        URL. If stream is given, it has already been opened (by a Preloader)
+        and is used as is.
+
+        The stream is opened in decode mode and plugged into self.mixer, which
+        is the only channel that actually plays."""
+        if stream is None:
+            stream = open_stream(self.backend, filename, url=url)
+        stream = self.wrap_stream(stream)
+        self.clear_stream()
         self.url = url
-        if url:
-            self.stream = URLStream(
-                url=filename
-            )
-        else:
-            self.stream = FileStream(
-                file=filename
-            )
+        self.stream = stream
         self.filename = filename
+        self.cache_format()
         self.log_attribute('filename')
+        self.overview = None
+        self.marks = None
+        self.looping = False
+        self.get_overview()
         self.set_volume(self.volume)
         self.set_pan(self.pan)
         self.set_frequency(self.frequency)
-        if not self.paused:
-            self.play()
+        self.set_tempo(self.tempo)
+        self.set_pitch(self.pitch)
+        self.mixer.add_channel(self.stream, paused=self.paused)
+        self.set_gain(self.gain)
+        self.arm_handoff()
+
+    def clear_stream(self):
+        """Unplug and free the current stream, if any."""
+        # The mixer is not called with the queue lock held, since a handoff
+        # may be waiting for the lock on the mixer's thread.
+        with self.queue_lock:
+            stream = self.stream
+            self.stream = None
+            # Removing the stream from the mixer removes its syncs too.
+            self.handoff_sync = None
+        if stream is not None:
+            self.mixer.remove_channel(stream)
+            stream.free()
+
+    def set_mixer(self, mixer):
+        """Move this deck onto a new mixer. The current stream is forgotten
+        rather than freed, since it died with the old output device, and the
+        next track in the queue is opened again."""
+        with self.queue_lock:
+            self.mixer = mixer
+            self.stream = None
+            self.handoff_sync = None
+            if self.next_filename is not None:
+                self.queue.appendleft(self.next_filename)
+            self.next_filename = None
+            self.next_stream = None
+            self.next_format = None
+            self.queue_generation += 1
+        self.prepare_next()
+
+    def get_queue(self):
+        """Return a list of the tracks waiting to play, in order."""
+        with self.queue_lock:
+            queue = list(self.queue)
+            if self.next_filename is not None:
+                queue.insert(0, self.next_filename)
+            return queue
+
+    def enqueue(self, filename):
+        """Add filename to the end of the queue.
+
+        The first track in the queue is opened in the background, and the
+        mixer switches to it the moment the current track ends, or overlap
+        seconds before, fading between the two."""
+        with self.queue_lock:
+            self.queue.append(filename)
+        self.prepare_next()
+
+    def clear_queue(self):
+        """Empty the queue, so the current track is the last."""
+        with self.queue_lock:
+            self.queue.clear()
+            self.queue_generation += 1
+            sync = self.handoff_sync
+            self.handoff_sync = None
+            stream = self.next_stream
+            self.next_stream = None
+            self.next_filename = None
+            self.next_format = None
+        # While the sync is being set, arm_handoff removes it itself.
+        if sync is not None and sync is not arming:
+            try:
+                self.mixer.remove_channel_sync(sync)
+            except self.backend.Error:
+                # The handoff fired while the queue was being cleared.
+                pass
+        if stream is not None:
+            stream.free()
+
+    def prepare_next(self):
+        """Start opening the first track in the queue on another thread, if
+        it isn't open or opening already."""
+        with self.queue_lock:
+            if self.next_filename is not None or not self.queue:
+                return
+            filename = self.queue.popleft()
+            self.next_filename = filename
+            generation = self.queue_generation
+        Thread(
+            target=self.open_next, args=[filename, generation], daemon=True
+        ).start()
+
+    def open_next(self, filename, generation):
+        """Open filename as the next stream, and work out everything the
+        handoff needs, so the mixer's thread has nothing left to ask the
+        stream. Runs on its own thread."""
+        try:
+            stream = self.wrap_stream(open_stream(self.backend, filename))
+            format = stream_format(stream)
+        except Exception as e:
+            logger.warning('Could not open queued track %s: %s', filename, e)
+            stream = None
+        with self.queue_lock:
+            if generation != self.queue_generation:
+                # The queue was cleared or moved while the track was opening.
+                if stream is not None:
+                    stream.free()
+                return
+            if stream is None:
+                self.next_filename = None
+            else:
+                # Set under the lock, so set_attribute can't change one in
+                # between. The stream isn't in the mixer yet.
+                self.apply_attributes(stream)
+                self.next_stream = stream
+                self.next_format = format
+        if stream is None:
+            self.prepare_next()
+        else:
+            self.arm_handoff()
+
+    def apply_attributes(self, stream):
+        """Give stream this deck's volume, pan, frequency, tempo and
+        pitch."""
+        for attr, name in stream_attributes.items():
+            if name in stream.attribute_mapping:
+                stream.set_attribute(name, getattr(self, attr))
+
+    def arm_handoff(self):
+        """Set the mixer sync which starts the next stream, if it is open and
+        the sync isn't set already.
+
+        The mixer is not called with the queue lock held, since a handoff may
+        be waiting for the lock on the mixer's thread. So the sync is claimed
+        under the lock, set without it, and kept only if nothing has changed
+        in the meantime."""
+        with self.queue_lock:
+            if self.stream is None or self.next_stream is None or \
+               self.handoff_sync is not None:
+                return
+            stream = self.stream
+            length = self.length
+            generation = self.queue_generation
+            self.handoff_sync = arming
+        if self.overlap > 0:
+            position = max(
+                0, length - int(self.overlap * self.bytes_per_second)
+            )
+            position -= position % self.frame_size
+            kind = 'position'
+        else:
+            position = 0
+            kind = 'end'
+        try:
+            sync = self.mixer.set_channel_sync(
+                stream, kind, position, self.handoff, onetime=True
+            )
+        except self.backend.Error as e:
+            # The stream was unplugged in the meantime.
+            logger.debug('Could not set the handoff for %s: %s', self, e)
+            sync = None
+        with self.queue_lock:
+            if self.handoff_sync is arming and self.stream is stream and \
+               self.queue_generation == generation:
+                self.handoff_sync = sync
+                return
+            if self.handoff_sync is arming:
+                self.handoff_sync = None
+        if sync is not None:
+            try:
+                self.mixer.remove_channel_sync(sync)
+            except self.backend.Error:
+                pass  # It has fired already, or went with its stream.
 
-    def set_volume(self, value):
+    def handoff(self, channel):
+        """Start the next stream in place of channel. Called by the mixer
+        as it renders the end of channel (or the start of the overlap), so the
+        next track starts on that sample.
+
+        Only the swap happens here: the next stream was opened, measured and
+        given its attributes by open_next. Everything else is left to
+        after_handoff, away from the mixer's thread."""
+        with self.queue_lock:
+            if channel is not self.stream or self.next_stream is None:
+                return
+            old = self.stream
+            self.stream = self.next_stream
+            self.filename = self.next_filename
+            self.url = False
+            self.bytes_per_second, self.frame_size, self.length = \
+                self.next_format
+            self.next_stream = None
+            self.next_filename = None
+            self.next_format = None
+            self.handoff_sync = None
+            self.overview = None
+            self.marks = None
+            self.looping = False
+            self.mixer.add_channel(self.stream, paused=self.paused)
+            if self.overlap > 0:
+                # Both fades are envelopes, so the mixer works them out
+                # sample by sample.
+                self.fade_gain([(0.0, 0.0), (self.overlap, self.gain)])
+                self.mixer.set_channel_envelope(
+                    old, 'volume', [
+                        (0, self.gain),
+                        (self.mixer.seconds_to_bytes(self.overlap), 0.0)
+                    ]
+                )
+                self.mixer.set_channel_envelope_position(old, 'volume', 0)
+            else:
+                self.set_gain(self.gain)
+        self.defer(self.after_handoff, old)
+
+    def after_handoff(self, old):
+        """Finish a handoff from old: log the new track, start opening the
+        one after it, and retire old once it has faded out."""
+        self.log_attribute('filename')
+        self.prepare_next()
+        if self.overlap <= 0:
+            return self.finish_handoff(old)
+        try:
+            sync = self.mixer.set_channel_sync(
+                old, 'end', 0,
+                lambda channel: self.defer(self.finish_handoff, channel),
+                onetime=True
+            )
+        except self.backend.Error:
+            # Old went with the mixer it was plugged into.
+            return self.finish_handoff(old)
+        if old.get_position() >= old.get_length():
+            # It ended before the sync was set, so the sync will never fire,
+            # unless it just has.
+            try:
+                self.mixer.remove_channel_sync(sync)
+            except self.backend.Error:
+                return
+            self.finish_handoff(old)
+
+    def finish_handoff(self, old):
+        """The previous stream has finished, so hand it to on_handoff to be
+        retired, or retire it now if there is no on_handoff."""
+        if self.on_handoff is None:
+            self.retire(old)
+        else:
+            self.on_handoff(self, old)
+
+    def defer(self, func, *args):
+        """Call func(*args) away from the mixer's thread: with call_after if
+        it was given, or on a worker thread of this deck's otherwise."""
+        if self.call_after is not None:
+            return self.call_after(func, *args)
+        if self.tasks is None:
+            self.tasks = Queue()
+            Thread(target=self.run_tasks, daemon=True).start()
+        self.tasks.put((func, args))
+
+    def run_tasks(self):
+        """Run the calls passed to defer, in order. Runs on its own
+        thread."""
+        while True:
+            func, args = self.tasks.get()
+            try:
+                func(*args)
+            except Exception:
+                logger.exception('Error in deferred call to %r.', func)
+
+    def retire(self, old):
+        """Unplug and free a stream which has been handed off."""
+        if old in self.mixer.sources:
+            self.mixer.remove_channel(old)
+        old.free()
+
+    def wrap_stream(self, stream):
+        """Return stream run through a Tempo stream if keylock is on, so its
+        tempo and pitch can be changed apart. If the backend can't do that,
+        stream is returned as it is."""
+        if not self.keylock:
+            return stream
+        tempo = getattr(self.backend, 'Tempo', None)
+        if tempo is None:
+            logger.warning(
+                'Keylock is not available with the %s backend.',
+                self.backend.__name__
+            )
+            return stream
+        # Freeing the tempo stream frees the stream it reads from.
+        stream = tempo(stream, decode=True, free_source=True)
+        stream.set_quality(use_quick_algorithm=self.quick_tempo)
+        return stream
+
+    def has_tempo(self):
+        """Return whether the tempo and pitch of the loaded track can be
+        changed."""
+        return bool(self.stream) and 'tempo' in self.stream.attribute_mapping
+
+    def get_overview(self):
+        """Return the Overview of the loaded track, or None if the track is a
+        URL or its overview has not been generated yet. Only the cache is
+        consulted, so this never decodes anything."""
+        if self.overview is None and self.overviews is not None and \
+           self.filename is not None and not self.url:
+            self.overview = self.overviews.get(self.filename)
+        return self.overview
+
+    def get_analysis(self):
+        """Return the tempo and beats of the loaded track, or None if it has
+        not been analysed."""
+        if self.analyses is None or self.filename is None or self.url:
+            return None
+        return self.analyses.get(self.filename)
+
+    def get_bpm(self):
+        """Return the tempo of the loaded track at the current frequency, or
+        None if it has not been analysed."""
+        analysis = self.get_analysis()
+        if analysis is None:
+            return None
+        bpm = analysis['bpm'] * self.frequency / analysis['frequency']
+        if self.has_tempo():
+            bpm *= 1.0 + self.tempo / 100.0
+        return bpm
+
+    def normalise(self, attr, value):
+        """Return value clamped to the range allowed for attr."""
+        if attr == 'volume':
+            if value > 1.0:
+                value = 1.0
+            elif value < 0.0:
+                value = 0.0
+        elif attr == 'pan':
+            if value > 1.0:
+                value = 1.0
+            elif value < -1.0:
+                value = -1.0
+        elif attr == 'frequency':
+            if value > 200000.0:
+                value = 100000.0
+            elif value < 100.0:
+                value = 10.0
+        elif attr == 'tempo':
+            value = max(-50.0, min(100.0, value))
+        elif attr == 'pitch':
+            value = max(-12.0, min(12.0, value))
+        return value
+
+    def set_attribute(
+        self, attr, value, log=True, ramp=0.0, automated=False
+    ):
+        """Normalises value and sets it. If ramp is given, the stream slides
+        to the new value over that many seconds.
+
+        Unless automated is True, any automation of attr is dropped, so a
+        gesture in progress can't overwrite the new value."""
+        if not automated:
+            self.automations.pop(attr, None)
+        value = self.normalise(attr, value)
+        setattr(self, attr, value)
+        if log:
+            self.log_attribute(attr)
+        name = stream_attributes[attr]
+        if self.stream and name in self.stream.attribute_mapping:
+            if ramp:
+                self.stream.slide_attribute(name, value, ramp)
+            else:
+                self.stream.set_attribute(name, value)
+        with self.queue_lock:
+            # The next track starts with the same settings.
+            if self.next_stream is not None and \
+               name in self.next_stream.attribute_mapping:
+                self.next_stream.set_attribute(name, value)
+
+    def set_volume(self, value, log=True, ramp=0.0):
         """Normalises value and sets it."""
-        if value > 1.0:
-            value = 1.0
-        elif value < 0.0:
-            value = 0.0
-        self.volume = value
-        self.log_attribute('volume')
-        if self.stream:
-            self.stream.set_volume(value)
+        self.set_attribute('volume', value, log=log, ramp=ramp)
 
-    def set_pan(self, value):
+    def set_pan(self, value, log=True, ramp=0.0):
         """Normalises the value and sets it."""
-        if value > 1.0:
-            value = 1.0
-        elif value < -1.0:
-            value = -1.0
-        self.pan = value
-        self.log_attribute('pan')
-        if self.stream:
-            self.stream.set_pan(value)
+        self.set_attribute('pan', value, log=log, ramp=ramp)
 
-    def set_frequency(self, value):
+    def set_frequency(self, value, log=True, ramp=0.0):
         """Normalises the value and sets it."""
-        if value > 200000.0:
-            value = 100000.0
-        elif value < 100.0:
-            value = 10.0
-        self.frequency = value
-        self.log_attribute('frequency')
+        self.set_attribute('frequency', value, log=log, ramp=ramp)
+
+    def set_tempo(self, value, log=True, ramp=0.0):
+        """Normalises the value and sets it. Tempo is a percentage change
+        which leaves the pitch alone, and only works with keylock on."""
+        self.set_attribute('tempo', value, log=log, ramp=ramp)
+
+    def set_pitch(self, value, log=True, ramp=0.0):
+        """Normalises the value and sets it. Pitch is in semitones, leaves
+        the tempo alone, and only works with keylock on."""
+        self.set_attribute('pitch', value, log=log, ramp=ramp)
+
+    def automate(self, attr, amount):
+        """Move attr by amount as part of a gesture such as a held key, and
+        return the new value. See ParameterAutomation."""
+        automation = self.automations.get(attr)
+        if automation is None:
+            automation = ParameterAutomation(self, attr)
+            self.automations[attr] = automation
+        return automation.change(amount)
+
+    def poll_automations(self, now=None):
+        """Let every automation catch up. Must be called regularly, on the
+        thread which calls automate."""
+        if now is None:
+            now = time.monotonic()
+        for attr, automation in list(self.automations.items()):
+            if not automation.poll(now):
+                del self.automations[attr]
+
+    def set_gain(self, value):
+        """Set the crossfader gain, which the mixer applies on top of the
+        volume."""
+        self.fade_gain([(0.0, value)])
+
+    def fade_gain(self, nodes):
+        """Make the crossfader gain follow nodes, a list of (seconds, gain)
+        pairs starting now. The last gain is held once the fade is over."""
+        self.gain = nodes[-1][1]
         if self.stream:
-            self.stream.set_frequency(value)
+            mixer = self.mixer
+            mixer.set_channel_envelope(
+                self.stream, 'volume',
+                [(mixer.seconds_to_bytes(t), gain) for t, gain in nodes]
+            )
+            mixer.set_channel_envelope_position(self.stream, 'volume', 0)
 
     def log_attribute(self, attr):
-        """Logs the changing of self.attr."""
-        logger.info(
-            'Setting %s for %s to %r.',
-            attr,
-            self,
-            getattr(
-                self,
-                attr
-            )
+        """Logs the changing of self.attr as a deck event."""
+        value = getattr(self, attr)
+        event(
+            'deck.' + attr, 'Setting %s for %s to %r.', attr, self.name, value,
+            deck=self.name, value=value
         )
 
     def get_position(self):
         """Get the play position of the stream."""
         if self.stream:
-            return self.stream.get_position()
+            return self.mixer.get_channel_position(self.stream)
         else:
             return 0
 
+    def cache_format(self):
+        """Work out the length, byte rate and frame size of the stream once,
+        so seeking doesn't need to ask the engine."""
+        self.bytes_per_second, self.frame_size, self.length = stream_format(
+            self.stream
+        )
+
+    def get_length(self):
+        """Return the length of the stream in bytes. URL streams are asked
+        every time, since their length can change as they download."""
+        if not self.stream:
+            return 0
+        if self.url:
+            return self.stream.get_length()
+        return self.length
+
     def seek(self, amount, absolute=False):
-        """Set the playback position."""
+        """Set the playback position in bytes, snapped to the start of a
+        frame."""
         if self.stream:
             if not absolute:
-                amount = self.stream.get_position() + amount
-            if amount < 0:
-                amount = 0
-            if amount > self.stream.get_length():
-                amount = self.stream.get_length() - 1
-            self.stream.set_position(amount)
+                amount = self.get_position() + amount
+            amount = min(amount, self.get_length() - self.frame_size)
+            amount = max(0, amount - amount % self.frame_size)
+            self.mixer.set_channel_position(self.stream, amount)
+
+    def seek_seconds(self, seconds, absolute=False):
+        """Seek by seconds of the track, or to seconds if absolute is
+        True."""
+        if self.stream:
+            self.seek(self.snap_seconds(seconds), absolute=absolute)
+
+    def seek_beats(self, beats):
+        """Seek forwards (or backwards if beats is negative) by beats at the
+        analysed tempo of the track, landing on the nearest detected beat.
+        Returns False if the track has not been analysed."""
+        analysis = self.get_analysis()
+        if not self.stream or analysis is None or not analysis['bpm']:
+            return False
+        now = self.get_position() / self.bytes_per_second
+        target = now + beats * 60.0 / analysis['bpm']
+        grid = analysis['beats']
+        if grid:
+            index = bisect_left(grid, target)
+            nearby = grid[max(0, index - 1):index + 1]
+            target = min(nearby, key=lambda beat: abs(beat - target))
+        self.seek_seconds(target, absolute=True)
+        return True
+
+    def get_marks(self):
+        """Return the hot cues and loop of the loaded track. See
+        cues.empty_marks."""
+        if self.marks is None:
+            if self.cues is None or self.filename is None or self.url:
+                self.marks = empty_marks()
+            else:
+                self.marks = self.cues.get(self.filename)
+        return self.marks
+
+    def save_marks(self):
+        """Save the marks of the loaded track, unless it is a URL."""
+        if self.cues is not None and self.filename is not None and \
+           not self.url:
+            try:
+                self.cues.save(self.filename, self.get_marks())
+            except OSError as e:
+                logger.warning(
+                    'Could not save cues for %s: %s', self.filename, e
+                )
+
+    def snap_seconds(self, seconds):
+        """Return seconds as a byte position on the start of a frame."""
+        frames = int(round(seconds * self.bytes_per_second / self.frame_size))
+        return frames * self.frame_size
+
+    def get_seconds(self):
+        """Return the play position in seconds."""
+        return self.get_position() / self.bytes_per_second
+
+    def set_cue(self, slot):
+        """Put hot cue slot at the play position, and return the position in
+        seconds, or None if there is no stream."""
+        if not self.stream:
+            return None
+        seconds = self.get_seconds()
+        self.get_marks()['cues'][str(slot)] = seconds
+        self.save_marks()
+        event(
+            'deck.cue', 'Setting cue %d for %s to %.3f.', slot, self.name,
+            seconds, deck=self.name, slot=slot, value=seconds
+        )
+        return seconds
+
+    def jump_to_cue(self, slot):
+        """Seek to hot cue slot, and return its position in seconds, or None
+        if it has not been set. The mixer drops what it has buffered, so the
+        cue is heard within one buffer."""
+        seconds = self.get_marks()['cues'].get(str(slot))
+        if not self.stream or seconds is None:
+            return None
+        self.seek_seconds(seconds, absolute=True)
+        return seconds
+
+    def loop_in(self):
+        """Start the loop at the play position. Returns the position in
+        seconds, or None if there is no stream."""
+        if not self.stream:
+            return None
+        seconds = self.get_seconds()
+        loop = self.get_marks()['loop']
+        loop[0] = seconds
+        if loop[1] is not None and loop[1] <= seconds:
+            loop[1] = None
+        self.save_marks()
+        if self.looping:
+            self.set_looping(loop[1] is not None)
+        return seconds
+
+    def loop_out(self):
+        """End the loop at the play position and start looping. Returns the
+        position in seconds, or None if there is no stream or the position is
+        not after the loop start."""
+        loop = self.get_marks()['loop']
+        if not self.stream or loop[0] is None:
+            return None
+        seconds = self.get_seconds()
+        if seconds <= loop[0]:
+            return None
+        loop[1] = seconds
+        self.save_marks()
+        self.set_looping(True)
+        return seconds
+
+    def set_looping(self, looping):
+        """Turn looping between the loop points on or off, and return whether
+        the deck is now looping. The engine jumps back to the loop start by
+        itself, so nothing runs in Python while the loop plays."""
+        start, end = self.get_marks()['loop']
+        if not self.stream or start is None or end is None:
+            looping = False
+        if looping:
+            start = self.snap_seconds(start)
+            end = self.snap_seconds(end)
+            self.stream.set_loop_points(start, end)
+            self.stream.looping = True
+            # The engine only wraps when it decodes past the end, so jump into
+            # the loop if the stream has already been decoded past it.
+            if not start <= self.stream.get_position() < end:
+                self.seek(start, absolute=True)
+        elif self.stream:
+            self.stream.looping = False
+        self.looping = looping
+        event(
+            'deck.looping', 'Setting looping for %s to %r.', self.name,
+            looping, deck=self.name, value=looping
+        )
+        return looping
+
+    def toggle_loop(self):
+        """Turn looping on or off, and return whether the deck is now
+        looping."""
+        return self.set_looping(not self.looping)
 
     def __str__(self):
         return self.name
+
+
+@attrs
+class Preload:
+    """A stream being opened ahead of time for a deck."""
+    deck = attrib(repr=False)
+    filename = attrib()
+    url = attrib(default=Factory(lambda: False))
+    callback = attrib(default=Factory(lambda: None), repr=False)
+    stream = attrib(default=Factory(lambda: None), repr=False)
+    size = attrib(default=Factory(int))
+    error = attrib(default=Factory(lambda: None))
+    cancelled = attrib(default=Factory(lambda: False))
+    created = attrib(default=Factory(time.monotonic), repr=False)
+
+
+@attrs
+class Preloader:
+    """Opens streams on a worker thread, so that loading a deck never blocks
+    the interface.
+
+    If overviews is an OverviewCache, an overview of each file is generated
+    once its stream has been handed over, if there isn't one already.
+
+    Files are read into memory while the in-memory preloads fit within budget
+    bytes, and opened from disk otherwise. A preload goes stale when another
+    one is requested for the same deck, or when it has waited longer than
+    max_age seconds without being taken, and stale streams are freed."""
+
+    backend = attrib(default=Factory(lambda: load_backend('bass')), repr=False)
+    budget = attrib(default=Factory(lambda: 256 * 1024 * 1024))
+    max_age = attrib(default=Factory(lambda: 300.0))
+    overviews = attrib(default=Factory(lambda: None), repr=False)
+    used = attrib(default=Factory(int), init=False)
+    preloads = attrib(default=Factory(dict), init=False, repr=False)
+    queue = attrib(default=Factory(Queue), init=False, repr=False)
+    lock = attrib(default=Factory(Lock), init=False, repr=False)
+    thread = attrib(default=Factory(lambda: None), init=False, repr=False)
+
+    def preload(self, deck, filename, url=False, callback=None):
+        """Start opening filename for deck, replacing any earlier preload for
+        the same deck.
+
+        If filename is callable, it is called on the worker thread with no
+        arguments and should return the real filename or URL, so that any
+        network round trips needed to find it don't block either.
+
+        When the stream is open (or has failed to open), callback is called on
+        the worker thread with the Preload instance."""
+        preload = Preload(deck, filename, url=url, callback=callback)
+        with self.lock:
+            self.cancel(deck)
+            self.preloads[deck.name] = preload
+        self.expire()
+        if self.thread is None:
+            self.thread = Thread(target=self.work, daemon=True)
+            self.thread.start()
+        self.queue.put(preload)
+        return preload
+
+    def take(self, deck, preload=None):
+        """Return the finished preload for deck, or None if there isn't one.
+        If preload is given, it is only returned if it is still the current
+        one. The caller becomes responsible for the stream."""
+        self.expire()
+        with self.lock:
+            current = self.preloads.get(deck.name)
+            if current is None or (
+                current.stream is None and current.error is None
+            ) or (preload is not None and current is not preload):
+                return None
+            preload = current
+            del self.preloads[deck.name]
+            self.release(preload)
+        return preload
+
+    def cancel(self, deck):
+        """Forget the preload for deck, freeing its stream if it has one. Must
+        be called with self.lock held."""
+        preload = self.preloads.pop(deck.name, None)
+        if preload is not None:
+            preload.cancelled = True
+            self.discard(preload)
+
+    def expire(self):
+        """Free any preloads which have waited too long to be taken."""
+        now = time.monotonic()
+        with self.lock:
+            for name, preload in list(self.preloads.items()):
+                if preload.stream is not None and \
+                   now - preload.created > self.max_age:
+                    logger.info('Dropping stale preload %r.', preload)
+                    preload.cancelled = True
+                    del self.preloads[name]
+                    self.discard(preload)
+
+    def discard(self, preload):
+        """Free the stream of a preload which will never be taken. Must be
+        called with self.lock held."""
+        self.release(preload)
+        if preload.stream is not None:
+            preload.stream.free()
+            preload.stream = None
+
+    def release(self, preload):
+        """Stop counting preload against the budget. Must be called with
+        self.lock held."""
+        self.used -= preload.size
+        preload.size = 0
+
+    def work(self):
+        """Open queued preloads forever."""
+        while True:
+            preload = self.queue.get()
+            if preload.cancelled:
+                continue
+            started = time.monotonic()
+            try:
+                self.open(preload)
+            except Exception as e:
+                preload.error = e
+            preload.created = time.monotonic()
+            with self.lock:
+                if preload.cancelled:
+                    self.discard(preload)
+                    continue
+            logger.info(
+                'Preloaded %r in %.3f seconds.', preload,
+                time.monotonic() - started
+            )
+            if preload.callback is not None:
+                preload.callback(preload)
+            if self.overviews is not None and preload.error is None and \
+               not preload.url:
+                try:
+                    self.overviews.load(preload.filename, self.backend)
+                except Exception as e:
+                    logger.warning(
+                        'Could not generate an overview of %s: %s',
+                        preload.filename, e
+                    )
+
+    def open(self, preload):
+        """Open the stream for preload."""
+        if callable(preload.filename):
+            preload.filename = preload.filename()
+        data = None
+        if not preload.url:
+            size = os.path.getsize(preload.filename)
+            with self.lock:
+                fits = self.used + size <= self.budget
+                if fits:
+                    self.used += size
+                    preload.size = size
+            if fits:
+                try:
+                    with open(preload.filename, 'rb') as f:
+                        data = f.read()
+                except Exception:
+                    with self.lock:
+                        self.release(preload)
+                    raise
+            else:
+                logger.info(
+                    'Opening %s from disk, as it would take the preloads '
+                    'over budget.', preload.filename
+                )
+        try:
+            preload.stream = open_stream(
+                self.backend, preload.filename, url=preload.url, data=data
+            )
+        except Exception:
+            with self.lock:
+                self.release(preload)
+            raise
+
+
+@attrs
+class ParameterAutomation:
+    """Turns a burst of changes to one attribute of a deck, such as the key
+    repeats from a held key, into a smooth ramp.
+
+    Every change moves the target straight away, but the stream is updated at
+    most once per interval (about one mixer block), sliding to the latest
+    target. A change which arrives too soon is applied by poll, which also
+    logs the change once no more have arrived for settle seconds.
+
+    No timers or threads are used: the interface calls Deck.poll_automations
+    from one timer of its own, on the same thread as the key presses."""
+
+    deck = attrib(repr=False)
+    attribute = attrib()
+    interval = attrib(default=Factory(lambda: automation_interval))
+    settle = attrib(default=Factory(lambda: 0.5))
+    target = attrib(default=Factory(lambda: None), init=False)
+    pending = attrib(default=Factory(lambda: False), init=False)
+    next_update = attrib(default=Factory(float), init=False, repr=False)
+    settle_at = attrib(default=Factory(lambda: None), init=False, repr=False)
+
+    def change(self, amount, now=None):
+        """Move the target by amount, and return the new target."""
+        if now is None:
+            now = time.monotonic()
+        if self.target is None:
+            self.target = getattr(self.deck, self.attribute)
+        self.target = self.deck.normalise(
+            self.attribute, self.target + amount
+        )
+        if now >= self.next_update:
+            self.apply(now)
+        else:
+            self.pending = True
+        self.settle_at = now + self.settle
+        return self.target
+
+    def apply(self, now):
+        """Slide the stream to the target."""
+        self.pending = False
+        self.next_update = now + self.interval
+        self.deck.set_attribute(
+            self.attribute, self.target, log=False, ramp=self.interval,
+            automated=True
+        )
+
+    def poll(self, now):
+        """Apply a target which arrived too soon after the last update, and
+        finish once the gesture is over. Returns False when finished."""
+        if self.pending and now >= self.next_update:
+            self.apply(now)
+        if self.settle_at is not None and now >= self.settle_at:
+            if self.pending:
+                self.apply(now)
+            self.finish()
+            return False
+        return True
+
+    def finish(self):
+        """The gesture is over, so log where it ended up."""
+        self.settle_at = None
+        self.target = None
+        self.deck.log_attribute(self.attribute)
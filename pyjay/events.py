@@ -0,0 +1,119 @@
+"""Structured events for deck state changes, and a logging pipeline which keeps
+log writes off the interface thread.
+
+Events are ordinary log records on the pyjay.events logger, with a category
+and a dictionary of fields attached, so they read the same as before in a
+plain log file, and can also be written as JSON lines and sampled by
+category."""
+
+import json
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+
+def event(category, message, *args, **fields):
+    """Log message % args as an event in category, with fields attached for
+    the JSON lines log. Costs nothing but a level check if events are not
+    being logged."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            message, *args, extra=dict(category=category, fields=fields)
+        )
+
+
+class JSONLinesFormatter(logging.Formatter):
+    """Formats each event as a line of JSON. Records which are not events are
+    written with their message."""
+
+    def format(self, record):
+        data = dict(time=round(record.created, 6))
+        category = getattr(record, 'category', None)
+        if category is None:
+            data.update(
+                level=record.levelname, logger=record.name,
+                message=record.getMessage()
+            )
+        else:
+            data.update(category=category, **record.fields)
+        return json.dumps(data, separators=(',', ':'), default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Only lets through one in every rates[category] events of each category.
+    Records which are not events, and categories without a rate, always get
+    through."""
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+        self.counts = {}
+        self.lock = Lock()
+
+    def filter(self, record):
+        rate = self.rates.get(getattr(record, 'category', None))
+        if not rate or rate <= 1:
+            return True
+        with self.lock:
+            count = self.counts.get(record.category, 0)
+            self.counts[record.category] = count + 1
+        return count % rate == 0
+
+
+def parse_rates(specifications):
+    """Turn strings like 'deck.frequency=10' into a dictionary of sampling
+    rates."""
+    rates = {}
+    for specification in specifications:
+        category, _, rate = specification.partition('=')
+        rates[category] = int(rate)
+    return rates
+
+
+class EventsOnly(logging.Filter):
+    """Only lets events through."""
+
+    def filter(self, record):
+        return hasattr(record, 'category')
+
+
+class DeferredQueueHandler(QueueHandler):
+    """A QueueHandler which leaves formatting to the listener thread.
+
+    The standard handler formats every message before queueing it. Here that
+    only happens for records carrying an exception, whose traceback can't
+    wait. Everything else is queued as is, so arguments should not change
+    after they are logged."""
+
+    def prepare(self, record):
+        if record.exc_info:
+            return super().prepare(record)
+        return record
+
+
+def start_logging(handlers, event_handlers=(), rates=None):
+    """Send every record through a queue to handlers on a listener thread, so
+    logging never waits for a write. Events also go to event_handlers.
+
+    If rates is given, events are sampled according to it before they are
+    queued. Returns the listener, which should be stopped at exit so the queue
+    is flushed."""
+    handlers = list(handlers)
+    queue = SimpleQueue()
+    handler = DeferredQueueHandler(queue)
+    if rates:
+        handler.addFilter(SamplingFilter(rates))
+    root = logging.getLogger()
+    for old in root.handlers[:]:
+        root.removeHandler(old)
+    root.addHandler(handler)
+    for event_handler in event_handlers:
+        event_handler.addFilter(EventsOnly())
+    listener = QueueListener(
+        queue, *handlers, *event_handlers, respect_handler_level=True
+    )
+    listener.start()
+    return listener
@@ -0,0 +1,22 @@
+"""Compiles the commands' key bindings into a dispatch table."""
+
+from collections import namedtuple
+
+# What a key does, with the deck already looked up.
+Binding = namedtuple('Binding', ['command', 'action', 'deck', 'argument'])
+
+
+def compile_hotkeys(frame, instances):
+    """Return a dictionary mapping every key bound by instances to its
+    Binding, so a key press costs one lookup."""
+    hotkeys = {}
+    for cmd in instances:
+        for key, action, deck, argument in cmd.bindings:
+            if key in hotkeys:
+                raise RuntimeError(
+                    'Duplicate key %r from command %r.' % (key, cmd)
+                )
+            if deck is not None:
+                deck = getattr(frame, deck)
+            hotkeys[key] = Binding(cmd, action, deck, argument)
+    return hotkeys
@@ -0,0 +1,114 @@
+"""Keeps a copy of the request queue up to date in the background."""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from threading import Thread, Lock
+from attr import attrs, attrib, Factory
+
+logger = logging.getLogger(__name__)
+
+
+@attrs
+class RequestMirror:
+    """Follows the /events stream of the requests server on a thread of its
+    own, and keeps a copy of the queue which can be read at any time without
+    touching the network.
+
+    url is called before each connection, so changes to the configuration are
+    picked up when the stream next reconnects. If the connection drops, it is
+    tried again after retry seconds, doubling up to max_retry. Only the first
+    of a run of failures is logged as info, so a server which is down doesn't
+    fill the log."""
+
+    url = attrib(repr=False)
+    retry = attrib(default=Factory(lambda: 1.0))
+    max_retry = attrib(default=Factory(lambda: 60.0))
+    timeout = attrib(default=Factory(lambda: 60.0))
+    tracks = attrib(default=Factory(OrderedDict), init=False, repr=False)
+    synced = attrib(default=Factory(lambda: False), init=False)
+    version = attrib(default=Factory(lambda: None), init=False)
+    lock = attrib(default=Factory(Lock), init=False, repr=False)
+    thread = attrib(default=Factory(lambda: None), init=False, repr=False)
+
+    def start(self):
+        """Start following the stream."""
+        if self.thread is None:
+            self.thread = Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def get_requests(self):
+        """Return a list of the requests in the queue, oldest first, or None
+        if the mirror is not connected."""
+        with self.lock:
+            if not self.synced:
+                return None
+            return list(self.tracks.values())
+
+    def run(self):
+        """Connect to the stream again and again, forever."""
+        # Imported here, so it is loaded on this thread rather than at
+        # startup.
+        from requests import Session
+        session = Session()
+        delay = self.retry
+        failed = False
+        while True:
+            try:
+                self.follow(session)
+                delay = self.retry
+                failed = False
+            except Exception as e:
+                # A stream which was working is always worth a mention.
+                with self.lock:
+                    failed = failed and not self.synced
+                logger.log(
+                    logging.DEBUG if failed else logging.INFO,
+                    'Lost the request stream: %s', e
+                )
+                failed = True
+            with self.lock:
+                self.synced = False
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_retry)
+
+    def follow(self, session):
+        """Read events until the stream ends. The server sends a comment at
+        least every 15 seconds, so a connection which goes quiet for timeout
+        seconds is given up on."""
+        url = self.url() + '/events'
+        with session.get(url, stream=True, timeout=(10, self.timeout)) as r:
+            r.raise_for_status()
+            logger.info('Following requests from %s.', url)
+            event = data = version = None
+            for line in r.iter_lines(decode_unicode=True):
+                if line:
+                    field, _, value = line.partition(':')
+                    value = value[1:] if value.startswith(' ') else value
+                    if field == 'event':
+                        event = value
+                    elif field == 'data':
+                        data = value
+                    elif field == 'id':
+                        version = value
+                elif event is not None and data is not None:
+                    self.apply(event, json.loads(data), version)
+                    event = data = version = None
+
+    def apply(self, event, data, version):
+        """Apply an event from the stream to the copy of the queue."""
+        with self.lock:
+            if event == 'queue':
+                self.tracks.clear()
+                for track in data:
+                    self.tracks[track['id']] = track
+                self.synced = True
+            elif event == 'request-added':
+                self.tracks[data['id']] = data
+            elif event in ('request-deleted', 'request-played'):
+                self.tracks.pop(data['id'], None)
+            else:
+                logger.debug('Ignoring %s event.', event)
+                return
+            self.version = version
@@ -0,0 +1,58 @@
+"""Talking to the requests server."""
+
+from collections import OrderedDict
+from threading import Lock
+
+# Requests is imported when the session is first needed, so it doesn't slow
+# down startup.
+http_session = None
+http_lock = Lock()
+
+# The last body and ETag of each request made with fetch_json, least
+# recently used first. Only the newest http_cache_size are kept, since every
+# page of the queue is a different request.
+http_cache = OrderedDict()
+http_cache_size = 32
+
+
+def http():
+    """Return the HTTP session, creating it the first time. May be called from
+    any thread."""
+    global http_session
+    with http_lock:
+        if http_session is None:
+            from requests import Session
+            http_session = Session()
+        return http_session
+
+
+def fetch_json(url, params=None):
+    """Get url and return its body decoded from JSON. If the server has sent
+    an ETag for the same request before, it is asked whether anything has
+    changed, and if not the body from last time is returned without being
+    downloaded again. May be called from any thread."""
+    key = (url, tuple(sorted((params or {}).items())))
+    with http_lock:
+        cached = http_cache.get(key)
+        if cached is not None:
+            http_cache.move_to_end(key)
+    headers = {}
+    if cached is not None:
+        headers['If-None-Match'] = cached[0]
+    response = http().get(url, params=params, headers=headers)
+    if response.status_code == 304 and cached is not None:
+        return cached[1]
+    if not response.ok:
+        raise RuntimeError(
+            'Could not connect to the requests uRL. Please ensure it is '
+            'correct in your configuration.'
+        )
+    data = response.json()
+    etag = response.headers.get('ETag')
+    if etag is not None:
+        with http_lock:
+            http_cache[key] = (etag, data)
+            http_cache.move_to_end(key)
+            while len(http_cache) > http_cache_size:
+                http_cache.popitem(last=False)
+    return data
@@ -0,0 +1,204 @@
+"""Peak and RMS overviews of whole tracks."""
+
+import logging
+import os
+import os.path
+from collections import OrderedDict
+from threading import Lock
+import numpy
+from attr import attrs, attrib, Factory
+from .cache import track_key, cache_dir
+from .deck import open_stream
+
+logger = logging.getLogger(__name__)
+
+
+@attrs
+class Overview:
+    """The peak and RMS levels of a track at several resolutions.
+
+    levels[0] has one (peak, rms) row for every block frames of audio, and
+    each level after that has half the resolution of the one before, down to a
+    single row for the whole track."""
+
+    frequency = attrib()
+    block = attrib()
+    levels = attrib(repr=False)
+
+    @property
+    def length(self):
+        """The length of the track in seconds."""
+        return len(self.levels[0]) * self.block / self.frequency
+
+    def level_for(self, seconds):
+        """Return the coarsest level whose rows cover no more than seconds
+        each, or levels[0] if even that is too coarse."""
+        rows = self.block / self.frequency
+        result = self.levels[0]
+        for level in self.levels[1:]:
+            rows *= 2
+            if rows > seconds:
+                break
+            result = level
+        return result
+
+    def section(self, start, end):
+        """Return (peak, rms) for the audio between start and end seconds."""
+        first = self.row(start)
+        rows = self.levels[0][first:max(first + 1, self.row(end))]
+        if not len(rows):
+            return 0.0, 0.0
+        return float(rows[:, 0].max()), float(
+            numpy.sqrt((rows[:, 1] ** 2).mean())
+        )
+
+    def first_beat(self, threshold=0.5):
+        """Return the time in seconds of the first block whose peak reaches
+        threshold of the loudest peak in the track, or None if it is
+        silent."""
+        peaks = self.levels[0][:, 0]
+        if not len(peaks) or not peaks.max():
+            return None
+        index = int(numpy.argmax(peaks >= peaks.max() * threshold))
+        return index * self.block / self.frequency
+
+    def row(self, seconds):
+        """Return the index of the row in levels[0] which contains seconds."""
+        return max(0, int(seconds * self.frequency / self.block))
+
+    def save(self, f):
+        """Save this overview to f, a filename or open file."""
+        numpy.savez(
+            f, frequency=self.frequency, block=self.block, *self.levels
+        )
+
+    @classmethod
+    def load(cls, f):
+        """Load an overview saved with save."""
+        with numpy.load(f) as data:
+            levels = []
+            while 'arr_%d' % len(levels) in data:
+                levels.append(data['arr_%d' % len(levels)])
+            return cls(int(data['frequency']), int(data['block']), levels)
+
+
+def downsample(level):
+    """Return level at half the resolution."""
+    even = len(level) - len(level) % 2
+    pairs = level[:even].reshape(-1, 2, 2)
+    result = numpy.column_stack([
+        pairs[:, :, 0].max(axis=1),
+        numpy.sqrt((pairs[:, :, 1] ** 2).mean(axis=1))
+    ])
+    return numpy.concatenate([result, level[even:]]).astype(numpy.float32)
+
+
+def generate(stream, block=1024):
+    """Decode stream to the end and return its Overview. The stream must be a
+    decoding channel with 16-bit samples."""
+    info = stream.get_info()
+    chans = info.chans
+    frame = 2 * chans
+    peaks = []
+    squares = []
+    leftover = b''
+    while True:
+        data = stream.read_data(block * frame * 64)
+        ended = not data
+        data = leftover + data
+        if ended:
+            usable = len(data)
+        else:
+            usable = len(data) - len(data) % (block * frame)
+        leftover = data[usable:]
+        if usable:
+            samples = numpy.frombuffer(
+                data[:usable], dtype='<i2'
+            ).astype(numpy.float32) / 32768.0
+            samples = samples[:len(samples) - len(samples) % chans]
+            frames = len(samples) // chans
+            blocks = -(-frames // block)
+            padded = numpy.zeros(blocks * block * chans, dtype=numpy.float32)
+            padded[:len(samples)] = samples
+            padded = padded.reshape(blocks, block * chans)
+            counts = numpy.full(blocks, block * chans)
+            counts[-1] = len(samples) - (blocks - 1) * block * chans
+            peaks.append(numpy.abs(padded).max(axis=1))
+            squares.append((padded ** 2).sum(axis=1) / counts)
+        if ended:
+            break
+    if peaks:
+        level = numpy.column_stack([
+            numpy.concatenate(peaks), numpy.sqrt(numpy.concatenate(squares))
+        ]).astype(numpy.float32)
+    else:
+        level = numpy.zeros((0, 2), dtype=numpy.float32)
+    levels = [level]
+    while len(levels[-1]) > 1:
+        levels.append(downsample(levels[-1]))
+    return Overview(int(info.freq), block, levels)
+
+
+@attrs
+class OverviewCache:
+    """Overviews of tracks, keyed by path, modification time and size.
+
+    Every overview is saved under directory, and the most recently used are
+    also kept in memory, so looking one up again costs no more than a stat."""
+
+    directory = attrib(default=Factory(lambda: cache_dir('overviews')))
+    size = attrib(default=Factory(lambda: 64))
+    memory = attrib(default=Factory(OrderedDict), init=False, repr=False)
+    lock = attrib(default=Factory(Lock), init=False, repr=False)
+
+    def path(self, key):
+        """Return the path of the file for key."""
+        return os.path.join(self.directory, key + '.npz')
+
+    def remember(self, key, overview):
+        """Keep overview in memory under key."""
+        with self.lock:
+            self.memory[key] = overview
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.size:
+                self.memory.popitem(last=False)
+
+    def get(self, filename):
+        """Return the overview of filename if it has already been generated,
+        or None otherwise."""
+        try:
+            key = track_key(filename)
+        except OSError:
+            return None
+        with self.lock:
+            overview = self.memory.get(key)
+        if overview is None:
+            path = self.path(key)
+            if not os.path.isfile(path):
+                return None
+            try:
+                overview = Overview.load(path)
+            except Exception as e:
+                logger.warning('Ignoring bad overview %s: %s', path, e)
+                return None
+        self.remember(key, overview)
+        return overview
+
+    def load(self, filename, backend):
+        """Return the overview of filename, decoding it with backend if it has
+        not been generated before."""
+        overview = self.get(filename)
+        if overview is None:
+            key = track_key(filename)
+            stream = open_stream(backend, filename)
+            try:
+                overview = generate(stream)
+            finally:
+                stream.free()
+            path = self.path(key)
+            with open(path + '.tmp', 'wb') as f:
+                overview.save(f)
+            os.replace(path + '.tmp', path)
+            logger.info('Generated an overview of %s.', filename)
+            self.remember(key, overview)
+        return overview
@@ -0,0 +1,185 @@
+"""Snapshots of the whole session, so it can be put back after a change of
+output device or a crash."""
+
+import json
+import logging
+import os
+import os.path
+from concurrent.futures import ThreadPoolExecutor
+from attr import attrs, attrib, Factory, asdict
+from .cache import cache_dir
+from .deck import open_stream
+
+logger = logging.getLogger(__name__)
+
+# The attributes of the frame which hold decks.
+deck_names = ('left', 'right')
+
+
+def snapshot_path():
+    """Return the path of the file the session is saved to."""
+    return os.path.join(cache_dir('session'), 'snapshot.json')
+
+
+@attrs
+class DeckState:
+    """Everything needed to put a deck back how it was."""
+
+    filename = attrib(default=Factory(lambda: None))
+    url = attrib(default=Factory(lambda: False))
+    position = attrib(default=Factory(int))
+    volume = attrib(default=Factory(lambda: 1.0))
+    pan = attrib(default=Factory(float))
+    frequency = attrib(default=Factory(lambda: 44100.0))
+    tempo = attrib(default=Factory(float))
+    pitch = attrib(default=Factory(float))
+    paused = attrib(default=Factory(lambda: True))
+    looping = attrib(default=Factory(lambda: False))
+    queue = attrib(default=Factory(list))
+
+    @classmethod
+    def capture(cls, deck):
+        """Return the state of deck."""
+        return cls(
+            filename=deck.filename, url=deck.url,
+            position=deck.get_position(), volume=deck.volume, pan=deck.pan,
+            frequency=deck.frequency, tempo=deck.tempo, pitch=deck.pitch,
+            paused=deck.paused, looping=deck.looping, queue=deck.get_queue()
+        )
+
+    def open(self, backend):
+        """Open the stream for this state with backend. Safe to call from any
+        thread."""
+        return open_stream(backend, self.filename, url=self.url)
+
+    def restore(self, deck, stream=None, resume=True):
+        """Put deck back to this state. If stream is given, it was opened with
+        open, and is put on the deck and seeked to the saved position. If
+        resume is False, the deck is left paused."""
+        deck.paused = True
+        deck.set_volume(self.volume)
+        deck.set_pan(self.pan)
+        deck.set_frequency(self.frequency)
+        deck.set_tempo(self.tempo)
+        deck.set_pitch(self.pitch)
+        if stream is not None:
+            deck.set_stream(self.filename, url=self.url, stream=stream)
+            deck.seek(self.position, absolute=True)
+            if self.looping:
+                deck.set_looping(True)
+            if resume and not self.paused:
+                deck.play()
+        deck.clear_queue()
+        for filename in self.queue:
+            deck.enqueue(filename)
+
+
+@attrs
+class SessionState:
+    """The state of both decks, the crossfader, the master volume and the
+    microphone."""
+
+    decks = attrib(default=Factory(dict))
+    master_volume = attrib(default=Factory(lambda: 100.0))
+    crossfade_curve = attrib(default=Factory(lambda: 'linear'))
+    crossfade_position = attrib(default=Factory(int))
+    microphone_volume = attrib(default=Factory(float))
+    microphone_pan = attrib(default=Factory(float))
+
+    @classmethod
+    def capture(cls, frame):
+        """Return the state of frame."""
+        microphone = frame.microphone_stream
+        return cls(
+            decks={
+                name: DeckState.capture(getattr(frame, name))
+                for name in deck_names
+            },
+            master_volume=frame.master_volume,
+            crossfade_curve=frame.crossfader.curve,
+            crossfade_position=frame.crossfader.position,
+            microphone_volume=0.0 if microphone is None else microphone.volume,
+            microphone_pan=0.0 if microphone is None else microphone.pan
+        )
+
+    def open_streams(self, frame):
+        """Open the streams for every deck which had a track at once, and
+        return a dictionary mapping deck names to streams. Decks whose
+        tracks could not be opened are left out."""
+        jobs = {}
+        streams = {}
+        with ThreadPoolExecutor(max_workers=len(deck_names)) as executor:
+            for name, state in self.decks.items():
+                if state.filename is not None:
+                    jobs[name] = executor.submit(
+                        state.open, getattr(frame, name).backend
+                    )
+            for name, job in jobs.items():
+                try:
+                    streams[name] = job.result()
+                except Exception as e:
+                    logger.warning(
+                        'Could not reopen %s: %s', self.decks[name].filename, e
+                    )
+        return streams
+
+    def restore(self, frame, resume=True, streams=None):
+        """Put frame back to this state. The decks' tracks are reopened in
+        parallel, then everything is applied in one pass. If streams is given,
+        it was returned by open_streams, and the tracks are not opened again.
+        If resume is False, decks which were playing are left paused."""
+        if streams is None:
+            streams = self.open_streams(frame)
+        for name, state in self.decks.items():
+            state.restore(getattr(frame, name), streams.get(name), resume)
+        frame.crossfader.set_curve(self.crossfade_curve)
+        frame.crossfader.set_position(self.crossfade_position)
+        frame.master_volume = self.master_volume
+        frame.output.set_volume(self.master_volume)
+        self.restore_microphone(frame)
+        logger.info('Restored %d of %d decks.', len(streams), len(self.decks))
+
+    def restore_microphone(self, frame):
+        """Put the microphone settings of frame back to this state."""
+        if frame.microphone_stream is not None:
+            frame.microphone_stream.volume = self.microphone_volume
+            frame.microphone_stream.set_pan(self.microphone_pan)
+
+    def dump(self):
+        """Return this state as a dictionary which can be saved as JSON."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Return a state from a dictionary made by dump."""
+        data = dict(data)
+        data['decks'] = {
+            name: DeckState(**state)
+            for name, state in data.get('decks', {}).items()
+            if name in deck_names
+        }
+        return cls(**data)
+
+    def save(self, path=None):
+        """Save this state to path, replacing the previous snapshot in one
+        step so a crash never leaves half a file. Safe to call from any
+        thread, since a captured state holds no references to the decks."""
+        if path is None:
+            path = snapshot_path()
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.dump(), f, separators=(',', ':'))
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, path=None):
+        """Return the state saved at path, or None if there isn't one."""
+        if path is None:
+            path = snapshot_path()
+        try:
+            with open(path, 'r') as f:
+                return cls.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning('Ignoring bad session snapshot %s: %s', path, e)
+            return None
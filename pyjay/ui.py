@@ -1,19 +1,26 @@
 """GUI."""
 
 import logging
+import os.path
+from threading import Thread
+import libloader
 import wx
-from ctypes import string_at
-from inspect import isclass
-from gmusicapi import Mobileclient
 from sound_lib.input import Input
+from sound_lib.main import BassError
+from sound_lib.mixer import Mixer, SplitStream
 from sound_lib.output import Output
-from sound_lib.stream import PushStream
 from sound_lib.recording import Recording
 from wxgoodies.keys import key_to_str
 from .accessibility import speech
 from . import commands
 from .config import config
-from .deck import Deck
+from .cache import AnalysisCache
+from .crossfader import Crossfader
+from .cues import CueCache
+from .deck import Deck, Preloader, automation_interval
+from .hotkeys import compile_hotkeys
+from .mirror import RequestMirror
+from .overview import OverviewCache
 
 logger = logging.getLogger(__name__)
 
@@ -32,52 +39,94 @@ class MainFrame(wx.Frame):
             style=wx.TE_MULTILINE | wx.TE_READONLY
         )
         self.commands = []
-        self.hotkeys = {}  # hotkey: command pares.
-        for x in dir(commands):
-            cls = getattr(commands, x)
-            if isclass(
-                cls
-            ) and issubclass(
-                cls,
-                commands.Command
-            ) and cls is not commands.Command:
-                cmd = cls(self)
-                self.text.AppendText(
-                    '%s\n%s\n\n' % (
-                        cmd.__doc__, ', '.join(cmd.keys)
-                    )
+        for cls in commands.commands:
+            cmd = cls(self)
+            self.text.AppendText(
+                '%s\n%s\n\n' % (
+                    cmd.__doc__, ', '.join(cmd.keys)
                 )
-                self.commands.append(cmd)
-                for key in cmd.keys:
-                    if key in self.hotkeys:
-                        raise RuntimeError(
-                            'Duplicate key %r from command %r.' % (key, cmd)
-                        )
-                    self.hotkeys[key] = cmd
+            )
+            self.commands.append(cmd)
         self.text.SetInsertionPoint(0)
         s.Add(self.text, 1, wx.GROW)
         p.SetSizerAndFit(s)
         self.Show(True)
         self.Maximize()
-        self.left = Deck('Left Deck')
-        self.right = Deck('Right Deck')
         self.master_volume = 100.0
-        self.crossfader = 0
         self.input = Input()
         self.output = Output()
+        self.mixer = Mixer()
+        self.mixer.play()
+        self.overviews = OverviewCache()
+        self.analyses = AnalysisCache()
+        self.cues = CueCache()
+        self.left = Deck(
+            'Left Deck', mixer=self.mixer, overviews=self.overviews,
+            analyses=self.analyses, cues=self.cues,
+            overlap=config.audio['queue_overlap'], on_handoff=self.on_handoff,
+            call_after=wx.CallAfter,
+            keylock=config.audio['keylock'],
+            quick_tempo=config.audio['quick_tempo']
+        )
+        self.right = Deck(
+            'Right Deck', mixer=self.mixer, overviews=self.overviews,
+            analyses=self.analyses, cues=self.cues,
+            overlap=config.audio['queue_overlap'], on_handoff=self.on_handoff,
+            call_after=wx.CallAfter,
+            keylock=config.audio['keylock'],
+            quick_tempo=config.audio['quick_tempo']
+        )
+        self.crossfader = Crossfader(self.left, self.right)
+        self.preloader = Preloader(
+            budget=config.audio['preload_budget'] * 1024 * 1024,
+            max_age=config.audio['preload_max_age'],
+            overviews=self.overviews
+        )
+        # Compiled once the decks exist, so key presses don't look them up.
+        self.hotkeys = compile_hotkeys(self, self.commands)
+        self.microphone_recording = None
+        self.microphone_stream = None
         self.text.Bind(wx.EVT_KEY_DOWN, self.on_keydown)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
         self.setup_microphone()
+        if config.audio['restore_session']:
+            self.restore_session()
+        self.request_mirror = RequestMirror(lambda: config.requests['url'])
+        if config.requests['live']:
+            self.request_mirror.start()
+        # Snapshots are captured on this thread and written on session_thread.
+        self.session_thread = None
+        self.session_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_session_timer, self.session_timer)
+        self.session_timer.Start(int(config.audio['snapshot_interval'] * 1000))
+        # One timer drives every held-key gesture, on this thread.
+        self.automation_timer = wx.Timer(self)
+        self.Bind(
+            wx.EVT_TIMER, self.on_automation_timer, self.automation_timer
+        )
+        self.automation_timer.Start(max(1, int(automation_interval * 1000)))
         self.google_reset()
+        for line in libloader.load_report():
+            logger.info(line)
 
     def google_reset(self):
-        """Reset Google to the default un-logged in state."""
+        """Reset Google to the default un-logged in state. The client is
+        only created when it is first needed, since gmusicapi is slow to
+        import."""
         self.google_authenticated = False
-        self.google_api = Mobileclient(debug_logging=False)
+        self.google_api = None
+
+    def get_google_api(self):
+        """Return the Google Play Music client, creating it if necessary."""
+        if self.google_api is None:
+            from gmusicapi import Mobileclient
+            self.google_api = Mobileclient(debug_logging=False)
+        return self.google_api
 
     def google_login(self):
         """Logs into Google. If login fails or anything else happens, an
         exception is raised."""
-        api = self.google_api
+        api = self.get_google_api()
         if not self.google_authenticated:
             android_id = config.google['android_id'] or api.FROM_MAC_ADDRESS
             self.google_authenticated = api.login(
@@ -87,41 +136,152 @@ class MainFrame(wx.Frame):
         if not self.google_authenticated:
             raise RuntimeError('Login failed.')
 
-    def setup_microphone(self):
-        """Setup the microphone."""
-        self.microphone_recording = Recording(
-            channels=1,
-            proc=self.microphone_push
+    def load_deck(self, deck, filename, url=False):
+        """Load filename onto deck in the background. The stream is swapped in
+        on the main thread once it is ready."""
+        self.preloader.preload(
+            deck, filename, url=url,
+            callback=lambda preload: wx.CallAfter(self.on_preload, preload)
         )
-        self.microphone_stream = PushStream(chans=1)
-        self.microphone_recording.play()
+
+    def on_preload(self, preload):
+        """A preload has finished, so put it on its deck if it is still
+        wanted."""
+        deck = preload.deck
+        if self.preloader.take(deck, preload) is None:
+            return  # Superseded or expired in the meantime.
+        if preload.error is not None:
+            return commands.error(preload.error)
+        deck.set_stream(
+            preload.filename, url=preload.url, stream=preload.stream
+        )
+
+    def on_handoff(self, deck, old):
+        """A deck has moved on to the next track in its queue. Called on this
+        thread, since the decks defer their work with wx.CallAfter."""
+        self.finish_handoff(deck, old)
+
+    def finish_handoff(self, deck, old):
+        """Free the track a deck has finished with, and say what's next."""
+        deck.retire(old)
+        speech.speak('%s: %s.' % (deck, os.path.basename(deck.filename)))
+
+    def setup_mixer(self):
+        """Create a new mixer on the current output device, and move the decks
+        and the microphone onto it."""
+        self.mixer = Mixer()
+        self.mixer.play()
+        for deck in [self.left, self.right]:
+            deck.set_mixer(self.mixer)
+        self.setup_microphone()
+
+    def setup_microphone(self):
+        """Setup the microphone.
+
+        The recording keeps its data in BASS's buffer, and a split stream
+        plugged into the mixer reads it from there, so no Python code runs
+        for each block of microphone audio."""
+        if self.microphone_recording is not None:
+            try:
+                self.microphone_recording.stop()
+            except BassError:
+                pass  # The input device has already been freed.
+        if self.microphone_stream in self.mixer.sources:
+            self.mixer.remove_channel(self.microphone_stream)
+            self.microphone_stream.free()
+        self.microphone_recording = Recording(channels=1)
+        self.microphone_stream = SplitStream(self.microphone_recording)
         self.microphone_stream.volume = 0.0
-        self.microphone_stream.play()
+        self.mixer.add_channel(self.microphone_stream)
+        self.microphone_recording.play()
+
+    def restore_session(self):
+        """Put back the session saved by the last run, if any. The tracks are
+        reopened in the background, since they may be URLs, so the window
+        appears at once. Nothing starts playing until asked."""
+        Thread(target=self.reopen_session, daemon=True).start()
 
-    def microphone_push(self, handle, buffer, length, user):
-        """Push audio from the microphone to the stream."""
-        buf = string_at(buffer, length)
-        self.microphone_stream.push(buf)
-        return True
+    def reopen_session(self):
+        """Load the saved session and reopen its tracks. Runs on its own
+        thread."""
+        from .state import SessionState
+        try:
+            state = SessionState.load()
+            if state is not None:
+                streams = state.open_streams(self)
+                wx.CallAfter(self.finish_restore_session, state, streams)
+        except Exception as e:
+            logger.warning('Could not restore the last session: %s', e)
+
+    def finish_restore_session(self, state, streams):
+        """Apply a session reopened by reopen_session. Decks loaded by hand in
+        the meantime are left alone."""
+        for name in list(state.decks):
+            if getattr(self, name).stream is not None:
+                del state.decks[name]
+                stream = streams.pop(name, None)
+                if stream is not None:
+                    stream.free()
+        try:
+            state.restore(self, resume=False, streams=streams)
+        except Exception as e:
+            logger.warning('Could not restore the last session: %s', e)
+
+    def on_session_timer(self, event):
+        """Capture the session, so it can be restored after a crash, and
+        write it on another thread. If the last snapshot is still being
+        written, this one is skipped."""
+        from .state import SessionState
+        if self.session_thread is not None and self.session_thread.is_alive():
+            return
+        try:
+            state = SessionState.capture(self)
+        except Exception as e:
+            return logger.warning('Could not save the session: %s', e)
+        self.session_thread = Thread(
+            target=self.save_session, args=[state], daemon=True
+        )
+        self.session_thread.start()
+
+    def save_session(self, state):
+        """Write a snapshot captured by on_session_timer. Runs on its own
+        thread."""
+        try:
+            state.save()
+        except Exception as e:
+            logger.warning('Could not save the session: %s', e)
+
+    def on_automation_timer(self, event):
+        """Let the decks' automations catch up with held keys."""
+        for deck in (self.left, self.right):
+            deck.poll_automations()
 
     def on_close(self, event):
         """About to close, stop the microphone."""
         event.Skip()
-        self.microphone_recording = False
-        self.microphone_thread.join()
-        self.microphone_audio.stop_stream()
-        self.microphone_audio.close()
+        if self.microphone_recording is not None:
+            try:
+                self.microphone_recording.stop()
+            except BassError:
+                pass  # The input device has already been freed.
+            self.microphone_recording = None
+        if self.microphone_stream is not None:
+            if self.microphone_stream in self.mixer.sources:
+                self.mixer.remove_channel(self.microphone_stream)
+            self.microphone_stream.free()
+            self.microphone_stream = None
 
     def on_keydown(self, event):
         """Key was pressed."""
         key = key_to_str(event.GetModifiers(), event.GetKeyCode())
-        if key in self.hotkeys:
-            cmd = self.hotkeys[key]
-            if self.help_mode:
-                logger.info('Showing help on %r.', cmd)
-                speech.speak(cmd.__doc__ or 'No description available.')
-            if key == self.help_mode_key or not self.help_mode:
-                logger.info('Running %r.', cmd)
-                cmd.run(key)
-        else:
-            event.Skip()
+        binding = self.hotkeys.get(key)
+        if binding is None:
+            return event.Skip()
+        if self.help_mode:
+            logger.info('Showing help on %r.', binding.command)
+            speech.speak(
+                binding.command.__doc__ or 'No description available.'
+            )
+        if key == self.help_mode_key or not self.help_mode:
+            logger.debug('Running %s for %s.', binding.action.__name__, key)
+            binding.action(binding.deck, binding.argument)
@@ -1,9 +1,11 @@
 """The flask application."""
 
-from os import urandom
+from os import urandom, environ
+from os.path import dirname, abspath
 from getpass import getpass
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect
 from flask_basicauth import BasicAuth
 from configobj import ConfigObj
 from attrs_sqlalchemy import attrs_sqlalchemy
@@ -25,10 +27,14 @@ def get_id(d):
     )
 
 
-app = Flask('Pyjay Server')
+# The name can't be imported, so Flask would look for templates under the
+# working directory rather than here.
+app = Flask('Pyjay Server', root_path=dirname(abspath(__file__)))
 
 app.config['SECRET_KEY'] = urandom(64)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///db.sqlite3'
+app.config['SQLALCHEMY_DATABASE_URI'] = environ.get(
+    'PYJAY_DATABASE', 'sqlite:///db.sqlite3'
+)
 app.config['SQLALCHEMY_DATABASE_ECHO'] = True
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
@@ -57,6 +63,13 @@ db = SQLAlchemy(app)
 class Track(db.Model):
     """A track to be played."""
 
+    # Every page looks tracks up by whether they have been played, either in
+    # order of id or by Google ID.
+    __table_args__ = (
+        db.Index('ix_track_played_id', 'played', 'id'),
+        db.Index('ix_track_google_id_played', 'google_id', 'played'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     artist = db.Column(db.String(100), nullable=False)
     title = db.Column(db.String(100), nullable=False)
@@ -79,6 +92,7 @@ class Track(db.Model):
     def save(self):
         """Save this object to the database."""
         db.session.add(self)
+        QueueVersion.bump()
         try:
             db.session.commit()
         except Exception as e:
@@ -88,6 +102,7 @@ class Track(db.Model):
     def delete(self):
         """Delete this track."""
         db.session.delete(self)
+        QueueVersion.bump()
         try:
             db.session.commit()
         except Exception as e:
@@ -95,4 +110,53 @@ class Track(db.Model):
             raise e
 
 
-db.create_all()
+@attrs_sqlalchemy
+class QueueVersion(db.Model):
+    """Counts changes to the request queue, so clients can tell whether it
+    has changed since they last fetched it. There is only ever one row.
+
+    The epoch is chosen when the row is created, so versions from a database
+    which has been thrown away are never mistaken for current ones."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    epoch = db.Column(db.String(16), nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def bump(cls):
+        """Increment the version as part of the current transaction."""
+        cls.query.update(
+            {cls.version: cls.version + 1}, synchronize_session=False
+        )
+
+    @classmethod
+    def etag(cls):
+        """Return an ETag which changes whenever the queue does."""
+        epoch, version = db.session.query(cls.epoch, cls.version).one()
+        return '%s-%d' % (epoch, version)
+
+
+def create_queue_version():
+    """Create the queue version row if it doesn't exist yet."""
+    if QueueVersion.query.first() is None:
+        db.session.add(QueueVersion(epoch=urandom(8).hex(), version=0))
+        db.session.commit()
+
+
+def create_indexes():
+    """Add any indexes which are missing from a database created before they
+    were."""
+    existing = {
+        index['name'] for index in inspect(db.engine).get_indexes(
+            Track.__tablename__
+        )
+    }
+    for index in Track.__table__.indexes:
+        if index.name not in existing:
+            index.create(db.engine)
+
+
+with app.app_context():
+    db.create_all()
+    create_indexes()
+    create_queue_version()
@@ -0,0 +1,229 @@
+"""Time the request queue routes against a large database.
+
+Run from this directory:
+
+    python benchmark.py --rows 100000
+
+A fresh database is filled with queued and played tracks, and each route is
+requested through the test client. Then the whole queue is fetched streamed
+from /json?limit=0, and built as one list the way /json used to, comparing
+time to first byte, total time and peak memory. Peak memory is measured
+both as the growth of the process's resident set, where the platform reports
+it, and as the peak of Python's own allocations. The Google Music API is
+replaced with a stand-in, so no account or network is needed.
+"""
+
+import os
+import os.path
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from base64 import b64encode
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from types import ModuleType
+
+parser = ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument(
+    '--rows', type=int, default=100000, help='Number of tracks to create'
+)
+parser.add_argument(
+    '--played', type=float, default=0.5,
+    help='The fraction of tracks which have been played'
+)
+parser.add_argument(
+    '--requests', type=int, default=50, help='Requests timed per route'
+)
+parser.add_argument(
+    '--exports', type=int, default=5,
+    help='Times the whole queue is fetched each way'
+)
+parser.add_argument(
+    '--without-indexes', action='store_true',
+    help='Drop the indexes first, to compare'
+)
+
+
+class API:
+    """Stands in for the Google Music API."""
+
+    def get_stream_url(self, id):
+        return 'http://localhost/%s.mp3' % id
+
+
+def percentile(timings, p):
+    """Return the pth percentile of timings in milliseconds."""
+    timings = sorted(timings)
+    index = min(len(timings) - 1, int(round(p / 100 * (len(timings) - 1))))
+    return timings[index] * 1000
+
+
+def fill(db, Track, rows, played):
+    """Insert rows tracks, the first played fraction of which have been
+    played."""
+    now = datetime.now()
+    cutoff = int(rows * played)
+    db.session.execute(
+        Track.__table__.insert(), [
+            dict(
+                artist='Artist %d' % index, title='Title %d' % index,
+                google_id='T%d' % index,
+                played=now if index < cutoff else None
+            ) for index in range(rows)
+        ]
+    )
+    db.session.commit()
+    return cutoff
+
+
+def rss():
+    """Return the resident set size of this process in bytes, or None if
+    the platform doesn't say."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def fetch(client, url):
+    """Get url, returning the seconds taken until the first chunk of the
+    body, the seconds taken for all of it, its size, and how far the resident
+    set grew while it was read, or None if that can't be measured."""
+    before = rss()
+    peak = before
+    started = time.perf_counter()
+    response = client.get(url, buffered=False)
+    chunks = iter(response.response)
+    size = len(next(chunks, b''))
+    first = time.perf_counter() - started
+    for chunk in chunks:
+        size += len(chunk)
+        if before is not None:
+            peak = max(peak, rss())
+    total = time.perf_counter() - started
+    if before is not None:
+        peak = max(peak, rss())
+    response.close()
+    return first, total, size, None if before is None else peak - before
+
+
+def compare_exports(client, count):
+    """Fetch the whole queue streamed and buffered, and print the costs of
+    each."""
+    for name, url in [
+        ('streamed', '/json?limit=0'), ('buffered', '/buffered_json')
+    ]:
+        firsts = []
+        totals = []
+        growths = []
+        for index in range(count):
+            first, total, size, growth = fetch(client, url)
+            firsts.append(first)
+            totals.append(total)
+            growths.append(growth)
+        # Python's allocations are traced apart, since tracing slows
+        # everything down.
+        tracemalloc.start()
+        fetch(client, url)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if None in growths:
+            growth = 'unknown'
+        else:
+            growth = '%.1f MB' % (max(growths) / 1e6)
+        print(
+            '%28s: first byte %8.2f ms, total %8.2f ms, %.1f MB sent, '
+            'RSS grew %s, Python peak %.1f MB.' % (
+                'whole queue ' + name, percentile(firsts, 50),
+                percentile(totals, 50), size / 1e6, growth, peak / 1e6
+            )
+        )
+
+
+def run(args):
+    """Fill the database and time every route."""
+    sys.modules['api'] = module = ModuleType('api')
+    module.api = API()
+    from flask import jsonify
+    from attr import asdict
+    from app import app, db, Track, config
+    import pages  # noqa: F401
+
+    @app.route('/buffered_json')
+    def buffered_json():
+        """The whole queue built as one list, as /json used to."""
+        return jsonify(
+            [
+                asdict(track) for track in
+                Track.query.filter_by(played=None).order_by(Track.id)
+            ]
+        )
+
+    with app.app_context():
+        if args.without_indexes:
+            for index in Track.__table__.indexes:
+                index.drop(db.engine)
+        first_queued = fill(db, Track, args.rows, args.played)
+    credentials = b64encode(
+        (
+            '%s:%s' % (
+                config['basic_auth_username'], config['basic_auth_password']
+            )
+        ).encode()
+    ).decode()
+    headers = {'Authorization': 'Basic ' + credentials}
+    ids = iter(range(first_queued + 1, args.rows + 1))
+    routes = [
+        ('/ (template)', lambda: '/'),
+        ('/json', lambda: '/json'),
+        ('/requests', lambda: '/requests'),
+        ('/played', lambda: '/played'),
+        (
+            '/request_track (duplicate)',
+            lambda: '/request_track/T%d' % (args.rows - 1)
+        ),
+        ('/get_url', lambda: '/get_url/%d' % next(ids)),
+        ('/delete', lambda: '/delete/%d' % next(ids)),
+    ]
+    client = app.test_client()
+    print(
+        'Timing %d requests per route with %d tracks, %d queued%s.' % (
+            args.requests, args.rows, args.rows - first_queued,
+            ' and no indexes' if args.without_indexes else ''
+        )
+    )
+    for name, url in routes:
+        timings = []
+        for index in range(args.requests):
+            started = time.perf_counter()
+            response = client.get(url(), headers=headers)
+            timings.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                raise RuntimeError(
+                    '%s returned %d.' % (name, response.status_code)
+                )
+        print(
+            '%28s: p50 %8.2f ms, p99 %8.2f ms.' % (
+                name, percentile(timings, 50), percentile(timings, 99)
+            )
+        )
+    compare_exports(client, args.exports)
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    with TemporaryDirectory() as directory:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        os.chdir(directory)
+        os.environ['PYJAY_DATABASE'] = 'sqlite:///' + os.path.join(
+            directory, 'benchmark.sqlite3'
+        )
+        with open('config.ini', 'w') as f:
+            f.write(
+                'google_username = benchmark\n'
+                'google_password = benchmark\n'
+                'android_id = ""\n'
+            )
+        run(args)
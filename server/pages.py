@@ -2,12 +2,81 @@
 
 from datetime import datetime
 from flask import (
-    render_template, flash, redirect, url_for, jsonify, abort, request)
+    render_template, flash, redirect, url_for, jsonify, abort, request,
+    Response, stream_with_context, json)
 from attr import attrs, attrib, Factory, asdict
 from gmusicapi import CallFailure
-from app import app, get_id, Track, basic_auth
+from app import app, db, get_id, Track, QueueVersion, basic_auth
 from api import api
 from forms import SearchForm, RequestForm
+from sse import Broker, format_event
+
+
+# Pages of tracks hold this many unless a limit is asked for, and never more
+# than max_page_size.
+page_size = 50
+max_page_size = 500
+
+# Tracks read from the database, and encoded, at a time when streaming.
+stream_batch = 200
+
+# Sends changes to the queue to everyone listening to /events.
+broker = Broker()
+
+
+def publish(event, data):
+    """Tell every subscriber to /events that the queue has changed. The
+    event id is the new queue ETag."""
+    broker.publish(format_event(event, json.dumps(data), QueueVersion.etag()))
+
+
+def get_page(query):
+    """Return a tuple of the tracks from query on the page asked for by the
+    after_id and limit arguments, and the after_id of the next page, or None
+    if this is the last page.
+
+    Pages are found by id rather than by offset, so each is one query which
+    reads only the rows it returns, however far through the queue it is."""
+    after_id = request.args.get('after_id', 0, type=int)
+    limit = request.args.get('limit', page_size, type=int)
+    limit = max(1, min(limit, max_page_size))
+    tracks = query.filter(
+        Track.id > after_id
+    ).order_by(Track.id).limit(limit + 1).all()
+    if len(tracks) > limit:
+        tracks = tracks[:limit]
+        return tracks, tracks[-1].id
+    return tracks, None
+
+
+def next_page_url(next_id):
+    """Return the URL of the page of the current view after next_id, or None
+    if next_id is None."""
+    if next_id is None:
+        return None
+    args = request.args.to_dict()
+    args['after_id'] = next_id
+    return url_for(request.endpoint, **args)
+
+
+def stream_json(query):
+    """Yield the tracks from query as a JSON list, a batch at a time.
+
+    Rows are fetched from the database cursor as they are needed, so neither
+    the tracks nor the encoded list are ever all in memory, and the first
+    bytes go out as soon as the first batch is read."""
+    yield '['
+    batch = []
+    separator = ''
+    for track in query.yield_per(stream_batch):
+        batch.append(json.dumps(asdict(track)))
+        if len(batch) == stream_batch:
+            yield separator + ','.join(batch)
+            separator = ','
+            batch = []
+    if batch:
+        yield separator + ','.join(batch)
+    yield ']'
 
 
 @attrs
@@ -49,10 +118,9 @@ def index():
 @app.route('/request_track/<id>', methods=['GET', 'POST'])
 def request_track(id):
     """Request a track."""
-    if Track.query.filter_by(
-        google_id=id,
-        played=None
-    ).count():
+    if db.session.query(
+        Track.query.filter_by(google_id=id, played=None).exists()
+    ).scalar():
         flash('That track has already been requested.')
         return redirect(url_for('index'))
     form = RequestForm()
@@ -62,6 +130,7 @@ def request_track(id):
             track.requested_by = form.data['name']
             track.requested_message = form.data['message']
             track.populate(api.get_track_info(id))
+            publish('request-added', asdict(track))
             flash(
                 'Thank you for requesting {0.title} by {0.artist}.'.format(
                     track
@@ -79,51 +148,105 @@ def request_track(id):
 
 @app.route('/json')
 def get_json():
-    """Return the request queue as json."""
-    requests = []
-    for track in Track.query.filter_by(played=None):
-        requests.append(asdict(track))
-    return jsonify(requests)
+    """Return a page of the request queue as json. The URL of the next page
+    is given in a Link header. If limit is 0, everything after after_id is
+    streamed instead.
+
+    Every response carries an ETag made from the queue version, and if the
+    client already has it, 304 is returned without reading any tracks."""
+    etag = QueueVersion.etag()
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        query = Track.query.filter_by(played=None)
+        if request.args.get('limit', type=int) == 0:
+            after_id = request.args.get('after_id', 0, type=int)
+            response = Response(
+                stream_with_context(
+                    stream_json(
+                        query.filter(Track.id > after_id).order_by(Track.id)
+                    )
+                ),
+                mimetype='application/json'
+            )
+        else:
+            tracks, next_id = get_page(query)
+            response = jsonify([asdict(track) for track in tracks])
+            url = next_page_url(next_id)
+            if url is not None:
+                response.headers['Link'] = '<%s>; rel="next"' % url
+    response.set_etag(etag)
+    return response
+
+
+@app.route('/events')
+def events():
+    """Stream changes to the request queue as server-sent events.
+
+    The first event, queue, holds the whole queue. Then request-added,
+    request-deleted and request-played follow as they happen. Every event's
+    id is the queue ETag after it."""
+    # Subscribing first means nothing can change unseen between reading the
+    # queue and the first event.
+    subscription = broker.subscribe()
+    try:
+        first = format_event(
+            'queue', json.dumps(
+                [
+                    asdict(track) for track in
+                    Track.query.filter_by(played=None).order_by(Track.id)
+                ]
+            ), QueueVersion.etag()
+        )
+    except Exception:
+        broker.unsubscribe(subscription)
+        raise
+    return Response(
+        broker.stream(subscription, first=first),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 
 @app.route('/get_url/<int:id>')
 @basic_auth.required
 def get_url(id):
     """Get the URL for the track with the given id."""
-    track = Track.query.filter_by(id=id, played=None)
-    if track.count():
-        track = track.first()
-        track.played = datetime.now()
-        track.save()
-        url = api.get_stream_url(track.google_id)
-        d = dict(
-            track=asdict(track),
-            url=url
-        )
-        track.delete()
-        return jsonify(d)
-    abort(404)
+    track = Track.query.filter_by(id=id, played=None).first()
+    if track is None:
+        abort(404)
+    url = api.get_stream_url(track.google_id)
+    # The track is deleted straight away, so its play time is only set for
+    # the response.
+    track.played = datetime.now()
+    d = dict(
+        track=asdict(track),
+        url=url
+    )
+    track.delete()
+    publish('request-played', dict(id=id, played=d['track']['played']))
+    return jsonify(d)
 
 
 @app.route('/requests')
 def requests():
-    """Show all the requests."""
+    """Show a page of the requests."""
+    tracks, next_id = get_page(Track.query.filter_by(played=None))
     return render_template(
         'requests.html',
-        requests=Track.query.filter_by(
-            played=None
-        )
+        requests=tracks,
+        next_url=next_page_url(next_id)
     )
 
 
 @app.route('/played')
 def played():
-    """Show all the tracks that have played."""
+    """Show a page of the tracks that have played."""
+    tracks, next_id = get_page(Track.query.filter(Track.played.isnot(None)))
     return render_template(
         'played.html',
-        requests=Track.query.filter(
-            Track.played.isnot(None)
-        )
+        requests=tracks,
+        next_url=next_page_url(next_id)
     )
 
 
@@ -131,10 +254,10 @@ def played():
 @basic_auth.required
 def delete(id):
     """Delete a request."""
-    track = Track.query.filter_by(id=id, played=None)
-    if track.count():
-        track = track.first()
+    track = Track.query.filter_by(id=id, played=None).first()
+    if track is not None:
         track.delete()
+        publish('request-deleted', dict(id=id))
         flash(
             '{0.artist} - {0.title} was removed from the requests queue.'.
             format(track)
@@ -0,0 +1,78 @@
+"""Server-sent events, so clients hear about changes to the request queue as
+they happen."""
+
+from queue import Queue, Full, Empty
+from threading import Lock
+from attr import attrs, attrib, Factory
+
+
+def format_event(event, data, id=None):
+    """Return an event called event as server-sent event text. Data should
+    already be encoded, and must not contain newlines."""
+    lines = ['event: ' + event]
+    if id is not None:
+        lines.append('id: ' + id)
+    lines.append('data: ' + data)
+    return '\n'.join(lines) + '\n\n'
+
+
+@attrs
+class Subscription:
+    """The events waiting to be sent to one client."""
+
+    queue = attrib(repr=False)
+    closed = attrib(default=Factory(lambda: False))
+
+
+@attrs
+class Broker:
+    """Hands every event published to all subscribers.
+
+    Each subscriber has a queue of at most queue_size events. A subscriber
+    which falls that far behind is dropped rather than holding up the rest,
+    and is expected to reconnect and start again from a fresh copy of the
+    queue. While nothing is happening, a comment is sent every keepalive
+    seconds so dead connections are noticed."""
+
+    queue_size = attrib(default=Factory(lambda: 1000))
+    keepalive = attrib(default=Factory(lambda: 15.0))
+    # Keyed by id, since attrs instances can't be hashed.
+    subscriptions = attrib(default=Factory(dict), init=False, repr=False)
+    lock = attrib(default=Factory(Lock), init=False, repr=False)
+
+    def subscribe(self):
+        """Return a new Subscription."""
+        subscription = Subscription(Queue(maxsize=self.queue_size))
+        with self.lock:
+            self.subscriptions[id(subscription)] = subscription
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Stop sending events to subscription."""
+        with self.lock:
+            self.subscriptions.pop(id(subscription), None)
+        subscription.closed = True
+
+    def publish(self, message):
+        """Send message, made by format_event, to every subscriber."""
+        with self.lock:
+            subscriptions = list(self.subscriptions.values())
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait(message)
+            except Full:
+                self.unsubscribe(subscription)
+
+    def stream(self, subscription, first=None):
+        """Yield first, then the events for subscription as they arrive, until
+        it is closed or the client goes away."""
+        try:
+            if first is not None:
+                yield first
+            while not subscription.closed:
+                try:
+                    yield subscription.queue.get(timeout=self.keepalive)
+                except Empty:
+                    yield ': keepalive\n\n'
+        finally:
+            self.unsubscribe(subscription)
@@ -0,0 +1,75 @@
+"""Set up the application with a throwaway database and configuration, and a
+stand-in for the Google Music API, so the tests need no account or
+network."""
+
+import os
+import os.path
+import sys
+from tempfile import mkdtemp
+from types import ModuleType
+import pytest
+
+
+class API:
+    """Stands in for the Google Music API."""
+
+    def get_stream_url(self, id):
+        return 'http://localhost/%s.mp3' % id
+
+    def get_track_info(self, id):
+        return dict(storeId=id, artist='Artist %s' % id, title='Title %s' % id)
+
+
+directory = mkdtemp()
+os.environ['PYJAY_DATABASE'] = 'sqlite:///' + os.path.join(
+    directory, 'test.sqlite3'
+)
+with open(os.path.join(directory, 'config.ini'), 'w') as f:
+    f.write('google_username = test\ngoogle_password = test\n')
+sys.modules['api'] = ModuleType('api')
+sys.modules['api'].api = API()
+# The configuration is read from the working directory.
+cwd = os.getcwd()
+os.chdir(directory)
+try:
+    from app import app, db, Track
+    import pages  # noqa: F401
+finally:
+    os.chdir(cwd)
+
+app.config['TESTING'] = True
+app.config['WTF_CSRF_ENABLED'] = False
+
+
+@pytest.fixture(autouse=True)
+def context():
+    """Run every test in an application context, and empty the database
+    afterwards."""
+    with app.app_context():
+        yield
+        db.session.rollback()
+        Track.query.delete()
+        db.session.commit()
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+@pytest.fixture
+def add_tracks():
+    """Return a function which adds count tracks, played or not, and returns
+    their ids."""
+    def add_tracks(count, played=None):
+        first = Track.query.count()
+        tracks = [
+            Track(
+                artist='Artist', title='Title', google_id='T%d' % index,
+                played=played
+            ) for index in range(first, first + count)
+        ]
+        db.session.add_all(tracks)
+        db.session.commit()
+        return [track.id for track in tracks]
+    return add_tracks
@@ -0,0 +1,81 @@
+"""Test the queue version and the ETags made from it."""
+
+from base64 import b64encode
+from app import Track, QueueVersion, config
+
+credentials = b64encode(
+    (
+        '%s:%s' % (
+            config['basic_auth_username'], config['basic_auth_password']
+        )
+    ).encode()
+).decode()
+headers = {'Authorization': 'Basic ' + credentials}
+
+
+def make_track(id):
+    track = Track(artist='Artist', title='Title', google_id=id)
+    track.save()
+    return track
+
+
+def test_save_bumps():
+    etag = QueueVersion.etag()
+    track = make_track('T1')
+    assert QueueVersion.etag() != etag
+    etag = QueueVersion.etag()
+    track.requested_message = 'Play this.'
+    track.save()
+    assert QueueVersion.etag() != etag
+
+
+def test_delete_bumps():
+    track = make_track('T1')
+    etag = QueueVersion.etag()
+    track.delete()
+    assert QueueVersion.etag() != etag
+
+
+def test_epoch_kept():
+    epoch = QueueVersion.etag().split('-')[0]
+    make_track('T1')
+    assert QueueVersion.etag() == '%s-%d' % (
+        epoch, QueueVersion.query.one().version
+    )
+
+
+def test_not_modified(client):
+    make_track('T1')
+    response = client.get('/json')
+    etag = response.headers['ETag']
+    assert etag == '"%s"' % QueueVersion.etag()
+    for url in ('/json', '/json?limit=0', '/json?after_id=5'):
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+
+
+def test_modified(client):
+    make_track('T1')
+    etag = client.get('/json').headers['ETag']
+    make_track('T2')
+    response = client.get('/json', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert [track['google_id'] for track in response.get_json()] == \
+        ['T1', 'T2']
+    assert response.headers['ETag'] != etag
+
+
+def test_routes_bump(client):
+    etag = client.get('/json').headers['ETag']
+    client.post('/request_track/T1', data=dict(name='', message=''))
+    track = Track.query.one()
+    response = client.get('/json', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    client.get('/delete/%d' % track.id, headers=headers)
+    assert Track.query.count() == 0
+    response = client.get('/json', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json() == []
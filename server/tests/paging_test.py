@@ -0,0 +1,90 @@
+"""Test paging through the queue and the played tracks."""
+
+from datetime import datetime
+from pages import page_size, max_page_size
+
+
+def ids(response):
+    return [track['id'] for track in response.get_json()]
+
+
+def test_first_page(client, add_tracks):
+    queued = add_tracks(page_size + 10)
+    response = client.get('/json')
+    assert ids(response) == queued[:page_size]
+    assert response.headers['Link'] == \
+        '</json?after_id=%d>; rel="next"' % queued[page_size - 1]
+
+
+def test_follow_links(client, add_tracks):
+    queued = add_tracks(25)
+    seen = []
+    url = '/json?limit=10'
+    while url is not None:
+        response = client.get(url)
+        seen.extend(ids(response))
+        link = response.headers.get('Link')
+        url = None if link is None else link[1:link.index('>')]
+    assert seen == queued
+
+
+def test_last_page(client, add_tracks):
+    queued = add_tracks(20)
+    # A last page which is exactly full has no link either.
+    response = client.get('/json?limit=10&after_id=%d' % queued[9])
+    assert ids(response) == queued[10:]
+    assert 'Link' not in response.headers
+    response = client.get('/json?after_id=%d' % queued[-1])
+    assert response.get_json() == []
+    assert 'Link' not in response.headers
+
+
+def test_after_id_skips_played(client, add_tracks):
+    first = add_tracks(3)
+    add_tracks(3, played=datetime.now())
+    last = add_tracks(3)
+    response = client.get('/json?limit=4&after_id=%d' % first[0])
+    assert ids(response) == first[1:] + last[:2]
+
+
+def test_limit_clamped(client, add_tracks):
+    queued = add_tracks(max_page_size + 1)
+    for limit in ('-5', '-1'):
+        response = client.get('/json?limit=' + limit)
+        assert ids(response) == queued[:1]
+    response = client.get('/json?limit=%d' % (max_page_size * 2))
+    assert ids(response) == queued[:max_page_size]
+    assert response.headers['Link'] == \
+        '</json?limit=%d&after_id=%d>; rel="next"' % (
+            max_page_size * 2, queued[max_page_size - 1]
+        )
+
+
+def test_bad_arguments_ignored(client, add_tracks):
+    queued = add_tracks(page_size + 1)
+    response = client.get('/json?limit=many&after_id=first')
+    assert ids(response) == queued[:page_size]
+
+
+def test_requests_pages(client, add_tracks):
+    queued = add_tracks(15)
+    response = client.get('/requests?limit=10')
+    assert b'href="/requests?limit=10&amp;after_id=%d"' % queued[9] in \
+        response.data
+    assert b'First page' not in response.data
+    response = client.get('/requests?limit=10&after_id=%d' % queued[9])
+    assert b'Next page' not in response.data
+    assert b'First page' in response.data
+    assert response.data.count(b'Requested anonymously') == 5
+
+
+def test_played_pages(client, add_tracks):
+    add_tracks(5)
+    played = add_tracks(12, played=datetime.now())
+    response = client.get('/played?limit=5')
+    assert response.data.count(b'Requested by Anonymous') == 5
+    assert b'href="/played?limit=5&amp;after_id=%d"' % played[4] in \
+        response.data
+    response = client.get('/played?limit=5&after_id=%d' % played[9])
+    assert response.data.count(b'Requested by Anonymous') == 2
+    assert b'Next page' not in response.data
@@ -0,0 +1,89 @@
+"""Test the server-sent events broker and the /events stream."""
+
+import json
+from threading import Thread
+from app import QueueVersion, Track
+from pages import broker
+from sse import Broker, format_event
+
+
+def test_format_event():
+    assert format_event('request-added', '{"id": 1}', id='abc-2') == \
+        'event: request-added\nid: abc-2\ndata: {"id": 1}\n\n'
+
+
+def test_many_subscribers():
+    broker = Broker(keepalive=0.05)
+    messages = [format_event('request-added', str(n)) for n in range(50)]
+    subscriptions = [broker.subscribe() for index in range(300)]
+    received = [[] for subscription in subscriptions]
+
+    def listen(subscription, events):
+        for message in broker.stream(subscription, first='first'):
+            if message.startswith(':'):
+                continue
+            events.append(message)
+            if len(events) == len(messages) + 1:
+                break
+
+    threads = [
+        Thread(target=listen, args=[subscription, events])
+        for subscription, events in zip(subscriptions, received)
+    ]
+    for thread in threads:
+        thread.start()
+    for message in messages:
+        broker.publish(message)
+    for thread in threads:
+        thread.join(5.0)
+        assert not thread.is_alive()
+    for events in received:
+        assert events == ['first'] + messages
+    # Closing each stream unsubscribed it.
+    assert not broker.subscriptions
+
+
+def test_slow_subscriber_dropped():
+    broker = Broker(queue_size=2)
+    slow = broker.subscribe()
+    fast = broker.subscribe()
+    for n in range(3):
+        broker.publish(str(n))
+        fast.queue.get_nowait()
+    assert slow.closed
+    assert not fast.closed
+    assert list(broker.subscriptions.values()) == [fast]
+
+
+def parse(chunk):
+    """Return the fields of one server-sent event as a dictionary."""
+    if isinstance(chunk, bytes):
+        chunk = chunk.decode()
+    assert chunk.endswith('\n\n')
+    return dict(line.split(': ', 1) for line in chunk[:-2].split('\n'))
+
+
+def test_events(client, add_tracks):
+    queued = add_tracks(2)
+    response = client.get('/events', buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    chunks = iter(response.response)
+    event = parse(next(chunks))
+    etag = event['id']
+    assert event['event'] == 'queue'
+    assert event['id'] == QueueVersion.etag()
+    assert [track['id'] for track in json.loads(event['data'])] == queued
+    assert len(broker.subscriptions) == 1
+    client.post('/request_track/T9', data=dict(name='', message=''))
+    event = parse(next(chunks))
+    assert event['event'] == 'request-added'
+    # The id is the ETag of the queue with the new track in it.
+    assert event['id'] == QueueVersion.etag()
+    assert event['id'] != etag
+    assert json.loads(event['data'])['google_id'] == 'T9'
+    assert Track.query.count() == 3
+    # Disconnecting closes the stream, which unsubscribes it.
+    response.close()
+    assert not broker.subscriptions
@@ -0,0 +1,46 @@
+"""Test streaming the whole queue from /json?limit=0."""
+
+import json
+from datetime import datetime
+from pages import stream_batch
+
+
+def fetch(client, url):
+    """Return the body of url as it is streamed, and the chunks it came in."""
+    response = client.get(url, buffered=False)
+    chunks = list(response.response)
+    response.close()
+    return json.loads(b''.join(chunks)), chunks
+
+
+def test_empty(client):
+    tracks, chunks = fetch(client, '/json?limit=0')
+    assert tracks == []
+
+
+def test_single_batch(client, add_tracks):
+    queued = add_tracks(5)
+    add_tracks(2, played=datetime.now())
+    tracks, chunks = fetch(client, '/json?limit=0')
+    assert [track['id'] for track in tracks] == queued
+    assert tracks[0]['artist'] == 'Artist'
+
+
+def test_many_batches(client, add_tracks):
+    for count in (stream_batch, stream_batch * 2 + 3):
+        queued = add_tracks(count)
+        tracks, chunks = fetch(client, '/json?limit=0&after_id=%d' % (
+            queued[0] - 1
+        ))
+        assert [track['id'] for track in tracks] == queued
+        # The brackets, then a chunk per batch.
+        assert len(chunks) == 2 + (count + stream_batch - 1) // stream_batch
+
+
+def test_after_id(client, add_tracks):
+    queued = add_tracks(stream_batch + 10)
+    add_tracks(3, played=datetime.now())
+    tracks, chunks = fetch(client, '/json?limit=0&after_id=%d' % queued[4])
+    assert [track['id'] for track in tracks] == queued[5:]
+    tracks, chunks = fetch(client, '/json?limit=0&after_id=%d' % queued[-1])
+    assert tracks == []
@@ -0,0 +1,71 @@
+"""Test that the speech queue coalesces utterances."""
+
+from threading import Event
+import pytest
+
+pytest.importorskip('accessible_output2')
+from pyjay.accessibility import SpeechQueue  # noqa: E402
+
+
+class Output:
+    """Records what is spoken, holding up the first utterance until released
+    so others queue up behind it."""
+
+    def __init__(self):
+        self.spoken = []
+        self.started = Event()
+        self.release = Event()
+
+    def speak(self, text, interrupt=False):
+        self.spoken.append((text, interrupt))
+        self.started.set()
+        self.release.wait(5.0)
+
+
+def queue_behind(first, category, *utterances):
+    """Speak first in category, queue utterances while it is being spoken,
+    and return what was spoken once the queue has stopped."""
+    output = Output()
+    queue = SpeechQueue(output=output)
+    queue.speak(first, category=category)
+    assert output.started.wait(5.0)
+    for text, kwargs in utterances:
+        queue.speak(text, **kwargs)
+    output.release.set()
+    queue.stop()
+    assert not queue.thread.is_alive()
+    return output.spoken
+
+
+def test_category_coalesced():
+    spoken = queue_behind(
+        'Volume 10%', 'volume',
+        ('Volume 20%', dict(category='volume')),
+        ('Volume 30%', dict(category='volume')),
+    )
+    # Only the latest value is spoken, interrupting the one before it.
+    assert spoken == [('Volume 10%', False), ('Volume 30%', True)]
+
+
+def test_order_kept():
+    spoken = queue_behind(
+        'Volume 10%', 'volume',
+        ('Pitch 1', dict(category='pitch')),
+        ('Loaded', dict()),
+        ('Volume 20%', dict(category='volume')),
+        ('Loaded', dict()),
+    )
+    # A replaced utterance moves to the back of the queue, and uncategorised
+    # utterances are never dropped.
+    assert spoken == [
+        ('Volume 10%', False), ('Pitch 1', False), ('Loaded', False),
+        ('Volume 20%', False), ('Loaded', False),
+    ]
+
+
+def test_interrupt_kept():
+    spoken = queue_behind(
+        'Playing', None,
+        ('Paused', dict(interrupt=True)),
+    )
+    assert spoken == [('Playing', False), ('Paused', True)]
@@ -0,0 +1,95 @@
+"""Test smoothing held keys into ramps with ParameterAutomation."""
+
+import os.path
+import numpy
+from sound_lib.backends import load_backend
+from pyjay.deck import Deck, ParameterAutomation
+from .numpy_engine_test import write_wav
+
+
+def make_deck(tmpdir):
+    """Return a deck on the numpy backend with a track loaded, which records
+    the attributes it logs."""
+    deck = Deck('Test Deck', backend=load_backend('numpy'))
+    deck.set_stream(
+        write_wav(os.path.join(str(tmpdir), 'track.wav'), numpy.zeros(8000))
+    )
+    deck.logged = []
+    deck.log_attribute = deck.logged.append
+    return deck
+
+
+def test_first_change_applied(tmpdir):
+    deck = make_deck(tmpdir)
+    automation = ParameterAutomation(deck, 'volume', interval=0.1, settle=0.5)
+    assert automation.change(-0.1, now=10.0) == 0.9
+    assert deck.volume == 0.9
+    assert deck.stream.is_sliding('volume')
+    assert not automation.pending
+    assert automation.next_update == 10.1
+    assert deck.logged == []
+
+
+def test_burst_coalesced(tmpdir):
+    deck = make_deck(tmpdir)
+    automation = ParameterAutomation(deck, 'volume', interval=0.1, settle=0.5)
+    automation.change(-0.1, now=10.0)
+    # Changes inside the interval move the target but not the deck.
+    for now in (10.02, 10.04, 10.06):
+        automation.change(-0.1, now=now)
+    assert round(automation.target, 6) == 0.6
+    assert deck.volume == 0.9
+    assert automation.pending
+    assert automation.poll(10.08)
+    assert deck.volume == 0.9
+    # Once the interval is up, poll slides to the latest target.
+    assert automation.poll(10.1)
+    assert round(deck.volume, 6) == 0.6
+    assert not automation.pending
+    assert deck.logged == []
+
+
+def test_target_clamped(tmpdir):
+    deck = make_deck(tmpdir)
+    automation = ParameterAutomation(deck, 'volume', interval=0.1, settle=0.5)
+    assert automation.change(0.5, now=10.0) == 1.0
+    assert automation.change(-3.0, now=10.2) == 0.0
+
+
+def test_settle(tmpdir):
+    deck = make_deck(tmpdir)
+    automation = ParameterAutomation(deck, 'volume', interval=0.1, settle=0.5)
+    automation.change(-0.1, now=10.0)
+    automation.change(-0.1, now=10.3)
+    # The settle time restarts with every change.
+    assert automation.poll(10.6)
+    assert deck.logged == []
+    assert not automation.poll(10.8)
+    assert deck.logged == ['volume']
+    assert automation.target is None
+    assert round(deck.volume, 6) == 0.8
+
+
+def test_settle_applies_pending(tmpdir):
+    deck = make_deck(tmpdir)
+    automation = ParameterAutomation(deck, 'pan', interval=1.0, settle=0.5)
+    automation.change(0.25, now=10.0)
+    automation.change(0.25, now=10.1)
+    assert deck.pan == 0.25
+    assert not automation.poll(10.6)
+    assert deck.pan == 0.5
+    assert deck.logged == ['pan']
+
+
+def test_deck_automations(tmpdir):
+    deck = make_deck(tmpdir)
+    assert deck.automate('volume', -0.5) == 0.5
+    assert 'volume' in deck.automations
+    deck.poll_automations(now=deck.automations['volume'].settle_at)
+    assert deck.automations == {}
+    assert deck.logged == ['volume']
+    deck.automate('volume', 0.25)
+    # Setting the attribute outright drops the gesture.
+    deck.set_volume(0.1)
+    assert deck.automations == {}
+    assert deck.volume == 0.1
@@ -0,0 +1,53 @@
+"""Test the JSON caches of analyses and cues."""
+
+import os.path
+from pyjay.cache import AnalysisCache, track_key
+from pyjay.cues import CueCache, empty_marks
+
+
+def make_track(tmpdir, name='track.wav'):
+    path = os.path.join(str(tmpdir), name)
+    with open(path, 'wb') as f:
+        f.write(b'RIFF')
+    return path
+
+
+def test_analysis(tmpdir):
+    track = make_track(tmpdir)
+    directory = tmpdir.mkdir('analysis')
+    cache = AnalysisCache(directory=str(directory))
+    assert cache.get(track) is None
+    assert cache.get(os.path.join(str(tmpdir), 'missing.wav')) is None
+    key = track_key(track)
+    assert not cache.contains(key)
+    cache.save(key, dict(bpm=120.0))
+    assert cache.contains(key)
+    assert directory.listdir() == [directory.join(key + '.json')]
+    # A new cache reads what the last one saved.
+    cache = AnalysisCache(directory=str(directory))
+    assert cache.get(track) == dict(bpm=120.0)
+    assert cache.memory == {key: dict(bpm=120.0)}
+
+
+def test_cues(tmpdir):
+    track = make_track(tmpdir)
+    directory = str(tmpdir.mkdir('cues'))
+    cache = CueCache(directory=directory)
+    assert cache.get(track) == empty_marks()
+    marks = dict(cues={'1': 2.5}, loop=[1.0, None])
+    cache.save(track, marks)
+    assert CueCache(directory=directory).get(track) == marks
+    # Replacing the track forgets its marks.
+    os.remove(track)
+    with open(track, 'wb') as f:
+        f.write(b'RIFF and more')
+    assert CueCache(directory=directory).get(track) == empty_marks()
+
+
+def test_bad_file(tmpdir):
+    track = make_track(tmpdir)
+    directory = str(tmpdir.mkdir('cues'))
+    cache = CueCache(directory=directory)
+    with open(cache.path(track_key(track)), 'w') as f:
+        f.write('{')
+    assert cache.get(track) == empty_marks()
@@ -0,0 +1,88 @@
+"""Test the crossfader's curve table and fades."""
+
+import math
+from pytest import raises
+from pyjay.crossfader import Crossfader, curves
+
+
+class Deck:
+    """Records the gains a crossfader gives it."""
+
+    def __init__(self):
+        self.gain = None
+        self.nodes = None
+
+    def set_gain(self, gain):
+        self.gain = gain
+
+    def fade_gain(self, nodes):
+        self.nodes = nodes
+
+
+def make_crossfader(**kwargs):
+    return Crossfader(Deck(), Deck(), **kwargs)
+
+
+def test_table():
+    for name, func in curves.items():
+        crossfader = make_crossfader(curve=name)
+        assert len(crossfader.table) == 201
+        assert crossfader.gains(-100) == (func(0.0), func(1.0))
+        assert crossfader.gains(100) == (func(1.0), func(0.0))
+        for position in range(-100, 101):
+            left, right = crossfader.gains(position)
+            # The right deck mirrors the left.
+            mirror = crossfader.gains(-position)
+            assert math.isclose(right, mirror[0], abs_tol=1e-9)
+            assert math.isclose(left, mirror[1], abs_tol=1e-9)
+            assert 0.0 <= left <= 1.0
+
+
+def test_curves():
+    crossfader = make_crossfader()
+    assert crossfader.gains(0) == (1.0, 1.0)
+    assert crossfader.gains(50) == (0.5, 1.0)
+    assert crossfader.gains(100) == (0.0, 1.0)
+    crossfader.set_curve('power')
+    for position in range(-100, 101, 10):
+        left, right = crossfader.gains(position)
+        assert math.isclose(left ** 2 + right ** 2, 1.0)
+    crossfader.set_curve('cut')
+    assert crossfader.gains(80) == (1.0, 1.0)
+    assert crossfader.gains(100) == (0.0, 1.0)
+
+
+def test_set_curve():
+    crossfader = make_crossfader(position=50)
+    assert crossfader.left.gain == 0.5
+    crossfader.set_curve('cut')
+    # The decks are given the new curve's gains straight away.
+    assert crossfader.left.gain == 1.0
+    with raises(ValueError):
+        crossfader.set_curve('missing')
+    assert crossfader.curve == 'cut'
+
+
+def test_set_position():
+    crossfader = make_crossfader()
+    crossfader.set_position(-150)
+    assert crossfader.position == -100
+    assert (crossfader.left.gain, crossfader.right.gain) == (1.0, 0.0)
+    crossfader.set_position(150)
+    assert crossfader.position == 100
+
+
+def test_fade():
+    crossfader = make_crossfader(position=-100)
+    crossfader.fade(100, 2.0)
+    assert crossfader.position == 100
+    left, right = crossfader.left.nodes, crossfader.right.nodes
+    assert len(left) == len(right) == 201
+    assert left[0] == (0.0, 1.0)
+    assert right[0] == (0.0, 0.0)
+    assert math.isclose(left[-1][0], 2.0)
+    assert left[-1][1] == 0.0
+    crossfader.fade(90, 1.0)
+    assert [value for time, value in crossfader.right.nodes] == [
+        crossfader.gains(p)[1] for p in range(100, 89, -1)
+    ]
@@ -0,0 +1,58 @@
+"""Test compiling the commands' key bindings into hotkeys."""
+
+import pytest
+from pyjay.hotkeys import Binding, compile_hotkeys
+
+
+class Command:
+    """Holds bindings, which are all compile_hotkeys reads from a command."""
+
+    def __init__(self, *bindings):
+        self.bindings = list(bindings)
+
+
+class Frame:
+    left = 'left deck'
+    right = 'right deck'
+
+
+def action(deck, argument):
+    pass
+
+
+def test_compile():
+    first = Command(('A', action, 'left', None), ('B', action, None, 1))
+    second = Command((';', action, 'right', -1))
+    hotkeys = compile_hotkeys(Frame(), [first, second])
+    assert hotkeys == {
+        'A': Binding(first, action, 'left deck', None),
+        'B': Binding(first, action, None, 1),
+        ';': Binding(second, action, 'right deck', -1),
+    }
+
+
+def test_duplicate():
+    first = Command(('A', action, 'left', None))
+    second = Command(('B', action, None, None), ('A', action, 'right', None))
+    with pytest.raises(RuntimeError, match="Duplicate key 'A'"):
+        compile_hotkeys(Frame(), [first, second])
+    # Within a single command too.
+    with pytest.raises(RuntimeError):
+        compile_hotkeys(Frame(), [Command(*first.bindings * 2)])
+
+
+def test_no_duplicates():
+    pytest.importorskip('wx')
+    pytest.importorskip('accessible_output2')
+    try:
+        from pyjay.commands import commands
+    except OSError as e:
+        pytest.skip('BASS could not be loaded: %s' % e)
+    keys = []
+    for cls in commands:
+        cmd = cls.__new__(cls)
+        cmd.keys = []
+        cmd.bindings = []
+        cmd.setup()
+        keys.extend(cmd.keys)
+    assert len(keys) == len(set(keys))
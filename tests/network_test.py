@@ -0,0 +1,82 @@
+"""Test talking to the requests server."""
+
+import json
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from threading import Thread
+from pyjay import network
+
+
+class QueueHandler(BaseHTTPRequestHandler):
+    """Serves the queue with an ETag, as the requests server does."""
+
+    def do_GET(self):
+        server = self.server
+        server.seen.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == server.etag:
+            self.send_response(304)
+            self.send_header('ETag', server.etag)
+            self.end_headers()
+            return
+        body = json.dumps(server.queue).encode()
+        self.send_response(200)
+        self.send_header('ETag', server.etag)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve():
+    """Start a queue server on its own thread and return it."""
+    server = HTTPServer(('127.0.0.1', 0), QueueHandler)
+    server.etag = '"abc-1"'
+    server.queue = [dict(id=1, title='First')]
+    server.seen = []
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_not_modified():
+    server = serve()
+    url = 'http://127.0.0.1:%d/json' % server.server_port
+    try:
+        first = network.fetch_json(url, params=dict(limit=50))
+        assert first == server.queue
+        # The server says nothing has changed, so the cached body is used.
+        server.queue = []
+        assert network.fetch_json(url, params=dict(limit=50)) == first
+        assert server.seen == [None, '"abc-1"']
+        # Other parameters are cached apart.
+        assert network.fetch_json(url, params=dict(limit=10)) == []
+        server.etag = '"abc-2"'
+        server.queue = [dict(id=2, title='Second')]
+        assert network.fetch_json(url, params=dict(limit=50)) == \
+            server.queue
+        assert server.seen[-1] == '"abc-1"'
+    finally:
+        server.shutdown()
+        server.server_close()
+        network.http_cache.clear()
+
+
+def test_cache_bounded():
+    server = serve()
+    url = 'http://127.0.0.1:%d/json' % server.server_port
+    try:
+        for after_id in range(network.http_cache_size + 5):
+            network.fetch_json(url, params=dict(after_id=after_id))
+            # Using the first entry keeps it from being the one dropped.
+            network.fetch_json(url, params=dict(after_id=0))
+        assert len(network.http_cache) == network.http_cache_size
+        keys = [dict(params)['after_id'] for url, params in network.http_cache]
+        assert keys[-1] == 0
+        assert sorted(keys) == [0] + list(
+            range(6, network.http_cache_size + 5)
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+        network.http_cache.clear()
@@ -0,0 +1,170 @@
+"""Test the NumPy reference engine by rendering known buffers through it."""
+
+import os.path
+import wave
+import numpy
+from sound_lib.backends import numpy_engine as engine
+
+freq = 8000
+
+
+def write_wav(path, samples, chans=1):
+    """Write samples, a float array in [-1, 1), to path as 16-bit PCM."""
+    data = (numpy.asarray(samples) * 32768).astype('<i2').tobytes()
+    writer = wave.open(path, 'wb')
+    try:
+        writer.setnchannels(chans)
+        writer.setsampwidth(2)
+        writer.setframerate(freq)
+        writer.writeframes(data)
+    finally:
+        writer.close()
+    return path
+
+
+def ramp(frames):
+    """Return frames distinct samples, each exactly representable in 16 bits."""
+    return numpy.arange(frames, dtype=numpy.float32) / 16384
+
+
+def constant(tmpdir, name, value, frames=freq):
+    return engine.FileStream(
+        file=write_wav(
+            os.path.join(str(tmpdir), name), numpy.full(frames, value)
+        ), decode=True
+    )
+
+
+def test_read(tmpdir):
+    path = write_wav(os.path.join(str(tmpdir), 'ramp.wav'), ramp(100))
+    stream = engine.FileStream(file=path, decode=True)
+    assert stream.chans == 1
+    assert stream.get_length() == 200
+    assert numpy.array_equal(stream.samples[:, 0], ramp(100))
+    stream.play()
+    block = stream.read(10, freq)
+    assert numpy.array_equal(block[:, 0], ramp(10))
+    assert stream.get_position() == 20
+    # Twice the rate takes every other sample.
+    stream.frequency = freq * 2
+    assert numpy.array_equal(stream.read(5, freq)[:, 0], ramp(20)[10::2])
+    stream.set_position(0)
+    data = stream.read_data(20)
+    assert len(data) == 20
+    assert numpy.allclose(
+        numpy.frombuffer(data, dtype='<i2') / 32767, ramp(10), atol=1 / 32767
+    )
+
+
+def test_read_past_end(tmpdir):
+    stream = constant(tmpdir, 'short.wav', 0.5, frames=10)
+    stream.play()
+    block = stream.read(16, freq)
+    assert (block[:10] == 0.5).all()
+    assert (block[10:] == 0).all()
+    assert stream.is_stopped
+    assert stream.get_position() == stream.get_length()
+
+
+def test_mix(tmpdir):
+    mixer = engine.Mixer(freq, decode=True)
+    first = constant(tmpdir, 'first.wav', 0.25)
+    second = constant(tmpdir, 'second.wav', 0.125)
+    mixer.add_channel(first)
+    mixer.add_channel(second)
+    block = mixer.render(64)
+    assert block.shape == (64, 2)
+    assert (block == 0.375).all()
+    second.volume = 0.5
+    mixer.render(64)  # Ramps to the new volume.
+    assert (mixer.render(64) == 0.3125).all()
+    first.pan = -1
+    block = mixer.render(64)
+    assert (block[:, 0] == 0.3125).all()
+    assert (block[:, 1] == 0.0625).all()
+    mixer.set_channel_paused(first, True)
+    assert (mixer.render(64) == 0.0625).all()
+    mixer.remove_channel(second)
+    assert (mixer.render(64) == 0).all()
+
+
+def test_volume_ramp(tmpdir):
+    mixer = engine.Mixer(freq, decode=True)
+    stream = constant(tmpdir, 'constant.wav', 0.5)
+    mixer.add_channel(stream)
+    mixer.render(16)
+    stream.volume = 0
+    block = mixer.render(5)[:, 0]
+    assert numpy.allclose(block, [0.5, 0.375, 0.25, 0.125, 0])
+
+
+def test_envelope(tmpdir):
+    mixer = engine.Mixer(freq, decode=True)
+    stream = constant(tmpdir, 'constant.wav', 0.5)
+    mixer.add_channel(stream)
+    # Node positions are in bytes of the mixer's stereo format.
+    mixer.set_channel_envelope(stream, 'volume', [(0, 0.0), (4 * 4, 1.0)])
+    block = mixer.render(8)[:, 0]
+    assert numpy.allclose(block, [0, 0.125, 0.25, 0.375, 0.5, 0.5, 0.5, 0.5])
+    assert mixer.get_channel_envelope_position(stream, 'volume') == (32, 1.0)
+    mixer.set_channel_envelope_position(stream, 'volume', 2 * 4)
+    assert numpy.allclose(mixer.render(2)[:, 0], [0.25, 0.375])
+    mixer.set_channel_envelope(stream, 'volume', [])
+    assert (mixer.render(4) == 0.5).all()
+
+
+def test_loop(tmpdir):
+    path = write_wav(os.path.join(str(tmpdir), 'ramp.wav'), ramp(100))
+    stream = engine.FileStream(file=path, decode=True)
+    stream.play()
+    stream.looping = True
+    stream.set_loop_points(10 * 2, 20 * 2)
+    assert stream.get_position(engine.POS_LOOP) == 20
+    assert stream.get_position(engine.POS_END) == 40
+    stream.set_position(15 * 2)
+    block = stream.read(12, freq)[:, 0]
+    assert numpy.array_equal(
+        block, ramp(20)[[15, 16, 17, 18, 19, 10, 11, 12, 13, 14, 15, 16]]
+    )
+    assert stream.get_position() == 17 * 2
+    stream.looping = False
+    stream.read(10, freq)
+    assert stream.get_position() == 27 * 2
+
+
+def test_seek(tmpdir):
+    path = write_wav(os.path.join(str(tmpdir), 'ramp.wav'), ramp(freq))
+    stream = engine.FileStream(file=path, decode=True)
+    mixer = engine.Mixer(freq, decode=True)
+    mixer.add_channel(stream)
+    assert stream.seconds_to_bytes(0.5) == freq
+    mixer.set_channel_position(stream, stream.seconds_to_bytes(0.5))
+    assert mixer.get_channel_position(stream) == freq
+    assert stream.bytes_to_seconds() == 0.5
+    block = mixer.render(4)
+    assert numpy.array_equal(block[:, 1], ramp(freq)[freq // 2:][:4])
+
+
+def test_syncs(tmpdir):
+    mixer = engine.Mixer(freq, decode=True)
+    stream = constant(tmpdir, 'short.wav', 0.5, frames=100)
+    mixer.add_channel(stream)
+    fired = []
+    mixer.set_channel_sync(
+        stream, 'position', 50 * 2, lambda channel: fired.append('position')
+    )
+    end = mixer.set_channel_sync(
+        stream, 'end', 0, lambda channel: fired.append('end'), onetime=True
+    )
+    mixer.render(40)
+    assert fired == []
+    mixer.render(40)
+    assert fired == ['position']
+    mixer.render(40)
+    assert fired == ['position', 'end']
+    try:
+        mixer.remove_channel_sync(end)
+    except engine.Error:
+        pass
+    else:
+        raise AssertionError('A onetime sync was left after firing.')
@@ -0,0 +1,85 @@
+"""Test the ring buffer behind RingBufferPushStream."""
+
+import ctypes
+import pytest
+
+try:
+    from sound_lib import stream
+except OSError as e:
+    pytest.skip('BASS could not be loaded: %s' % e, allow_module_level=True)
+
+
+@pytest.fixture
+def ring(monkeypatch):
+    """Return an 8-frame ring of 16-bit mono, without a BASS stream behind
+    it, so the callback can be called directly."""
+    monkeypatch.setattr(stream.Stream, '__init__', lambda self, **kwargs: None)
+    return stream.RingBufferPushStream(size=16, chans=1)
+
+
+def read(ring, length):
+    """Call the stream's callback for length bytes, returning the bytes and
+    what the callback returned."""
+    buffer = ctypes.create_string_buffer(length)
+    result = ring.stream_proc(
+        0, ctypes.addressof(buffer), length, None
+    )
+    return buffer.raw, result
+
+
+def test_write_read(ring):
+    assert ring.write(b'abcdef') == 6
+    assert (ring.fill, ring.space) == (6, 10)
+    assert read(ring, 4) == (b'abcd', 4)
+    assert read(ring, 2) == (b'ef', 2)
+    assert ring.fill == 0
+    assert ring.underruns == ring.overruns == 0
+
+
+def test_wrap(ring):
+    ring.write(b'0123456789ab')
+    read(ring, 10)
+    # The next write runs off the end of the buffer and back to the start.
+    assert ring.write(b'cdefghijkl') == 10
+    assert bytes(ring.buffer[:6]) == b'ghijkl'
+    assert read(ring, 12) == (b'abcdefghijkl', 12)
+    assert ring.read_index == ring.write_index == 22
+
+
+def test_overrun(ring):
+    ring.write(b'0123456789')
+    # Only whole frames are accepted.
+    assert ring.write(b'abcdefghi') == 6
+    assert ring.overruns == 1
+    assert ring.space == 0
+    assert ring.write(b'xy') == 0
+    assert ring.overruns == 2
+    assert read(ring, 16) == (b'0123456789abcdef', 16)
+
+
+def test_underrun(ring):
+    ring.write(b'abcd')
+    # The missing data is played as silence.
+    assert read(ring, 8) == (b'abcd\0\0\0\0', 8)
+    assert ring.underruns == 1
+    # Callbacks while the ring stays empty are the same underrun.
+    for _ in range(3):
+        assert read(ring, 8) == (b'\0' * 8, 8)
+    assert ring.underruns == 1
+    # Data arriving ends it, so running dry again is a new one.
+    ring.write(b'ef')
+    assert read(ring, 4) == (b'ef\0\0', 4)
+    assert ring.underruns == 2
+    ring.write(b'ghij')
+    assert read(ring, 4) == (b'ghij', 4)
+    read(ring, 4)
+    assert ring.underruns == 3
+
+
+def test_finish(ring):
+    ring.write(b'abcd')
+    ring.finish()
+    data, result = read(ring, 8)
+    assert data[:4] == b'abcd'
+    assert result == 4 | 0x80000000
+    assert ring.underruns == 0